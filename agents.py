@@ -1,37 +1,48 @@
-import json
 import time
+from prompt_builder import build_context, compact_prompt
+from memory import AgentMemory
 
 
 class CourtAgent:
     """Base class for all courtroom agents with AI-driven responses."""
 
-    def __init__(self, name, role, model):
+    def __init__(self, name, role, model, memory=None):
         self.name = name
         self.role = role
         self.model = model  # AI model for generating responses
+        self.memory = memory if memory is not None else AgentMemory()  # Bounded record of the turns said and heard
 
     def introduce(self):
         return f"My name is {self.name}, and I am the {self.role} in this case."
 
-    def generate_response(self, phase, case_facts):
-        """Uses AI to generate a response based on the phase and case details."""
-        prompt = f"""
+    def generate_response(self, phase, case_facts, proceedings=None):
+        """
+        Uses AI to generate a response based on the phase and case details. `proceedings` is an
+        optional list of (speaker, text) turns this response should answer or take into account;
+        they go into the agent's memory, which the prompt carries within a fixed token budget.
+        """
+        self.memory.extend((speaker, text) for speaker, text in proceedings or [] if speaker != self.name)  # Own turns are already remembered
+        history = self.memory.render()
+        prompt = compact_prompt(f"""
         You are {self.role} named {self.name}.
         You are currently in the {phase} phase of a courtroom case.
 
         Case Title: {case_facts['title']}
-        Key Arguments: {json.dumps(case_facts['arguments'], indent=2)}
+        Key Arguments: {build_context(case_facts['arguments'], 'agent')}
+        {history}
 
         Generate a response appropriate for this phase.
-        """
-        return self.model.generate_text(prompt)
+        """)
+        response = self.model.generate_text(prompt)
+        self.memory.add(self.name, response)
+        return response
 
 
 class Judge(CourtAgent):
     """AI-powered Judge agent."""
 
-    def __init__(self, name, model):
-        super().__init__(name, "Judge", model)
+    def __init__(self, name, model, memory=None):
+        super().__init__(name, "Judge", model, memory)
 
     def give_ruling(self, verdict):
         return f"As the Judge, I have reached the verdict: {verdict}"
@@ -39,23 +50,29 @@ class Judge(CourtAgent):
     def comment(self, case_facts):
         return self.generate_response("judge_commentary", case_facts)
 
+    def decide(self, case_facts, proceedings):
+        return self.generate_response("verdict", case_facts, proceedings)
+
 
 class Party(CourtAgent):
     """AI-powered party (Appellant/Respondent)."""
 
-    def __init__(self, name, role, arguments, model):
-        super().__init__(name, role, model)
+    def __init__(self, name, role, arguments, model, memory=None):
+        super().__init__(name, role, model, memory)
         self.arguments = arguments
 
     def present_arguments(self, case_facts):
         return self.generate_response("arguments", case_facts)
 
+    def rebut(self, case_facts, proceedings):
+        return self.generate_response("rebuttal", case_facts, proceedings)
+
 
 class Witness(CourtAgent):
     """AI-powered witness with dynamic testimony."""
 
-    def __init__(self, name, testimony, model):
-        super().__init__(name, "Witness", model)
+    def __init__(self, name, testimony, model, memory=None):
+        super().__init__(name, "Witness", model, memory)
         self.testimony = testimony
 
     def give_testimony(self, case_facts):
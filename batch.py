@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from main import generate_phase_response
+from case_record import load_case_record
+from objections import detect_objections
+from roles import assign_roles
+from strategy import suggest_strategy
+from verdict import generate_verdict
+from scheduler import request_priority, BATCH
+
+DEFAULT_ROLES = ["Appellant", "Respondent"]
+DEFAULT_SCRIPT = {"opening": "suggest", "cross": "suggest", "closing": "suggest"}
+
+
+class SimulationError(RuntimeError):
+    """A step of a headless simulation failed; the run gets no transcript, so the next batch retries it."""
+
+
+def load_scripts(path):
+    """Loads scripted user inputs: a JSON list of {"opening", "cross", "closing"} objects ('suggest' = AI)."""
+    if not path:
+        return [DEFAULT_SCRIPT]
+    with open(path, "r", encoding="utf-8") as f:
+        scripts = json.load(f)
+    return [{**DEFAULT_SCRIPT, **script} for script in scripts]
+
+
+def list_case_files(directory):
+    """Lists the case JSON files in `directory`, sorted for a stable run order."""
+    return sorted(
+        os.path.join(directory, f) for f in os.listdir(directory)
+        if f.endswith(".json") and os.path.isfile(os.path.join(directory, f))
+    )
+
+
+def run_simulation(case_path, user_role, script):
+    """
+    Runs the opening -> objection -> cross -> closing -> verdict flow of main.main without
+    prompts or pauses, and returns the transcript as a list of event dicts. Raises SimulationError
+    if any step returns an error message instead of output.
+    """
+    case_data = load_case_record(case_path)
+
+    assigned_roles = assign_roles(case_data)
+    appellant, respondents = assigned_roles["Appellant"], assigned_roles["Respondents"]
+    user_agent = appellant if user_role == "Appellant" else respondents[0]
+    opposition = respondents[0] if user_role == "Appellant" else appellant
+
+    case_facts = case_data.case_facts()
+    legal_references = case_data.legal_references
+
+    transcript = []
+    start = time.perf_counter()
+
+    def record(phase, speaker, text):
+        # The generators report API failures as '⚠ ...' text instead of raising
+        if text.lstrip().startswith("⚠"):
+            raise SimulationError(f"{phase} ({speaker}): {text.strip()}")
+        transcript.append({"phase": phase, "speaker": speaker, "text": text, "elapsed": round(time.perf_counter() - start, 3)})
+        return text
+
+    def user_turn(phase, scripted):
+        if scripted.lower() == "suggest":
+            return record(phase, user_agent.name, generate_phase_response(phase, user_role, case_facts))
+        return record(phase, user_agent.name, scripted)
+
+    record("strategy", "AI Strategist", suggest_strategy(user_role, case_facts, legal_references))
+
+    opening = user_turn("opening", script["opening"])
+    record("opening", opposition.name, generate_phase_response("opening", opposition.role_type, case_facts))
+    record("objection", opposition.name, detect_objections(opening, case_facts))
+
+    if script["cross"].lower() == "suggest":
+        record("cross", opposition.name, generate_phase_response("cross", opposition.role_type, case_facts))
+    else:
+        record("cross", user_agent.name, script["cross"])
+        record("cross", opposition.name, "The contract clause was fairly applied.")
+
+    user_closing = user_turn("closing", script["closing"])
+    opposition_closing = record("closing", opposition.name, generate_phase_response("closing", opposition.role_type, case_facts))
+
+    appellant_closing, respondent_closing = (user_closing, opposition_closing) if user_role == "Appellant" else (opposition_closing, user_closing)
+    record("verdict", assigned_roles["Judge"].name, generate_verdict(case_facts, appellant_closing, respondent_closing, legal_references))
+    return transcript
+
+
+def write_transcript(path, run_info, transcript):
+    """
+    Writes one JSONL transcript: a header line with the run details, then one line per event. The file
+    only appears once complete, so an interrupted write isn't mistaken for a finished run.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"run": run_info}, ensure_ascii=False) + "\n")
+        for event in transcript:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    os.replace(temp_path, path)
+
+
+def run_batch(case_dir, output_dir, roles=None, scripts=None, workers=4, skip_existing=True):
+    """
+    Runs every case file x role x script combination with at most `workers` simulations in flight.
+    Returns a list of (transcript path, error or None) in completion order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    roles = roles or DEFAULT_ROLES
+    scripts = scripts or [DEFAULT_SCRIPT]
+
+    jobs = []
+    for case_path, role, (script_index, script) in itertools.product(list_case_files(case_dir), roles, enumerate(scripts)):
+        case_name = os.path.splitext(os.path.basename(case_path))[0]
+        out_path = os.path.join(output_dir, f"{case_name}__{role}__{script_index}.jsonl")
+        if skip_existing and os.path.exists(out_path):
+            continue
+        jobs.append((case_path, role, script_index, script, out_path))
+
+    def run_job(case_path, role, script_index, script, out_path):
+        with request_priority(BATCH):  # Interactive sessions sharing the quota go first
+            transcript = run_simulation(case_path, role, script)
+        write_transcript(out_path, {"case": case_path, "role": role, "script": script_index}, transcript)
+        return out_path
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, *job): job[-1] for job in jobs}
+        for future in as_completed(futures):
+            error = future.exception()
+            results.append((futures[future], error))
+            print(f"{'❌' if error else '✅'} {futures[future]}{f' ({error})' if error else ''}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run courtroom simulations headlessly and write JSONL transcripts.")
+    parser.add_argument("case_dir", nargs="?", default="data", help="Directory of case JSON files")
+    parser.add_argument("--out", default="transcripts", help="Directory for the JSONL transcripts")
+    parser.add_argument("--roles", nargs="+", default=DEFAULT_ROLES, choices=DEFAULT_ROLES)
+    parser.add_argument("--scripts", help="JSON file with a list of scripted user inputs")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum simulations running at once")
+    parser.add_argument("--overwrite", action="store_true", help="Re-run simulations that already have a transcript")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = run_batch(args.case_dir, args.out, args.roles, load_scripts(args.scripts), args.workers, not args.overwrite)
+    failed = sum(1 for _, error in results if error)
+    print(f"\n📌 {len(results) - failed} transcripts written, {failed} failed in {time.perf_counter() - started:.1f}s")
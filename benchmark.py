@@ -0,0 +1,199 @@
+import io
+import sys
+import math
+import json
+import time
+import queue
+import subprocess
+import argparse
+import threading
+import contextlib
+from types import SimpleNamespace
+from unittest.mock import patch
+import main
+import checkpoint
+import court_sim
+from llm_client import LLMClient, get_client, set_client
+from response_cache import ResponseCache
+from scheduler import Scheduler
+from case_record import load_case_record
+from mock_llm_server import MockLLMServer
+from objections import detect_objections
+from speech import generate_speech
+from strategy import suggest_strategy
+from verdict import generate_verdict
+
+DEFAULT_CASE_FILE = "data/case_data.json"
+# Modules whose cold import time is tracked (-X importtime, cumulative)
+STARTUP_MODULES = ["main", "court_sim", "batch", "llm_client", "model_router", "objections", "strategy", "verdict"]
+# Entry points whose cold start is timed end to end
+STARTUP_COMMANDS = {
+    "startup.import_main": ["-c", "import main"],
+    "startup.batch_help": ["batch.py", "--help"]
+}
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_main_simulation(case_file):
+    """Drives main.main end to end with scripted input and no pauses."""
+    inputs = iter(["Appellant", "suggest", "suggest", "suggest"])
+    with patch.object(main, "select_case_file", return_value=case_file), \
+            patch.object(main, "open_transcript", return_value=None), \
+            patch.object(checkpoint.settings, "enabled", False), \
+            patch.object(main, "time", SimpleNamespace(sleep=lambda seconds: None)), \
+            patch("builtins.input", lambda _: next(inputs)):
+        main.main()
+
+
+def run_court_sim_phase(phase, case_data):
+    """Runs one court_sim phase through the same worker path the Tk front end uses."""
+    results = queue.Queue()
+    prompt = court_sim.build_phase_prompt(phase, "Appellant", case_data)
+    court_sim.run_phase_request(prompt, results, threading.Event())
+    while results.get()[0] == "chunk":
+        pass
+
+
+def build_benchmarks(case_file):
+    """Maps benchmark names to zero-argument callables, one per phase / entry point."""
+    case_data = load_case_record(case_file)
+    case_facts = case_data.case_facts()
+    legal_references = case_data.legal_references
+
+    benchmarks = {
+        f"main.{phase}": (lambda phase=phase: "".join(main.stream_phase_response(phase, "Appellant", case_facts)))
+        for phase in ["opening", "cross", "closing"]
+    }
+    benchmarks["main.main"] = lambda: run_main_simulation(case_file)
+    benchmarks.update({
+        f"court_sim.{phase}": (lambda phase=phase: run_court_sim_phase(phase, case_data))
+        for phase in court_sim.courtroom_phases
+    })
+    benchmarks.update({
+        "objections.detect_objections": lambda: detect_objections("The witness clearly lied.", case_facts),
+        "speech.generate_speech": lambda: generate_speech("Opening", "Prosecutor", case_facts),
+        "strategy.suggest_strategy": lambda: suggest_strategy("Appellant", case_facts, legal_references),
+        "verdict.generate_verdict": lambda: generate_verdict(case_facts, "Prosecution", "Defense", legal_references)
+    })
+    return benchmarks
+
+
+def run_benchmarks(iterations=20, case_file=DEFAULT_CASE_FILE, latency=0.0, tokens_per_second=0.0, tokens=50, only=None):
+    """
+    Times every benchmark against a local mock server (response cache disabled).
+    Returns {name: {"p50": seconds, "p95": seconds, "mean": seconds}}.
+    """
+    server = MockLLMServer(latency=latency, tokens_per_second=tokens_per_second, tokens=tokens).start()
+    previous_client = get_client()
+    set_client(LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False),
+                         scheduler=Scheduler(rpm=0, tpm=0)))
+    try:
+        report = {}
+        for name, bench in build_benchmarks(case_file).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            samples = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                bench()  # Warm-up (imports, connection pool)
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    bench()
+                    samples.append(time.perf_counter() - start)
+            report[name] = {
+                "p50": percentile(samples, 50),
+                "p95": percentile(samples, 95),
+                "mean": sum(samples) / len(samples)
+            }
+        return report
+    finally:
+        set_client(previous_client)
+        server.stop()
+
+
+def import_time(module):
+    """Cumulative cold import time of `module` in seconds, as reported by python -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    for line in reversed(result.stderr.splitlines()):
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1e6
+    raise ValueError(f"No importtime entry for {module}")
+
+
+def command_time(args):
+    """Wall time of one fresh interpreter running `args` (to exit), in seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def run_startup_benchmarks(iterations=5, only=None):
+    """
+    Times cold starts in fresh interpreters: each module's cumulative import time and each entry
+    point's total start-up. Returns the same {name: {"p50", "p95", "mean"}} report as run_benchmarks.
+    """
+    benchmarks = {f"import.{module}": (lambda module=module: import_time(module)) for module in STARTUP_MODULES}
+    benchmarks.update({name: (lambda args=args: command_time(args)) for name, args in STARTUP_COMMANDS.items()})
+    report = {}
+    for name, bench in benchmarks.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        bench()  # Warm-up (bytecode cache, OS file cache)
+        samples = [bench() for _ in range(iterations)]
+        report[name] = {
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "mean": sum(samples) / len(samples)
+        }
+    return report
+
+
+def find_regressions(report, baseline, tolerance=0.25, slack=0.005):
+    """Names whose p95 exceeds the baseline p95 by more than `tolerance` (plus `slack` seconds of noise)."""
+    return [
+        name for name, stats in report.items()
+        if name in baseline and stats["p95"] > baseline[name]["p95"] * (1 + tolerance) + slack
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-phase latency benchmarks against an offline mock LLM server.")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--case", default=DEFAULT_CASE_FILE)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency before first byte (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Mock generation speed (0 = instant)")
+    parser.add_argument("--tokens", type=int, default=50, help="Tokens per mock completion")
+    parser.add_argument("--only", nargs="+", help="Only run benchmarks whose name contains one of these")
+    parser.add_argument("--save", help="Write the report as JSON (e.g. to use as a baseline)")
+    parser.add_argument("--baseline", help="Compare against a saved report and fail on p95 regressions")
+    parser.add_argument("--startup", action="store_true", help="Time cold imports and entry point start-up instead")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown vs. the baseline")
+    args = parser.parse_args()
+
+    if args.startup:
+        report = run_startup_benchmarks(args.iterations, args.only)
+    else:
+        report = run_benchmarks(args.iterations, args.case, args.latency, args.tokens_per_second, args.tokens, args.only)
+
+    print(f"\n⏱ {'Benchmark':<40}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for name, stats in report.items():
+        print(f"   {name:<40}{stats['p50'] * 1000:>12.2f}{stats['p95'] * 1000:>12.2f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = find_regressions(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ p95 regressions: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No p95 regressions against the baseline.")
@@ -0,0 +1,204 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import threading
+from config import Settings
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+settings = Settings(
+    index_path=("LEX_CASE_INDEX", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "case_index.sqlite"), str)
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime REAL NOT NULL,
+    case_title TEXT,
+    court TEXT,
+    date TEXT,
+    year INTEGER,
+    judgment_by TEXT
+);
+CREATE INDEX IF NOT EXISTS cases_court ON cases (court);
+CREATE INDEX IF NOT EXISTS cases_year ON cases (year);
+CREATE VIRTUAL TABLE IF NOT EXISTS cases_fts USING fts5(
+    case_title, court, judgment_by, parties, laws_cited, precedents
+);
+"""
+
+
+def case_fields(case_data):
+    """Extracts the searchable fields from a case JSON document."""
+    parties = case_data.get("parties", {})
+    party_names = []
+    for value in parties.values():
+        for party in value if isinstance(value, list) else [value]:
+            if isinstance(party, dict) and party.get("name"):
+                party_names.append(party["name"])
+    references = case_data.get("legal_references", {})
+    year = re.search(r"\b(\d{4})\b", case_data.get("date", ""))
+    return {
+        "case_title": case_data.get("case_title", ""),
+        "court": case_data.get("court", ""),
+        "date": case_data.get("date", ""),
+        "year": int(year.group(1)) if year else None,
+        "judgment_by": case_data.get("judgment_by", ""),
+        "parties": " | ".join(party_names),
+        "laws_cited": " | ".join(references.get("laws_cited", [])),
+        "precedents": " | ".join(references.get("precedents", []))
+    }
+
+
+def fts_query(text):
+    """Turns free text into an FTS5 query: every word must match (as a prefix)."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+
+def scan_case_files(directory):
+    """Yields (path, mtime) for every case JSON file under `directory`."""
+    for entry in os.scandir(directory):
+        if entry.is_dir():
+            yield from scan_case_files(entry.path)
+        elif entry.name.endswith(".json") and entry.is_file():
+            yield entry.path, entry.stat().st_mtime
+
+
+class CaseIndex:
+    """Persistent SQLite/FTS5 index over the case corpus, re-indexed incrementally by file mtime."""
+
+    def __init__(self, path=None):
+        path = path or settings.index_path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        self.generation = 0  # Bumped whenever update() adds, changes or drops a case
+        self.scanned = {}  # directory -> time.monotonic() of its last scan
+        self._lock = threading.Lock()
+
+    def update(self, directory=DATA_DIR):
+        """
+        Brings the index in line with `directory`: (re)parses new or modified files and drops deleted ones.
+        Cases indexed from other directories are left alone. Returns (number of files indexed, number removed).
+        """
+        on_disk = dict(scan_case_files(directory))
+        prefix = os.path.join(directory, "")
+        with self._lock, self.db:
+            indexed = {row["path"]: (row["id"], row["mtime"]) for row in self.db.execute("SELECT id, path, mtime FROM cases")}
+
+            removed = [indexed[path][0] for path in indexed if path.startswith(prefix) and path not in on_disk]
+            for case_id in removed:
+                self.db.execute("DELETE FROM cases WHERE id = ?", (case_id,))
+                self.db.execute("DELETE FROM cases_fts WHERE rowid = ?", (case_id,))
+
+            changed = 0
+            for path, mtime in on_disk.items():
+                if path in indexed and indexed[path][1] == mtime:
+                    continue
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        fields = case_fields(json.load(f))
+                except (OSError, json.JSONDecodeError, AttributeError) as e:
+                    print(f"⚠ Skipping {path}: {e}")
+                    continue
+
+                if path in indexed:
+                    case_id = indexed[path][0]
+                    self.db.execute(
+                        "UPDATE cases SET mtime = ?, case_title = ?, court = ?, date = ?, year = ?, judgment_by = ? WHERE id = ?",
+                        (mtime, fields["case_title"], fields["court"], fields["date"], fields["year"], fields["judgment_by"], case_id)
+                    )
+                    self.db.execute("DELETE FROM cases_fts WHERE rowid = ?", (case_id,))
+                else:
+                    case_id = self.db.execute(
+                        "INSERT INTO cases (path, mtime, case_title, court, date, year, judgment_by) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (path, mtime, fields["case_title"], fields["court"], fields["date"], fields["year"], fields["judgment_by"])
+                    ).lastrowid
+                self.db.execute(
+                    "INSERT INTO cases_fts (rowid, case_title, court, judgment_by, parties, laws_cited, precedents) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (case_id, fields["case_title"], fields["court"], fields["judgment_by"], fields["parties"], fields["laws_cited"], fields["precedents"])
+                )
+                changed += 1
+            self.scanned[directory] = time.monotonic()
+            if changed or removed:
+                self.generation += 1
+        return changed, len(removed)
+
+    def refresh(self, directory=DATA_DIR, max_age=0):
+        """Runs update() unless `directory` was scanned less than `max_age` seconds ago; returns the generation."""
+        with self._lock:
+            last = self.scanned.get(directory)
+        if last is None or time.monotonic() - last >= max_age:
+            self.update(directory)
+        return self.generation
+
+    def files(self, directory=DATA_DIR):
+        """{path: mtime} of the indexed case files under `directory`."""
+        prefix = os.path.join(directory, "")
+        with self._lock:
+            return {row["path"]: row["mtime"] for row in self.db.execute("SELECT path, mtime FROM cases ORDER BY path")
+                    if row["path"].startswith(prefix)}
+
+    def search(self, query="", court=None, year=None, judge=None, limit=20):
+        """
+        Finds cases matching free-text `query` (title, court, judge, parties, laws, precedents),
+        optionally filtered by court, year and judge. Results are ranked by relevance, or by title without a query.
+        """
+        conditions, params = [], []
+        match = fts_query(query or "")
+        if court:
+            conditions.append("cases.court LIKE ?")
+            params.append(f"%{court}%")
+        if year:
+            conditions.append("cases.year = ?")
+            params.append(int(year))
+        if judge:
+            conditions.append("cases.judgment_by LIKE ?")
+            params.append(f"%{judge}%")
+
+        sql = "SELECT cases.path, cases.case_title, cases.court, cases.date, cases.judgment_by FROM cases"
+        if match:
+            sql += " JOIN cases_fts ON cases_fts.rowid = cases.id AND cases_fts MATCH ?"
+            params.insert(0, match)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY bm25(cases_fts)" if match else " ORDER BY cases.case_title"
+        sql += " LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self.db.execute(sql, params)]
+
+    def count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_case_index():
+    """Returns the process-wide CaseIndex, creating it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CaseIndex()
+    return _index
+
+
+if __name__ == "__main__":
+    index = get_case_index()
+    indexed, removed = index.update()
+    print(f"📚 Indexed {indexed} case files ({removed} removed); {index.count()} cases in the index.")
+    for case in index.search(" ".join(sys.argv[1:])):
+        print(f"   - {case['case_title']} | {case['court']} | {case['date']}  ({case['path']})")
@@ -0,0 +1,107 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from config import Settings
+
+APPELLANT_KEYS = ["appellant", "petitioner", "plaintiff"]
+ARGUMENT_KEYS = ["key_arguments", "legal_arguments"]
+settings = Settings(max_cached_records=("LEX_CASE_CACHE_ENTRIES", "1024", int))
+
+
+class CaseRecord:
+    """
+    Parsed, normalized view of a case JSON file. All key variants (appellant/petitioner/plaintiff,
+    key_arguments/legal_arguments) are resolved once here. Records are shared between callers and
+    must be treated as read-only.
+    """
+
+    __slots__ = (
+        "path", "raw", "case_title", "date", "court", "judgment_by", "appellant_key", "appellant",
+        "respondents", "witnesses", "contract_details", "contract_purpose", "laws_cited", "precedents",
+        "arguments", "court_decision", "reasoning", "final_award"
+    )
+
+    def __init__(self, data, path=None):
+        parties = data.get("parties", {})
+        contract = data.get("contract_details", {})
+        references = data.get("legal_references", {})
+        judgment = data.get("judgment_summary", {})
+
+        self.path = path
+        self.raw = data
+        self.case_title = data.get("case_title", "")
+        self.date = data.get("date", "")
+        self.court = data.get("court", "")
+        self.judgment_by = data.get("judgment_by", "")
+        self.appellant_key = next((key for key in APPELLANT_KEYS if key in parties), None)
+        self.appellant = parties.get(self.appellant_key, {}) if self.appellant_key else {}
+        self.respondents = parties.get("respondents", [])
+        self.witnesses = data.get("witnesses", [])
+        self.contract_details = contract
+        self.contract_purpose = contract.get("contract_purpose", "")
+        self.laws_cited = references.get("laws_cited", [])
+        self.precedents = references.get("precedents", [])
+        self.arguments = next((data[key] for key in ARGUMENT_KEYS if data.get(key)), {})
+        self.court_decision = judgment.get("court_decision", "")
+        self.reasoning = judgment.get("reasoning", "")
+        self.final_award = judgment.get("final_award", "")
+
+    @property
+    def appellant_name(self):
+        return self.appellant.get("name", "")
+
+    @property
+    def respondent_names(self):
+        return [respondent.get("name", "") for respondent in self.respondents]
+
+    @property
+    def legal_references(self):
+        return {"laws_cited": self.laws_cited, "precedents": self.precedents}
+
+    def case_facts(self, *extra):
+        """The {"title", "arguments"} facts used by the phase prompts, plus any extra CaseRecord fields."""
+        facts = {"title": self.case_title, "arguments": self.arguments}
+        for name in extra:
+            facts[name] = getattr(self, name)
+        return facts
+
+    def __repr__(self):
+        return f"CaseRecord({self.case_title!r}, path={self.path!r})"
+
+
+def as_case_record(case_data):
+    """Accepts either a CaseRecord or a raw case dict."""
+    return case_data if isinstance(case_data, CaseRecord) else CaseRecord(case_data)
+
+
+_records = OrderedDict()  # (abspath, mtime_ns, size) -> CaseRecord, least recently used first
+_records_lock = threading.Lock()
+
+
+def load_case_record(path):
+    """
+    Loads a case file as a CaseRecord. Records are memoized by path + mtime, so repeated loads of an
+    unchanged file (across phases, modules or batch runs) parse it only once.
+    Raises OSError / json.JSONDecodeError like open() + json.load().
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _records_lock:
+        record = _records.get(key)
+        if record is not None:
+            _records.move_to_end(key)
+            return record
+
+    # Parse outside the lock so different files can be loaded in parallel
+    with open(path, "r", encoding="utf-8") as f:
+        record = CaseRecord(json.load(f), path)
+
+    with _records_lock:
+        for stale in [k for k in _records if k[0] == path]:
+            del _records[stale]
+        _records[key] = record
+        while len(_records) > settings.max_cached_records:
+            _records.popitem(last=False)
+        return record
@@ -0,0 +1,96 @@
+import os
+import json
+import time
+import hashlib
+from config import Settings, is_on
+
+# Checkpoint settings (override in .env)
+settings = Settings(
+    directory=("LEX_CHECKPOINT_DIR", os.path.join(".cache", "checkpoints"), str),
+    enabled=("LEX_CHECKPOINT", "1", is_on)
+)
+
+
+class SimulationState:
+    """
+    Serializable progress of one simulation: which case, the user's role and the output of every
+    completed step, in order. Saved after each step so a restarted front end can skip them.
+    """
+
+    def __init__(self, case_path, front_end, role=None, outputs=None, case_mtime=None):
+        self.case_path = os.path.abspath(case_path)
+        self.front_end = front_end
+        self.role = role
+        self.outputs = dict(outputs or {})  # step name -> output, in completion order
+        self.case_mtime = case_mtime if case_mtime is not None else os.stat(self.case_path).st_mtime_ns
+
+    def completed(self, step):
+        return step in self.outputs
+
+    def output(self, step, default=None):
+        return self.outputs.get(step, default)
+
+    def record(self, step, output):
+        """Stores a completed step's output and checkpoints the state."""
+        self.outputs[step] = output
+        save_checkpoint(self)
+
+    def to_dict(self):
+        return {
+            "case_path": self.case_path,
+            "front_end": self.front_end,
+            "role": self.role,
+            "outputs": self.outputs,
+            "case_mtime": self.case_mtime,
+            "saved": round(time.time(), 3)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["case_path"], data["front_end"], data.get("role"), data.get("outputs"), data.get("case_mtime"))
+
+    def __repr__(self):
+        return f"SimulationState({self.case_path!r}, {self.front_end!r}, steps={list(self.outputs)})"
+
+
+def checkpoint_path(front_end, case_path):
+    """One checkpoint per front end and case file."""
+    digest = hashlib.sha1(os.path.abspath(case_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(settings.directory, f"{front_end}_{digest}.json")
+
+
+def save_checkpoint(state):
+    """Writes the state atomically (a crash mid-write leaves the previous checkpoint intact)."""
+    if not settings.enabled:
+        return
+    os.makedirs(settings.directory, exist_ok=True)
+    path = checkpoint_path(state.front_end, state.case_path)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state.to_dict(), f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def load_checkpoint(front_end, case_path):
+    """
+    Returns the saved SimulationState for this front end and case, or None if there is none, it is
+    unreadable, or the case file has changed since it was saved.
+    """
+    path = checkpoint_path(front_end, case_path)
+    if not settings.enabled or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = SimulationState.from_dict(json.load(f))
+        if state.case_mtime != os.stat(state.case_path).st_mtime_ns:
+            return None
+    except (OSError, ValueError, KeyError):
+        return None
+    return state
+
+
+def clear_checkpoint(state):
+    """Removes the checkpoint once the simulation has finished."""
+    try:
+        os.remove(checkpoint_path(state.front_end, state.case_path))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,51 @@
+import os
+import threading
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env():
+    """Loads .env into the environment once, on the first setting read (importing this module does nothing)."""
+    global _env_loaded
+    if not _env_loaded:
+        with _env_lock:
+            if not _env_loaded:
+                from dotenv import load_dotenv  # Deferred: only needed once
+                load_dotenv()
+                _env_loaded = True
+
+
+def setting(name, default=None):
+    """Reads a setting from the environment / .env, like os.getenv."""
+    load_env()
+    return os.getenv(name, default)
+
+
+def is_on(value):
+    """Parses an on/off setting: "0" is off, anything else is on."""
+    return value != "0"
+
+
+def flag(name, default=True):
+    """Reads an on/off setting: "0" is off, anything else is on."""
+    return is_on(setting(name, "1" if default else "0"))
+
+
+class Settings:
+    """
+    A module's settings, each read from the environment / .env when it is first used rather than at
+    import: `settings = Settings(rpm=("GROQ_RPM", "30", int))`, then `settings.rpm`.
+    """
+
+    def __init__(self, **specs):
+        self._specs = specs  # attribute -> (variable name, default, parse)
+
+    def __getattr__(self, name):
+        try:
+            variable, default, parse = self._specs[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        value = parse(setting(variable, default))
+        setattr(self, name, value)  # Later reads find the attribute without coming back here
+        return value
@@ -1,100 +1,227 @@
 import time
 import json
-import os
-import requests
+import queue
+import threading
 import tkinter as tk
-from tkinter import scrolledtext, messagebox, filedialog
-from dotenv import load_dotenv
+from tkinter import scrolledtext, messagebox, filedialog, ttk
+import llm_client
+from llm_client import TimedStream
+from model_router import get_router
+from phases import courtroom_phases, build_phase_prompt
+from case_record import load_case_record
+from transcript_log import open_transcript
+from checkpoint import SimulationState, load_checkpoint, clear_checkpoint
+from session_store import SessionStore
+from config import Settings, is_on
 
-# Load API Key
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+# Append responses token by token as they arrive (LEX_STREAM=0 waits for the full response)
+settings = Settings(stream_output=("LEX_STREAM", "1", is_on))
 
-# Groq API endpoint
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+# The window's sessions never expire or get evicted: a desktop trial may sit idle for hours between phases
+store = SessionStore(ttl=0, max_sessions=0, max_bytes=0)
+session_id = None  # This window's session in the store (case, role, phase, transcript, checkpoint)
+phase_timings = []  # Time-to-first-token and total time of each phase response
+active_request = None  # The in-flight phase request (session, phase, result queue, cancel event), if any
 
-courtroom_phases = [
-    "Opening Statement", "Cross-Examination", "Evidence Submission",
-    "Legal Precedents", "Closing Argument", "Verdict"
-]
-
-phase_index = 0  # Tracks current phase
-case_data = None  # Stores loaded case data
+POLL_INTERVAL_MS = 50  # How often the Tk loop checks the worker's result queue
 
 
 def llm_generate_response(prompt):
     """Calls the Groq API to generate a response."""
-    headers = {"Authorization": f"Bearer {GROQ_API_KEY}", "Content-Type": "application/json"}
-    payload = {"model": "mixtral-8x7b-32768", "messages": [{"role": "system", "content": prompt}], "temperature": 0.5}
     try:
-        response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-    except requests.RequestException as e:
+        return get_router().complete("phase", prompt)
+    except llm_client.RequestException as e:
         return f"⚠ API Error: {str(e)}"
 
 
+def llm_stream_response(prompt, cancel=None):
+    """
+    Yields the Groq response chunk by chunk (as a single chunk when streaming is off). Setting `cancel`
+    shuts a stream's connection down straight away; with LEX_STREAM=0 the request can't be cancelled,
+    so the full completion is still generated and only discarded.
+    """
+    if not settings.stream_output:
+        yield llm_generate_response(prompt)
+        return
+    try:
+        yield from get_router().stream("phase", prompt, cancel=cancel)
+    except llm_client.RequestException as e:
+        yield f"⚠ API Error: {str(e)}"
+
+
 def load_case_data():
     """Loads case data from a JSON file."""
     file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
     if not file_path:
         return None
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_case_record(file_path)
     except (FileNotFoundError, json.JSONDecodeError):
         messagebox.showerror("Error", f"Unable to load or parse {file_path}.")
         return None
 
 
+def current_session():
+    """This window's session, or None if no case is loaded."""
+    return store.get(session_id) if session_id else None
+
+
 def start_simulation():
-    """Loads and displays case details."""
-    global case_data, phase_index
+    """Loads and displays case details, offering to resume a checkpointed simulation of the case."""
+    global session_id
+    if active_request:
+        messagebox.showwarning("Warning", "Wait for the current phase to finish or cancel it first.")
+        return
     case_data = load_case_data()
-    phase_index = 0
+    if session_id:
+        store.remove(session_id)  # Closes the previous case's transcript
+        session_id = None
     if case_data:
-        case_title.set(f"📜 Case: {case_data['case_title']}")
-        case_details.insert(tk.END, f"Loaded case: {case_data['case_title']} ({case_data['date']})\n")
+        transcript = open_transcript(case_data.case_title, "court_sim", path=case_data.path)
+        session = store.create(case_data, role_var.get(), "court_sim", transcript)
+        session_id = session.id
+        case_title.set(f"📜 Case: {case_data.case_title}")
+        case_details.insert(tk.END, f"Loaded case: {case_data.case_title} ({case_data.date})\n")
+
+        saved = load_checkpoint("court_sim", case_data.path)
+        if saved and saved.outputs and messagebox.askyesno("Resume", f"Resume the saved {saved.role} simulation of this case ({len(saved.outputs)} phases done)?"):
+            session.checkpoint = saved
+            session.role = saved.role
+            role_var.set(saved.role)
+            restore_phases(session, saved)
+        else:
+            session.checkpoint = SimulationState(case_data.path, "court_sim", role=role_var.get())
         proceed_to_next_phase()
     else:
         case_details.insert(tk.END, "⚠ No case data loaded!\n")
 
 
+def restore_phases(session, state):
+    """Shows the checkpointed phase outputs and marks them done in the session, without calling the API."""
+    for phase in courtroom_phases:
+        if not state.completed(phase):
+            break
+        case_details.insert(tk.END, f"\n🔹 **{phase} (AI Response, restored):**\n{state.output(phase)}\n")
+        store.record(session, phase, state.output(phase))
+    case_details.see(tk.END)
+
+
 def proceed_to_next_phase():
     """Moves to the next phase of the courtroom trial."""
-    global phase_index
-    if not case_data:
+    global active_request
+    if active_request:
+        return  # A phase is already being generated; ignore repeated clicks
+
+    session = current_session()
+    if not session:
         messagebox.showwarning("Warning", "Load a case first!")
         return
 
-    if phase_index >= len(courtroom_phases):
+    phase = session.phase
+    if phase is None:
         case_details.insert(tk.END, "\n⚖️ **Case Closed!** The trial has concluded.\n")
         return
 
-    phase = courtroom_phases[phase_index]
     user_role = role_var.get()
     user_argument = user_argument_entry.get("1.0", tk.END).strip()
-    case_facts = {"title": case_data["case_title"], "arguments": case_data.get("key_arguments", "No details provided.")}
-
-    prompt_templates = {
-        "Opening Statement": f"Generate an opening statement for {user_role} in the case '{case_facts['title']}'. Arguments: {case_facts['arguments']}.",
-        "Cross-Examination": f"Generate a tough cross-examination question for the opposing party in '{case_facts['title']}'.",
-        "Evidence Submission": f"Summarize key evidence supporting {user_role} in '{case_facts['title']}'.",
-        "Legal Precedents": f"List similar past legal cases relevant to '{case_facts['title']}' and their impact.",
-        "Closing Argument": f"Generate a persuasive closing argument for {user_role} in '{case_facts['title']}'.",
-        "Verdict": f"Act as a judge and give a verdict for '{case_facts['title']}' based on arguments: {case_facts['arguments']}."
-    }
-
-    if user_argument:
-        prompt_templates[phase] += f"\nUser's Additional Argument: {user_argument}"
+    prompt = build_phase_prompt(phase, user_role, session.case, user_argument)
 
-    response = llm_generate_response(prompt_templates[phase])
+    case_details.insert(tk.END, f"\n🔹 **{phase} (AI Response):**\n")
+    case_details.see(tk.END)
 
-    case_details.insert(tk.END, f"\n🔹 **{phase} (AI Response):**\n{response}\n")
+    # Generate on a worker thread; the Tk loop picks up chunks from the queue in poll_phase_request
+    active_request = {"session": session, "phase": phase, "role": user_role, "prompt": prompt,
+                      "queue": queue.Queue(), "cancel": threading.Event()}
+    session.busy = True
+    threading.Thread(
+        target=run_phase_request,
+        args=(prompt, active_request["queue"], active_request["cancel"]),
+        daemon=True
+    ).start()
+    set_busy(True, f"⏳ Generating {phase}...")
+    root.after(POLL_INTERVAL_MS, poll_phase_request, active_request)
+
+
+def run_phase_request(prompt, results, cancel):
+    """Worker thread: streams the LLM response into `results` until done or cancelled."""
+    response = TimedStream(llm_stream_response(prompt, cancel))
+    try:
+        for chunk in response:
+            if cancel.is_set():
+                break
+            results.put(("chunk", chunk))
+    except Exception as e:
+        results.put(("chunk", f"⚠ Error: {str(e)}"))
+    results.put(("cancelled", None) if cancel.is_set() else ("done", response))
+
+
+def poll_phase_request(request):
+    """Runs on the Tk loop: appends queued chunks and finishes the phase once the worker is done."""
+    global active_request
+    if request is not active_request:
+        return  # Cancelled; a newer request (or none) is active now
+
+    while True:
+        try:
+            kind, value = request["queue"].get_nowait()
+        except queue.Empty:
+            root.after(POLL_INTERVAL_MS, poll_phase_request, request)
+            return
+
+        if kind == "chunk":
+            case_details.insert(tk.END, value)
+            case_details.see(tk.END)
+        elif kind == "done":
+            timing = {"phase": request["phase"], "role": request["role"], "first_token": value.first_token, "total": value.total}
+            phase_timings.append(timing)
+            session = request["session"]
+            if session.transcript:
+                session.transcript.log_turn(request["phase"], request["role"], value.text, prompt=request["prompt"], timing=timing)
+            case_details.insert(tk.END, f"\n⏱ First token {value.first_token or 0:.2f}s, total {value.total:.2f}s\n")
+            case_details.see(tk.END)
+            session.role = session.checkpoint.role = request["role"]
+            store.record(session, request["phase"], value.text)  # Moves to the next phase
+            if session.phase:
+                session.checkpoint.record(request["phase"], value.text)
+            else:
+                clear_checkpoint(session.checkpoint)  # The trial is over; nothing left to resume
+            session.busy = False
+            active_request = None
+            set_busy(False)
+            return
+        else:
+            return
+
+
+def cancel_phase():
+    """
+    Aborts the in-flight phase request (a streamed one stops generating at once; see llm_stream_response);
+    the phase can be retried with Proceed.
+    """
+    global active_request
+    if not active_request:
+        return
+    active_request["cancel"].set()
+    session = active_request["session"]
+    session.busy = False
+    if session.transcript:
+        session.transcript.write("cancelled", phase=active_request["phase"], role=active_request["role"])
+    case_details.insert(tk.END, f"\n⛔ {active_request['phase']} cancelled.\n")
     case_details.see(tk.END)
+    active_request = None
+    set_busy(False)
 
-    phase_index += 1  # Move to next phase
+
+def set_busy(busy, message=""):
+    """Toggles the progress indicator and the buttons that must not be used mid-request."""
+    status_text.set(message)
+    if busy:
+        progress.start(10)
+    else:
+        progress.stop()
+    proceed_button.config(state=tk.DISABLED if busy else tk.NORMAL)
+    load_button.config(state=tk.DISABLED if busy else tk.NORMAL)
+    cancel_button.config(state=tk.NORMAL if busy else tk.DISABLED)
 
 
 def export_case_discussion():
@@ -110,45 +237,61 @@ def export_case_discussion():
         messagebox.showinfo("Success", "Case discussion saved successfully!")
 
 
-# GUI Setup
-root = tk.Tk()
-root.title("⚖ AI Courtroom Simulation ⚖")
-root.geometry("800x600")
-
-# Title
-tk.Label(root, text="⚖ AI Courtroom Simulation ⚖", font=("Arial", 16, "bold")).pack(pady=5)
-
-# Load Case Button
-load_button = tk.Button(root, text="📂 Load Case", command=start_simulation)
-load_button.pack()
-
-# Case Title
-case_title = tk.StringVar()
-tk.Label(root, textvariable=case_title, font=("Arial", 12)).pack()
-
-# Case Details Text Area
-case_details = scrolledtext.ScrolledText(root, width=90, height=12, wrap=tk.WORD)
-case_details.pack(pady=5)
-
-# User Input for Custom Arguments
-tk.Label(root, text="Your Additional Argument:").pack()
-user_argument_entry = scrolledtext.ScrolledText(root, width=80, height=3, wrap=tk.WORD)
-user_argument_entry.pack()
-
-# Role Selection
-tk.Label(root, text="Choose Role:").pack()
-role_var = tk.StringVar(value="Appellant")
-roles = ["Appellant", "Respondent", "Judge"]
-for role in roles:
-    tk.Radiobutton(root, text=role, variable=role_var, value=role).pack()
-
-# Proceed to Next Phase Button
-proceed_button = tk.Button(root, text="✅ Yes (Proceed)", command=proceed_to_next_phase)
-proceed_button.pack(pady=5)
-
-# Export Discussion Button
-export_button = tk.Button(root, text="📜 Export Discussion", command=export_case_discussion)
-export_button.pack(pady=5)
-
-# Run GUI
-root.mainloop()
+def build_gui():
+    """Builds the Tk window and widgets."""
+    global root, case_title, case_details, user_argument_entry, role_var
+    global load_button, proceed_button, status_text, progress, cancel_button
+
+    root = tk.Tk()
+    root.title("⚖ AI Courtroom Simulation ⚖")
+    root.geometry("800x600")
+
+    # Title
+    tk.Label(root, text="⚖ AI Courtroom Simulation ⚖", font=("Arial", 16, "bold")).pack(pady=5)
+
+    # Load Case Button
+    load_button = tk.Button(root, text="📂 Load Case", command=start_simulation)
+    load_button.pack()
+
+    # Case Title
+    case_title = tk.StringVar()
+    tk.Label(root, textvariable=case_title, font=("Arial", 12)).pack()
+
+    # Case Details Text Area
+    case_details = scrolledtext.ScrolledText(root, width=90, height=12, wrap=tk.WORD)
+    case_details.pack(pady=5)
+
+    # User Input for Custom Arguments
+    tk.Label(root, text="Your Additional Argument:").pack()
+    user_argument_entry = scrolledtext.ScrolledText(root, width=80, height=3, wrap=tk.WORD)
+    user_argument_entry.pack()
+
+    # Role Selection
+    tk.Label(root, text="Choose Role:").pack()
+    role_var = tk.StringVar(value="Appellant")
+    roles = ["Appellant", "Respondent", "Judge"]
+    for role in roles:
+        tk.Radiobutton(root, text=role, variable=role_var, value=role).pack()
+
+    # Proceed to Next Phase Button
+    proceed_button = tk.Button(root, text="✅ Yes (Proceed)", command=proceed_to_next_phase)
+    proceed_button.pack(pady=5)
+
+    # Progress Indicator & Cancel Button
+    status_text = tk.StringVar()
+    tk.Label(root, textvariable=status_text).pack()
+    progress = ttk.Progressbar(root, mode="indeterminate", length=300)
+    progress.pack()
+    cancel_button = tk.Button(root, text="⛔ Cancel", command=cancel_phase, state=tk.DISABLED)
+    cancel_button.pack(pady=5)
+
+    # Export Discussion Button
+    export_button = tk.Button(root, text="📜 Export Discussion", command=export_case_discussion)
+    export_button.pack(pady=5)
+
+
+if __name__ == "__main__":
+    build_gui()
+    root.mainloop()
+    if session_id:
+        store.remove(session_id)
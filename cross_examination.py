@@ -1,31 +1,34 @@
-import openai
-from dotenv import load_dotenv
-import os
-import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import llm_client
+from model_router import generate_for
+from case_record import as_case_record, load_case_record
+from prompt_builder import build_context, compact_prompt
+from scheduler import with_priority, RETRY_STATUSES
+import parallel
+from config import Settings
 
-# Load API Key
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-openai.api_key = GROQ_API_KEY
+# Witnesses cross-examined at the same time, attempts per witness before giving up, and retries
+# shared by all the witnesses of one cross_examine_all() call (override in .env)
+settings = Settings(
+    max_concurrent_witnesses=("LEX_CROSS_CONCURRENCY", "4", int),
+    witness_attempts=("LEX_CROSS_ATTEMPTS", "2", int),
+    retry_budget=("LEX_CROSS_RETRY_BUDGET", "2", int),
+    retry_delay=("LEX_CROSS_RETRY_DELAY", "1", float)  # Doubles after each failed attempt
+)
 
 def load_case_file(file_path):
-    """Loads case data from JSON file."""
-    with open(file_path, "r") as file:
-        return json.load(file)
+    """Loads case data from JSON file (as a CaseRecord)."""
+    return load_case_record(file_path)
 
 def extract_case_details(case_data):
-    """Extracts structured case details from JSON."""
-    case_facts = {
-        "title": case_data["case_title"],
-        "court": case_data["court"],
-        "date": case_data["date"],
-        "contract_purpose": case_data["contract_details"]["contract_purpose"],
-        "arguments": case_data.get("key_arguments") or case_data.get("legal_arguments",{}),
-        "final_award": case_data["judgment_summary"]["final_award"]
-    }
-
-    # No explicit witnesses in JSON, so assume none unless added later
-    witnesses = []  # If witness data is included in the JSON, update this
+    """Extracts structured case details from JSON (a dict or CaseRecord)."""
+    record = as_case_record(case_data)
+    case_facts = record.case_facts("court", "date", "contract_purpose", "final_award")
+
+    # Witnesses are optional in the case JSON
+    witnesses = list(record.witnesses)
 
     return {"case_facts": case_facts, "witnesses": witnesses}
 
@@ -33,21 +36,77 @@ def generate_cross_examination(witness_name, witness_statement, case_facts):
     """
     Generates AI-powered cross-examination questions.
     """
-    prompt = f"""
+    prompt = compact_prompt(f"""
     You are a courtroom lawyer cross-examining the witness: {witness_name}.
     Their testimony: "{witness_statement}"
 
-    Based on the case facts: {case_facts}, generate:
+    Based on the case facts:
+    {build_context(case_facts, "cross_examination")}
+
+    Generate:
     - 3 strong cross-examination questions to challenge inconsistencies.
     - A possible follow-up if the witness contradicts themselves.
+    """)
+
+    return generate_for("cross_examination", prompt)
+
+def witness_details(witness):
+    """(name, statement) of a witness given as a name or as a {"name", "testimony"} dict."""
+    if isinstance(witness, dict):
+        name = witness.get("name", "Unknown Witness")
+        return name, witness.get("testimony") or witness.get("statement") or f"{name} testified in this case."
+    return str(witness), f"Witness {witness} claims they saw the defendant at the scene."
+
+def retryable(error):
     """
+    Whether a failed request is worth another attempt: rate limits, server errors and network errors,
+    which the scheduler and the router have already retried and given up on. A request the API
+    rejected outright would only be rejected again.
+    """
+    response = getattr(error, "response", None)
+    return response is None or response.status_code in RETRY_STATUSES
 
-    response = openai.ChatCompletion.create(
-        model="deepseek-r1-distill-llama-7b",
-        messages=[{"role": "system", "content": prompt}]
-    )
+def cross_examine_witness(witness, case_facts, attempts=None, retry_delay=None, retries=None):
+    """
+    One witness's cross-examination, making at most `attempts` (>= 1) attempts with exponential backoff.
+    Only an empty response or a retryable() error is retried, and only while the `retries` semaphore
+    (shared by a batch of witnesses, if given) has retries left. Returns an error message once it gives up,
+    so one witness can't sink the rest.
+    """
+    attempts = settings.witness_attempts if attempts is None else attempts
+    if attempts < 1:
+        raise ValueError("attempts must be at least 1")
+    retry_delay = settings.retry_delay if retry_delay is None else retry_delay
+    name, statement = witness_details(witness)
+    for attempt in range(attempts):
+        try:
+            questions = generate_cross_examination(name, statement, case_facts)
+            if questions.strip():
+                return questions
+            error = "empty response"
+        except llm_client.RequestException as e:
+            error = str(e)
+            if not retryable(e):
+                break
+        if attempt == attempts - 1 or (retries is not None and not retries.acquire(blocking=False)):
+            break
+        time.sleep(retry_delay * 2 ** attempt)
+    return f"⚠ Error generating cross-examination for {name} after {attempt + 1} attempts: {error}"
 
-    return response["choices"][0]["message"]["content"]
+def cross_examine_all(witnesses, case_facts, max_concurrent=None, attempts=None, retry_delay=None):
+    """
+    Cross-examination questions for every witness, generated at the same time (at most
+    `max_concurrent` at once) and returned in witness order as [(name, questions)]. All the
+    witnesses together retry at most LEX_CROSS_RETRY_BUDGET times.
+    """
+    if not witnesses:
+        return []
+    max_concurrent = settings.max_concurrent_witnesses if max_concurrent is None else max_concurrent
+    retries = threading.Semaphore(settings.retry_budget)
+    workers = min(max_concurrent, len(witnesses)) if parallel.settings.concurrent else 1
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="lex-cross") as pool:
+        results = pool.map(with_priority(lambda witness: cross_examine_witness(witness, case_facts, attempts, retry_delay, retries)), witnesses)
+        return [(witness_details(witness)[0], questions) for witness, questions in zip(witnesses, results)]
 
 # Example Usage:
 if __name__ == "__main__":
@@ -58,9 +117,9 @@ if __name__ == "__main__":
         structured_case = extract_case_details(case_data)
 
         if structured_case["witnesses"]:  # Proceed only if witnesses exist
-            for witness in structured_case["witnesses"]:
-                witness_statement = f"Witness {witness} claims they saw the defendant at the scene."
-                cross_exam = generate_cross_examination(witness, witness_statement, structured_case["case_facts"])
+            start = time.perf_counter()
+            for witness, cross_exam in cross_examine_all(structured_case["witnesses"], structured_case["case_facts"]):
                 print(f"\n🔹 Cross-Examination for {witness}:\n", cross_exam)
+            print(f"\n⏱ {len(structured_case['witnesses'])} witnesses in {time.perf_counter() - start:.2f}s")
         else:
             print("⚠ No witness data found in the case file.")
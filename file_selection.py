@@ -1,37 +1,52 @@
 import os
+from case_index import get_case_index
 
-def list_files(directory):
-    """Lists all files in the specified directory."""
-    if not os.path.exists(directory):
-        print(f"⚠ Directory '{directory}' not found. Creating it now...")
-        os.makedirs(directory)  # Create 'data/' directory if it doesn't exist
-    files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
-    return files
+RESULTS_PER_PAGE = 20
 
-def get_user_choice(files):
-    """Prompts the user to select a file from the list."""
-    print("\n📂 Available case files in 'data/':")
-    for i, file in enumerate(files, 1):
-        print(f"{i}. {file}")
+def parse_query(text):
+    """Splits search input into free text and court:/year:/judge: filters (e.g. 'arbitration court:bombay year:2013')."""
+    words, filters = [], {}
+    for token in text.split():
+        key, sep, value = token.partition(":")
+        if sep and ((key.lower() in ("court", "judge") and value) or (key.lower() == "year" and value.isdigit())):
+            filters[key.lower()] = value
+        else:
+            words.append(token)
+    return " ".join(words), filters
 
-    while True:
-        try:
-            choice = int(input("\n🔹 Enter the number of the file you want to open: "))
-            if 1 <= choice <= len(files):
-                return files[choice - 1]
-            else:
-                print("❌ Invalid choice. Please enter a valid number.")
-        except ValueError:
-            print("❌ Please enter a valid number.")
+def search_cases(query=""):
+    """Searches the case index (title, court, judge, parties, laws, precedents) and prints numbered matches."""
+    text, filters = parse_query(query)
+    results = get_case_index().search(text, limit=RESULTS_PER_PAGE, **filters)
+    if query:
+        print(f"\n🔎 Cases matching '{query}':")
+    else:
+        print(f"\n📂 Cases in 'data/' (first {RESULTS_PER_PAGE}; type words to search):")
+    for i, case in enumerate(results, 1):
+        print(f"{i}. {case['case_title']} — {case['court']} ({case['date']})")
+    if not results:
+        print("❌ No matching cases.")
+    return results
 
 def select_case_file():
-    """Lists files in the 'data/' directory and allows user selection."""
+    """Lets the user search the indexed 'data/' directory and pick a case by number."""
     directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")  # Change to 'data/' directory
-    files = list_files(directory)
+    if not os.path.exists(directory):
+        print(f"⚠ Directory '{directory}' not found. Creating it now...")
+        os.makedirs(directory)
 
-    if not files:
+    index = get_case_index()
+    index.update(directory)  # Only new or modified files are re-parsed
+    if not index.count():
         print("⚠ No case files found in the 'data/' directory.")
         return None
 
-    selected_file = get_user_choice(files)
-    return os.path.join(directory, selected_file)
+    results = search_cases()
+    while True:
+        choice = input("\n🔹 Enter the number of the case to open, or search terms to filter: ").strip()
+        if choice.isdigit():
+            if 1 <= int(choice) <= len(results):
+                return results[int(choice) - 1]["path"]
+            print("❌ Invalid choice. Please enter a valid number.")
+        else:
+            results = search_cases(choice)
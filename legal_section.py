@@ -1,27 +1,27 @@
 import json
+from case_record import load_case_record
 
 def load_legal_section(json_path):
     """
     Loads case details from the given JSON file and extracts relevant information.
     """
     try:
-        with open(json_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        record = load_case_record(json_path)
 
         case_details = {
-            "case_title": data.get("case_title", ""),
-            "court": data.get("court", ""),
-            "date": data.get("date", ""),
-            "judgment_by": data.get("judgment_by", ""),
-            "contract_purpose": data.get("contract_details", {}).get("contract_purpose", ""),
-            "laws_cited": data.get("legal_references", {}).get("laws_cited", []),
-            "precedents": data.get("legal_references", {}).get("precedents", []),
+            "case_title": record.case_title,
+            "court": record.court,
+            "date": record.date,
+            "judgment_by": record.judgment_by,
+            "contract_purpose": record.contract_purpose,
+            "laws_cited": record.laws_cited,
+            "precedents": record.precedents,
             "arguments": {
-                "appellant": data.get("key_arguments", {}).get("appellant", ""),
-                "respondent": data.get("key_arguments", {}).get("respondent", "")
+                "appellant": record.arguments.get("appellant", ""),
+                "respondent": record.arguments.get("respondent", "")
             },
-            "court_decision": data.get("judgment_summary", {}).get("court_decision", ""),
-            "final_award": data.get("judgment_summary", {}).get("final_award", "")
+            "court_decision": record.court_decision,
+            "final_award": record.final_award
         }
 
         return case_details
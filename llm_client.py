@@ -0,0 +1,247 @@
+import json
+import time
+import socket
+import threading
+from response_cache import get_cache, make_key
+from scheduler import get_scheduler, requests_module, settings as scheduler_settings
+from prompt_builder import estimate_tokens
+from config import Settings, setting
+
+settings = Settings(
+    # Groq API endpoint (OpenAI-compatible)
+    api_url=("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions", str),
+    # Model & sampling configuration (override in .env)
+    default_model=("GROQ_MODEL", "mixtral-8x7b-32768", str),
+    reasoning_model=("GROQ_REASONING_MODEL", "deepseek-r1-distill-llama-70b", str),
+    temperature=("GROQ_TEMPERATURE", "0.5", float),
+    # Connection settings
+    connect_timeout=("GROQ_CONNECT_TIMEOUT", "5", float),
+    read_timeout=("GROQ_READ_TIMEOUT", "60", float),
+    pool_size=("GROQ_POOL_SIZE", "10", int)
+)
+CANCEL_POLL_INTERVAL = 0.05  # How often a stream's watcher checks its cancel event
+
+# Exceptions of the requests package, available as llm_client.RequestException etc. without importing it up front
+REQUESTS_EXCEPTIONS = {"RequestException", "HTTPError", "ConnectionError", "Timeout"}
+
+
+def __getattr__(name):
+    if name in REQUESTS_EXCEPTIONS:
+        return getattr(requests_module(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LLMClient:
+    """Shared Groq chat client that keeps connections (and TLS sessions) alive between calls."""
+
+    def __init__(self, api_key=None, api_url=None, timeout=None, pool_size=None, cache=None, scheduler=None):
+        requests = requests_module()
+        self.api_key = api_key or setting("GROQ_API_KEY")
+        self.api_url = api_url or settings.api_url
+        self.timeout = timeout or (settings.connect_timeout, settings.read_timeout)
+        self.cache = cache if cache is not None else get_cache()
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+        pool_size = pool_size or settings.pool_size
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+
+    def build_payload(self, prompt, model=None, temperature=None):
+        """Builds the chat completions payload for a single system prompt."""
+        return {
+            "model": model or settings.default_model,
+            "messages": [{"role": "system", "content": prompt}],
+            "temperature": settings.temperature if temperature is None else temperature
+        }
+
+    def reserved_tokens(self, payload):
+        """Tokens counted against the TPM limit before the response reports its real usage."""
+        return sum(estimate_tokens(message["content"]) for message in payload["messages"]) + scheduler_settings.reserved_output_tokens
+
+    def cached(self, prompt, model=None, temperature=None):
+        """The cached response for this request, or None."""
+        return self.cache.get(make_key(self.build_payload(prompt, model, temperature)))
+
+    def remember(self, prompt, model, temperature, data):
+        """Caches a response fetched with use_cache=False after a cached() miss, so the lookup isn't repeated."""
+        if data.get("choices"):
+            self.cache.set(make_key(self.build_payload(prompt, model, temperature)), data)
+
+    def chat(self, prompt, model=None, temperature=None, use_cache=True):
+        """
+        Sends the prompt and returns the raw JSON response.
+        Identical requests are served from the response cache unless use_cache is False.
+        Requests go through the rate-limiting scheduler, which retries 429s, 5xx responses and timeouts.
+        Raises RequestException (llm_client.RequestException) on network errors and non-2xx responses.
+        """
+        payload = self.build_payload(prompt, model, temperature)
+        key = make_key(payload) if use_cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        reserved = self.reserved_tokens(payload)
+        response = self.scheduler.send(lambda: self.session.post(self.api_url, json=payload, timeout=self.timeout), reserved)
+        data = response.json()
+        self.scheduler.settle(reserved, usage_tokens(data))
+
+        if key and data.get("choices"):
+            self.cache.set(key, data)
+        return data
+
+    def complete(self, prompt, model=None, temperature=None, use_cache=True):
+        """Sends the prompt and returns only the generated text."""
+        data = self.chat(prompt, model, temperature, use_cache)
+        return extract_content(data)
+
+    def stream(self, prompt, model=None, temperature=None, use_cache=True, cancel=None):
+        """
+        Sends the prompt with streaming enabled and yields text chunks as they arrive.
+        A cached response is yielded as a single chunk; a completed stream is written to the cache.
+        Setting the `cancel` event shuts the connection down without waiting for the next chunk and
+        ends the stream; a request still waiting for its response headers stops once they arrive.
+        """
+        payload = self.build_payload(prompt, model, temperature)
+        key = make_key(payload) if use_cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield extract_content(cached)
+                return
+
+        parts = []
+        reserved = self.reserved_tokens(payload)
+        used = None
+        request = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+        response = self.scheduler.send(
+            lambda: self.session.post(self.api_url, json=request, timeout=self.timeout, stream=True),
+            reserved
+        )
+        response.encoding = "utf-8"  # text/event-stream has no charset, and requests would assume ISO-8859-1
+        finished = threading.Event()
+        if cancel is not None:
+            threading.Thread(target=abort_on_cancel, args=(response, cancel, finished), daemon=True).start()
+        try:
+            with response:
+                for line in response.iter_lines(decode_unicode=True):
+                    if cancel is not None and cancel.is_set():
+                        return
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    used = usage_tokens(event) or used
+                    choices = event.get("choices") or [{}]
+                    chunk = choices[0].get("delta", {}).get("content")
+                    if chunk:
+                        parts.append(chunk)
+                        yield chunk
+        except Exception:
+            if cancel is not None and cancel.is_set():
+                return  # The read was cut off by abort_on_cancel
+            raise
+        finally:
+            finished.set()
+            # Usage arrives in the last event; a stream that ended early is charged for the text it received
+            if used is None:
+                used = reserved - scheduler_settings.reserved_output_tokens + estimate_tokens("".join(parts))
+            self.scheduler.settle(reserved, used)
+
+        if key and parts:
+            self.cache.set(key, {"choices": [{"message": {"role": "assistant", "content": "".join(parts)}}]})
+
+    def close(self):
+        self.session.close()
+
+
+def abort_on_cancel(response, cancel, finished):
+    """
+    Watcher thread of a stream: once `cancel` is set, shuts down the response's socket so a read
+    blocked waiting for the next chunk fails at once (closing the response would wait for that read).
+    """
+    while not finished.wait(CANCEL_POLL_INTERVAL):
+        if cancel.is_set():
+            sock = getattr(getattr(response.raw, "_connection", None), "sock", None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # Already closed
+            return
+
+
+class TimedStream:
+    """
+    Wraps a chunk iterator and records time-to-first-token and total time once it is exhausted.
+    `on_done` (if given) is called with the TimedStream when the stream finishes.
+    """
+
+    def __init__(self, chunks, label=None, on_done=None):
+        self.chunks = chunks
+        self.label = label
+        self.on_done = on_done
+        self.first_token = None
+        self.total = None
+        self.parts = []
+
+    def __iter__(self):
+        start = time.perf_counter()
+        for chunk in self.chunks:
+            if self.first_token is None:
+                self.first_token = time.perf_counter() - start
+            self.parts.append(chunk)
+            yield chunk
+        self.total = time.perf_counter() - start
+        if self.on_done:
+            self.on_done(self)
+
+    @property
+    def text(self):
+        return "".join(self.parts).strip()
+
+
+def usage_tokens(data):
+    """Total tokens a response (or the last event of a stream) reports using, or None."""
+    usage = data.get("usage") or (data.get("x_groq") or {}).get("usage") or {}
+    return usage.get("total_tokens")
+
+
+def extract_content(data):
+    """Pulls the message text out of a chat completions response."""
+    choices = data.get("choices") or [{}]
+    return (choices[0].get("message", {}).get("content") or "").strip()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the process-wide LLMClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
+
+
+def set_client(client):
+    """Replaces the process-wide LLMClient (e.g. to point every module at a mock server)."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def generate(prompt, model=None, temperature=None, use_cache=True):
+    """Convenience wrapper: generate text with the shared client."""
+    return get_client().complete(prompt, model=model, temperature=temperature, use_cache=use_cache)
@@ -1,52 +1,55 @@
 import time
 import json
-import os
-import requests
-from dotenv import load_dotenv
-import groq
 from agents import CourtAgent
+import llm_client
+from llm_client import TimedStream
+from model_router import get_router
+from prompt_builder import build_context
+from case_record import load_case_record
+from parallel import Speculation
+from transcript_log import open_transcript
+from checkpoint import SimulationState, load_checkpoint, save_checkpoint, clear_checkpoint
 from objections import handle_objection, detect_objections
 from roles import assign_roles
-from strategy import suggest_strategy
+from strategy import stream_strategy
+from utils import ThinkStripper
 from file_selection import select_case_file  # Allow user to select case data file
+from config import Settings, is_on
 
-# Load API Key
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+settings = Settings(
+    # Print responses token by token as they arrive (LEX_STREAM=0 waits for the full response)
+    stream_output=("LEX_STREAM", "1", is_on),
+    # Start likely next responses while waiting for user input; unused ones are cancelled (LEX_PREFETCH=0 disables)
+    prefetch=("LEX_PREFETCH", "1", is_on)
+)
 
-# Set up Groq API client
-client = groq.Client(api_key=GROQ_API_KEY)
-
-# Groq API endpoint
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+phase_timings = []  # Time-to-first-token and total time of each streamed phase response
+transcript = None  # The session's TranscriptLog (None when LEX_TRANSCRIPT=0)
 
 def llm_generate_response(prompt):
     """Calls the Groq LLM API to generate a response based on the prompt."""
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "mixtral-8x7b-32768",
-        "messages": [{"role": "system", "content": prompt}],
-        "temperature": 0.5
-    }
     try:
-        response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-    except requests.RequestException as e:
+        return get_router().complete("phase", prompt)
+    except llm_client.RequestException as e:
         return f"⚠ API Error: {str(e)}"
 
+def llm_stream_response(prompt, cancel=None):
+    """Yields the Groq LLM response chunk by chunk (as a single chunk when streaming is off)."""
+    if not settings.stream_output:
+        yield llm_generate_response(prompt)
+        return
+    try:
+        yield from get_router().stream("phase", prompt, cancel=cancel)
+    except llm_client.RequestException as e:
+        yield f"⚠ API Error: {str(e)}"
+
 def load_case_data():
-    """Loads case data from a user-selected JSON file."""
+    """Loads case data from a user-selected JSON file as a CaseRecord."""
     case_file = select_case_file()
     if not case_file:
         return None
     try:
-        with open(case_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_case_record(case_file)
     except (FileNotFoundError, json.JSONDecodeError):
         print(f"⚠ Error: Unable to load or parse {case_file}.")
         return None
@@ -74,20 +77,78 @@ def print_courtroom_scene(phase):
     print(f"\n📣 {scenes.get(phase, '')}")
     time.sleep(2)
 
-def generate_phase_response(phase, user_role, case_facts):
-    """Generates AI responses for courtroom phases."""
+def build_phase_prompt(phase, user_role, case_facts):
+    """Builds the LLM prompt for a courtroom phase."""
     prompt_templates = {
-        "opening": f"Generate an opening statement for {user_role} in the case titled '{case_facts['title']}'. Arguments: {case_facts['arguments']}.",
+        "opening": f"Generate an opening statement for {user_role} in the case titled '{case_facts['title']}'. Arguments: {build_context(case_facts['arguments'], 'speech')}.",
         "evidence": f"Describe a key piece of evidence {user_role} might present in '{case_facts['title']}'.",
         "witness": f"Generate a witness testimony relevant to '{case_facts['title']}'.",
         "cross": f"Generate a tough cross-examination question for the opposing party in '{case_facts['title']}'.",
         "closing": f"Generate a persuasive closing argument for {user_role} in '{case_facts['title']}', summarizing key arguments."
     }
-    return llm_generate_response(prompt_templates.get(phase, "Generate a legal argument."))
+    return prompt_templates.get(phase, "Generate a legal argument.")
+
+def generate_phase_response(phase, user_role, case_facts):
+    """Generates AI responses for courtroom phases."""
+    return llm_generate_response(build_phase_prompt(phase, user_role, case_facts))
+
+def log_turn(phase, role, response, prompt=None, timing=None, **extra):
+    """Appends a turn to the session transcript, if one is open."""
+    if transcript:
+        transcript.log_turn(phase, role, response, prompt=prompt, timing=timing, **extra)
+
+def timed_phase_response(phase, user_role, prompt, chunks):
+    """Times a phase response from when it is shown; once done it goes into `phase_timings` and the transcript."""
+    def record(timed):
+        timing = {"phase": phase, "role": user_role, "first_token": timed.first_token, "total": timed.total}
+        phase_timings.append(timing)
+        log_turn(phase, user_role, timed.text, prompt=prompt, timing=timing)
+
+    return TimedStream(chunks, label=phase, on_done=record)
+
+def stream_phase_response(phase, user_role, case_facts):
+    """Streams the AI response for a courtroom phase, recording its timing in `phase_timings`."""
+    prompt = build_phase_prompt(phase, user_role, case_facts)
+    return timed_phase_response(phase, user_role, prompt, llm_stream_response(prompt))
+
+def speculate_phase_response(phase, user_role, case_facts, eager=None):
+    """
+    Starts a phase response in the background before it is known to be needed (when LEX_PREFETCH is on,
+    or always with eager=True). It is timed and logged only if taken, so its timing is the wait the user actually sees.
+    """
+    prompt = build_phase_prompt(phase, user_role, case_facts)
+    eager = settings.prefetch if eager is None else eager
+    return Speculation(lambda cancel: llm_stream_response(prompt, cancel), eager=eager,
+                       wrap=lambda chunks: timed_phase_response(phase, user_role, prompt, chunks))
+
+def user_turn(speculation, user_input, phase, user_role):
+    """The user's typed text, or the prefetched suggestion if they asked for one (the other is discarded)."""
+    if user_input.lower() == 'suggest':
+        return speculation.take()
+    speculation.discard()
+    log_turn(phase, user_role, user_input, source="user")
+    return [user_input]
+
+def print_streamed(prefix, chunks):
+    """Prints a quoted response incrementally as its chunks arrive and returns the full text."""
+    print(f'{prefix}"', end="", flush=True)
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        print(chunk, end="", flush=True)
+    print('"')
+    return "".join(parts).strip()
+
+def show_restored(prefix, text):
+    """Shows a step's checkpointed output instead of generating it again."""
+    print(f'{prefix}"{text}" (restored)')
+    return text
 
 def main():
-    """Runs the AI courtroom simulation."""
+    """Runs the AI courtroom simulation, resuming from the last checkpoint if the user wants to."""
+    global transcript
     print("\n⚖️ Welcome to the **AI Courtroom Simulation**! ⚖️\n")
+    phase_timings.clear()
     time.sleep(1)
 
     # Load case data
@@ -95,62 +156,126 @@ def main():
     if case_data is None:
         return
 
-    print(f"\n✅ Loaded case: {case_data['case_title']} ({case_data['date']})")
+    print(f"\n✅ Loaded case: {case_data.case_title} ({case_data.date})")
+    transcript = open_transcript(case_data.case_title, "main", path=case_data.path)
     time.sleep(1)
 
+    # Offer to continue an interrupted simulation of this case; completed steps are not regenerated
+    state = load_checkpoint("main", case_data.path)
+    if state and get_user_input(f"🔁 Resume your {state.role} simulation ({len(state.outputs)} steps done)? (Yes/No): ", ["Yes", "No"]) == "No":
+        state = None
+    state = state or SimulationState(case_data.path, "main")
+
     # Assign courtroom roles
     assigned_roles = assign_roles(case_data)
     appellant, respondents = assigned_roles["Appellant"], assigned_roles["Respondents"]
     judge = assigned_roles["Judge"]
 
     # User selects role
-    user_role = get_user_input("🔹 Choose your role (Appellant/Respondent): ", ["Appellant", "Respondent"], "Appellant")
+    if not state.role:
+        state.role = get_user_input("🔹 Choose your role (Appellant/Respondent): ", ["Appellant", "Respondent"], "Appellant")
+        save_checkpoint(state)
+    user_role = state.role
     user_agent = appellant if user_role == "Appellant" else respondents[0]
     opposition = respondents[0] if user_role == "Appellant" else appellant
 
     # Extract key case details
-    case_facts = {
-        "title": case_data["case_title"],
-        "arguments": case_data.get("key_arguments") or case_data.get("legal_arguments", {})
-    }
+    case_facts = case_data.case_facts()
+
+    # Neither opening depends on what the user types: start them while the strategy is read and the opening typed.
+    # The opposing opening is always needed, so it runs in the background even with LEX_PREFETCH=0
+    if not state.completed("opening"):
+        opposition_opening = speculate_phase_response('opening', opposition.role_type, case_facts, eager=True)
+        suggested_opening = speculate_phase_response('opening', user_role, case_facts)
 
     # AI-generated legal strategy
     print(f"\n⚖️ **AI Legal Strategy for {user_role}:**")
-    strategy = suggest_strategy(user_role, case_facts, case_data.get("legal_references", {}))
-    print("💡 **Suggested Argument:**\n", strategy)
+    if state.completed("strategy"):
+        print("💡 **Suggested Argument:**\n", state.output("strategy"))
+    else:
+        # The reasoning model's <think> block is dropped as it streams; the strategy shows once it ends
+        stripper = ThinkStripper()
+        strategy = print_streamed("💡 **Suggested Argument:**\n ", stream_strategy(user_role, case_facts, case_data.legal_references, stripper=stripper))
+        if stripper.reasoning_tokens:
+            print(f"   (🤔 {stripper.reasoning_tokens} reasoning tokens hidden)")
+        log_turn("strategy", user_role, strategy, reasoning_tokens=stripper.reasoning_tokens)
+        state.record("strategy", strategy)
     print("=" * 60)
     time.sleep(1)
 
     # **Opening Statements Phase**
     print_courtroom_scene("opening")
-    opening_statement = get_user_input("📢 Enter opening statement (or type 'suggest'): ", default="suggest")
-    print(f"\n-- {user_agent.name} states: \"{generate_phase_response('opening', user_role, case_facts) if opening_statement.lower() == 'suggest' else opening_statement}\"")
+    if state.completed("opening"):
+        show_restored(f"\n-- {user_agent.name} states: ", state.output("opening"))
+        show_restored(f"\n-- {opposition.name} (Opposing Counsel) responds: ", state.output("opposition_opening"))
+    else:
+        opening_statement = get_user_input("📢 Enter opening statement (or type 'suggest'): ", default="suggest")
 
-    print(
-        f"\n-- {opposition.name} (Opposing Counsel) responds: \"{generate_phase_response('opening', opposition.role_type, case_facts)}\"")
-    time.sleep(2)
+    # The cross answer and the closing suggestion don't depend on the opening either
+    if not state.completed("cross"):
+        cross_answer = speculate_phase_response('cross', opposition.role_type, case_facts)
+    if not state.completed("closing"):
+        suggested_closing = speculate_phase_response('closing', user_role, case_facts)
+
+    if not state.completed("opening"):
+        opening_text = print_streamed(f"\n-- {user_agent.name} states: ", user_turn(suggested_opening, opening_statement, 'opening', user_role))
+        opposition_text = print_streamed(f"\n-- {opposition.name} (Opposing Counsel) responds: ", opposition_opening.take())
+        state.outputs["opening"] = opening_text
+        state.record("opposition_opening", opposition_text)
+        time.sleep(2)
 
     # **Objections Handling**
-    objection = detect_objections(opening_statement, case_facts)
+    if state.completed("objection"):
+        objection = state.output("objection")
+    else:
+        objection = detect_objections(state.output("opening"), case_facts)
+        log_turn("objection", opposition.role_type, objection)
+        state.record("objection", objection)
     if "Yes" in objection:
         handle_objection(opposition.name, objection.split("\n")[1])
         time.sleep(2)
 
     # **Cross-Examination**
     print_courtroom_scene("cross")
-    question = get_user_input(f"⚔️ Ask a question to {opposition.name} (or type 'suggest'): ", default="suggest")
-    print(f"\n💬 {opposition.name} responds: \"{generate_phase_response('cross', opposition.role, case_facts) if question.lower() == 'suggest' else 'The contract clause was fairly applied.'}\"")
-    time.sleep(2)
+    if state.completed("cross"):
+        show_restored(f"\n💬 {opposition.name} responds: ", state.output("cross"))
+    else:
+        question = get_user_input(f"⚔️ Ask a question to {opposition.name} (or type 'suggest'): ", default="suggest")
+        if question.lower() == 'suggest':
+            answer = cross_answer.take()
+        else:
+            cross_answer.discard()
+            answer = ['The contract clause was fairly applied.']
+            log_turn("cross", user_role, question, source="user")
+            log_turn("cross", opposition.role_type, answer[0], source="scripted")
+        state.record("cross", print_streamed(f"\n💬 {opposition.name} responds: ", answer))
+        time.sleep(2)
 
     # **Closing Arguments**
     print_courtroom_scene("closing")
-    closing_statement = get_user_input("📢 Enter closing argument (or type 'suggest'): ", default="suggest")
+    if state.completed("closing"):
+        show_restored(f"\n-- {user_agent.name} closes: ", state.output("closing"))
+    else:
+        closing_statement = get_user_input("📢 Enter closing argument (or type 'suggest'): ", default="suggest")
+        state.record("closing", print_streamed(f"\n-- {user_agent.name} closes: ", user_turn(suggested_closing, closing_statement, 'closing', user_role)))
     print(f"\n-- AI Judge ({judge.name}) responds: \"I have carefully reviewed all arguments.\"")
     time.sleep(2)
 
     # **Final Verdict**
     print_courtroom_scene("verdict")
-    print(f"👨‍⚖️ Judge: \"After reviewing all evidence and arguments, my verdict is: {case_data['judgment_summary']['court_decision']}\"")
+    print(f"👨‍⚖️ Judge: \"After reviewing all evidence and arguments, my verdict is: {case_data.court_decision}\"")
+    log_turn("verdict", "Judge", case_data.court_decision, source="case file")
+    clear_checkpoint(state)  # The trial is over; nothing left to resume
+
+    if phase_timings:
+        print("\n⏱ Response timings:")
+        for timing in phase_timings:
+            print(f"   - {timing['phase']} ({timing['role']}): first token {timing['first_token'] or 0:.2f}s, total {timing['total']:.2f}s")
+
+    if transcript:
+        transcript.close()
+        print(f"\n📜 Transcript saved to {transcript.path}")
+
     print("\n🙏 Thank you for participating in the AI Courtroom Simulation.")
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+import re
+import threading
+from collections import deque
+from prompt_builder import estimate_tokens, truncate_to_budget, compact_prompt
+from config import Settings
+
+# Token budget of an agent's memory in prompts: summary of older turns + recent turns verbatim (override in .env)
+settings = Settings(
+    budget=("LEX_MEMORY_BUDGET", "600", int),
+    summary_budget=("LEX_MEMORY_SUMMARY_BUDGET", "200", int)
+)
+
+FIRST_SENTENCE_RE = re.compile(r"^(.+?[.!?])(?:\s|$)", re.S)
+
+
+def first_sentence(text):
+    match = FIRST_SENTENCE_RE.match(text.strip())
+    return (match.group(1) if match else text.strip()).replace("\n", " ")
+
+
+def extractive_summary(summary, turns, budget):
+    """
+    Local summarizer (no API call): folds each turn in as "speaker: first sentence" and, once over
+    budget, forgets the oldest summary lines first.
+    """
+    lines = [line for line in summary.splitlines() if line]
+    lines += [f"{speaker}: {first_sentence(text)}" for speaker, text in turns]
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > budget:
+        lines.pop(0)
+    return truncate_to_budget("\n".join(lines), budget)
+
+
+def model_summary(model):
+    """A summarizer that asks `model` (anything with generate_text) to update the summary."""
+
+    def summarize(summary, turns, budget):
+        new_turns = "\n".join(f"{speaker}: {text}" for speaker, text in turns)
+        prompt = compact_prompt(f"""
+        Update this summary of a courtroom proceeding with the new turns below.
+        Keep who said what, claims, admissions and rulings. Answer in under {budget * 3 // 4} words.
+
+        Summary So Far: {summary or "(none)"}
+        New Turns:
+        {new_turns}
+        """)
+        return truncate_to_budget(model.generate_text(prompt).strip(), budget)
+
+    return summarize
+
+
+class AgentMemory:
+    """
+    What an agent has said and heard, within a fixed token budget. Recent turns are kept verbatim;
+    once they outgrow their share of the budget the oldest are folded into a rolling summary, a
+    batch at a time (down to half the verbatim share), so the summarizer runs every few turns
+    rather than on every one. Rendered memory never exceeds `budget` tokens however long the trial.
+    """
+
+    def __init__(self, budget=None, summary_budget=None, summarize=extractive_summary):
+        self.budget = budget = settings.budget if budget is None else budget
+        self.summary_budget = min(settings.summary_budget if summary_budget is None else summary_budget, budget // 2)
+        self.summarize = summarize
+        self.summary = ""
+        self.recent = deque()  # (speaker, text, tokens), oldest first
+        self.recent_tokens = 0
+        self.turns = 0
+        self.lock = threading.Lock()
+
+    @property
+    def recent_budget(self):
+        return self.budget - self.summary_budget
+
+    def add(self, speaker, text):
+        """Remembers one turn, folding older turns into the summary if the verbatim part is over budget."""
+        line = truncate_to_budget(f"{speaker}: {text.strip()}", self.recent_budget // 2)
+        tokens = estimate_tokens(line) + 1
+        with self.lock:
+            self.recent.append((speaker, line, tokens))
+            self.recent_tokens += tokens
+            self.turns += 1
+            if self.recent_tokens <= self.recent_budget:
+                return
+            folded = []
+            while self.recent_tokens > self.recent_budget // 2 and len(self.recent) > 1:
+                speaker, line, tokens = self.recent.popleft()
+                self.recent_tokens -= tokens
+                folded.append((speaker, line[len(speaker) + 2:]))
+            self.summary = self.summarize(self.summary, folded, self.summary_budget)
+
+    def extend(self, turns):
+        for speaker, text in turns:
+            self.add(speaker, text)
+
+    def render(self):
+        """The memory as a prompt section ("" when empty)."""
+        with self.lock:
+            recent = "\n".join(line for _, line, _ in self.recent)
+            summary = self.summary
+        parts = []
+        if summary:
+            parts.append(f"Earlier Proceedings (summary):\n{summary}")
+        if recent:
+            parts.append(f"Recent Proceedings:\n{recent}")
+        return "\n".join(parts)
+
+    def __len__(self):
+        return self.turns
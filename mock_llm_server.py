@@ -0,0 +1,166 @@
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATH = "/openai/v1/chat/completions"
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the Groq chat completions endpoint, for offline runs and benchmarks.
+
+    latency: seconds before the first byte of a response
+    tokens_per_second: generation speed (0 = instant)
+    tokens: number of tokens in each completion
+    error_rate: fraction of requests answered with an injected error
+    error_status: status code of injected errors (429 responses carry a Retry-After header)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, tokens_per_second=0.0, tokens=50,
+                 error_rate=0.0, error_status=500, retry_after=1, seed=None):
+        super().__init__((host, port), MockLLMHandler)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.tokens = tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0  # TCP connections accepted; a pooled client reuses one for sequential calls
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{CHAT_PATH}"
+
+    def start(self):
+        """Serves on a daemon thread and returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        pass  # Clients dropping pooled keep-alive connections is expected
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            fail = self.error_rate and self.random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return fail
+
+    def completion_tokens(self, payload):
+        """Deterministic completion text derived from the prompt, split into tokens (ten per line)."""
+        prompt = " ".join(m.get("content", "") for m in payload.get("messages", []))
+        words = prompt.split() or ["Mock"]
+        return [words[i % len(words)] + ("\n" if i % 10 == 9 else " ") for i in range(self.tokens)]
+
+
+def usage(payload, tokens):
+    prompt_tokens = len(str(payload.get("messages", "")).split())
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens), "total_tokens": prompt_tokens + len(tokens)}
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't let Nagle delay the body
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != CHAT_PATH:
+            return self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            return self.send_json(400, {"error": {"message": "Invalid JSON body"}})
+
+        time.sleep(server.latency)
+        if server.should_fail():
+            headers = {"Retry-After": str(server.retry_after)} if server.error_status == 429 else {}
+            return self.send_json(server.error_status, {"error": {"message": "Injected error"}}, headers)
+
+        tokens = server.completion_tokens(payload)
+        delay = 1.0 / server.tokens_per_second if server.tokens_per_second else 0.0
+        if payload.get("stream"):
+            return self.send_stream(payload, tokens, delay)
+
+        time.sleep(delay * len(tokens))
+        self.send_json(200, {
+            "id": "mock-completion",
+            "object": "chat.completion",
+            "model": payload.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens).strip()}, "finish_reason": "stop"}],
+            "usage": usage(payload, tokens)
+        })
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, payload, tokens, delay):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                time.sleep(delay)
+                event = {"object": "chat.completion.chunk", "model": payload.get("model"),
+                         "choices": [{"index": 0, "delta": {"content": token}}]}
+                self.write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n")  # Raw UTF-8, like the real API
+            if (payload.get("stream_options") or {}).get("include_usage"):
+                event = {"object": "chat.completion.chunk", "model": payload.get("model"), "choices": [],
+                         "usage": usage(payload, tokens)}
+                self.write_chunk(f"data: {json.dumps(event)}\n\n")
+            self.write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client cancelled the stream
+
+    def write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock of the Groq chat completions API.")
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first byte")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+
+    server = MockLLMServer(port=args.port, latency=args.latency, tokens_per_second=args.tokens_per_second,
+                           tokens=args.tokens, error_rate=args.error_rate, error_status=args.error_status)
+    print(f"🧪 Mock LLM server listening on {server.url} (set GROQ_API_URL to use it)")
+    server.serve_forever()
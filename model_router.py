@@ -0,0 +1,314 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+import llm_client
+from llm_client import get_client, extract_content, settings as client_settings
+from scheduler import current_priority, request_priority
+from config import Settings, setting
+
+
+def task_set(value):
+    return {task.strip() for task in value.split(",") if task.strip()}
+
+
+settings = Settings(
+    # Fallback models (override in .env)
+    fallback_model=("GROQ_FALLBACK_MODEL", "llama-3.3-70b-versatile", str),
+    fast_model=("GROQ_FAST_MODEL", "llama-3.1-8b-instant", str),
+    # Health tracking: only calls from the last window_seconds count, so a degraded model is retried later
+    window_size=("LEX_ROUTER_WINDOW", "50", int),
+    window_seconds=("LEX_ROUTER_WINDOW_SECONDS", "300", float),
+    max_error_rate=("LEX_ROUTER_MAX_ERROR_RATE", "0.5", float),
+    min_samples=("LEX_ROUTER_MIN_SAMPLES", "3", int),
+    # Hedging: if the first model hasn't answered (or, for streams, sent its first chunk) within its rolling
+    # p95 (or LEX_HEDGE_AFTER seconds), the same prompt is also sent to the next model and the first answer wins
+    hedge_tasks=("LEX_HEDGE_TASKS", "strategy,verdict", task_set),
+    hedge_after=("LEX_HEDGE_AFTER", "0", float),  # 0 = use the model's rolling p95
+    hedge_min_samples=("LEX_HEDGE_MIN_SAMPLES", "5", int),
+    hedge_workers=("LEX_HEDGE_WORKERS", "8", int)
+)
+
+
+def route_from_env(task, default):
+    """A task's ranked models, overridable as a comma-separated list in LEX_ROUTE_<TASK>."""
+    value = setting(f"LEX_ROUTE_{task.upper()}")
+    return [model.strip() for model in value.split(",") if model.strip()] if value else default
+
+
+def default_route():
+    """The models of tasks without a route of their own."""
+    return [client_settings.default_model, settings.fast_model]
+
+
+def default_routes():
+    """Task type -> models in order of preference."""
+    default, reasoning = client_settings.default_model, client_settings.reasoning_model
+    return {
+        "phase": route_from_env("phase", [default, settings.fast_model]),
+        "agent": route_from_env("agent", [default, settings.fast_model]),
+        "objection": route_from_env("objection", [default, settings.fast_model]),
+        "speech": route_from_env("speech", [reasoning, settings.fallback_model]),
+        "strategy": route_from_env("strategy", [reasoning, settings.fallback_model]),
+        "verdict": route_from_env("verdict", [reasoning, settings.fallback_model]),
+        "cross_examination": route_from_env("cross_examination", [reasoning, settings.fallback_model])
+    }
+
+
+class ModelStats:
+    """
+    Rolling latency and error record of one model over its recent calls. A stream's latency is its
+    time to first chunk, kept apart from the full response time of ordinary calls.
+    """
+
+    def __init__(self, size=None, max_age=None):
+        self.calls = deque(maxlen=settings.window_size if size is None else size)  # (finished at, latency or None, ok, streamed)
+        self.max_age = settings.window_seconds if max_age is None else max_age
+        self.lock = threading.Lock()
+
+    def record(self, latency, ok, streamed=False):
+        with self.lock:
+            self.calls.append((time.monotonic(), latency, ok, streamed))
+
+    def recent(self):
+        cutoff = time.monotonic() - self.max_age
+        with self.lock:
+            while self.calls and self.calls[0][0] < cutoff:
+                self.calls.popleft()
+            return list(self.calls)
+
+    def error_rate(self):
+        calls = self.recent()
+        return sum(1 for _, _, ok, _ in calls if not ok) / len(calls) if calls else 0.0
+
+    def degraded(self):
+        calls = self.recent()
+        return len(calls) >= settings.min_samples and self.error_rate() >= settings.max_error_rate
+
+    def latencies(self, streamed=False):
+        return sorted(latency for _, latency, ok, kind in self.recent() if ok and latency is not None and kind == streamed)
+
+    def p95(self, streamed=False):
+        latencies = self.latencies(streamed)
+        return latencies[max(0, int(len(latencies) * 0.95 + 0.5) - 1)] if latencies else None
+
+
+class AnyEvent:
+    """Set as soon as any of its events is; lets a hedged stream stop for its caller or for the router."""
+
+    def __init__(self, *events):
+        self.events = [event for event in events if event is not None]
+
+    def is_set(self):
+        return any(event.is_set() for event in self.events)
+
+
+def close_stream(future):
+    """Done-callback for a losing hedged stream: closes its connection once its first chunk is in."""
+    if not future.cancelled() and future.exception() is None:
+        future.result()[1].close()
+
+
+class ModelRouter:
+    """
+    Sends each task's prompt to the best model on its route. Models whose recent error rate is too
+    high drop to the back of the ranking; a failed call fails over to the next model; for hedged
+    tasks a slow first model gets a duplicate request on the next model.
+    """
+
+    def __init__(self, routes=None, hedge_tasks=None, hedge_after=None):
+        self.routes = routes if routes is not None else default_routes()
+        self.hedge_tasks = hedge_tasks if hedge_tasks is not None else settings.hedge_tasks
+        self.hedge_after = settings.hedge_after if hedge_after is None else hedge_after
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=settings.hedge_workers, thread_name_prefix="lex-hedge")
+        self.hedged = 0
+
+    def model_stats(self, model):
+        with self.stats_lock:
+            return self.stats.setdefault(model, ModelStats())
+
+    def ranked(self, task):
+        """The task's models, healthy ones first, each group in configured order."""
+        models = self.routes.get(task) or default_route()
+        return [m for m in models if not self.model_stats(m).degraded()] + [m for m in models if self.model_stats(m).degraded()]
+
+    def hedge_delay(self, model, streamed=False):
+        """Seconds to wait for `model` (for streams, its first chunk) before hedging, or None if there isn't enough history yet."""
+        if self.hedge_after:
+            return self.hedge_after
+        stats = self.model_stats(model)
+        return stats.p95(streamed) if len(stats.latencies(streamed)) >= settings.hedge_min_samples else None
+
+    def call(self, model, prompt, temperature, use_cache, priority=None):
+        """One timed chat request to `model`; the outcome goes into the model's rolling stats."""
+        client = get_client()
+        if use_cache:
+            cached = client.cached(prompt, model, temperature)
+            if cached is not None:
+                return cached  # Not a real call: keep it out of the latency stats
+        start = time.perf_counter()
+        try:
+            with request_priority(current_priority() if priority is None else priority):
+                data = client.chat(prompt, model=model, temperature=temperature, use_cache=False)  # Already looked up
+        except llm_client.RequestException:
+            self.model_stats(model).record(None, False)
+            raise
+        self.model_stats(model).record(time.perf_counter() - start, True)
+        if use_cache:
+            client.remember(prompt, model, temperature, data)
+        return data
+
+    def chat(self, task, prompt, temperature=None, use_cache=True):
+        """
+        Returns the raw JSON response for `prompt` from the first model on the task's route that
+        succeeds. Raises the last llm_client.RequestException if every model fails.
+        """
+        models = self.ranked(task)
+        error = RuntimeError(f"No models on the route of {task!r}")
+        if task in self.hedge_tasks and len(models) > 1:
+            delay = self.hedge_delay(models[0])
+            if delay is not None:
+                try:
+                    return self.hedged_chat(models[0], models[1], delay, prompt, temperature, use_cache)
+                except llm_client.RequestException as e:
+                    error, models = e, models[2:]
+
+        for model in models:
+            try:
+                return self.call(model, prompt, temperature, use_cache)
+            except llm_client.RequestException as e:
+                error = e
+        raise error
+
+    def hedged_chat(self, primary, backup, delay, prompt, temperature, use_cache):
+        """Starts `primary`; if it hasn't answered after `delay` seconds also starts `backup`. First success wins."""
+        priority = current_priority()
+        futures = [self.executor.submit(self.call, primary, prompt, temperature, use_cache, priority)]
+        done, _ = wait(futures, timeout=delay)
+        if not done or futures[0].exception() is not None:
+            futures.append(self.executor.submit(self.call, backup, prompt, temperature, use_cache, priority))
+            self.hedged += 1
+        error = None
+        for future in as_completed(futures):
+            try:
+                return future.result()  # The slower request finishes in the background (and is cached)
+            except llm_client.RequestException as e:
+                error = e
+        raise error
+
+    def complete(self, task, prompt, temperature=None, use_cache=True):
+        """Like chat(), but returns only the generated text."""
+        return extract_content(self.chat(task, prompt, temperature, use_cache))
+
+    def open_stream(self, model, prompt, temperature, use_cache, cancel, priority=None):
+        """
+        Starts a stream on `model` and waits for its first chunk; returns (first chunk or None, chunks,
+        seconds to the first chunk).
+        """
+        chunks = get_client().stream(prompt, model=model, temperature=temperature, use_cache=use_cache, cancel=cancel)
+        start = time.perf_counter()
+        try:
+            with request_priority(current_priority() if priority is None else priority):
+                first = next(chunks, None)
+        except llm_client.RequestException:
+            self.model_stats(model).record(None, False, streamed=True)
+            raise
+        return first, chunks, time.perf_counter() - start
+
+    def hedged_stream(self, primary, backup, delay, prompt, temperature, use_cache, cancel):
+        """
+        Opens `primary`'s stream; if its first chunk hasn't arrived after `delay` seconds also opens
+        `backup`'s. Returns (model, first chunk, chunks, seconds to the first chunk) of the first to start
+        streaming and stops the other.
+        """
+        priority = current_priority()
+        stops = {primary: threading.Event(), backup: threading.Event()}
+
+        def start(model):
+            return self.executor.submit(self.open_stream, model, prompt, temperature, use_cache,
+                                        AnyEvent(cancel, stops[model]), priority)
+
+        futures = {start(primary): primary}
+        done, _ = wait(futures, timeout=delay, return_when=FIRST_COMPLETED)
+        if not done or next(iter(done)).exception() is not None:
+            futures[start(backup)] = backup
+            self.hedged += 1
+        error = None
+        for future in as_completed(futures):
+            try:
+                opened = future.result()
+            except llm_client.RequestException as e:
+                error = e
+                continue
+            for other, model in futures.items():
+                if other is not future:
+                    stops[model].set()
+                    other.add_done_callback(close_stream)
+            return (futures[future], *opened)
+        raise error
+
+    def stream(self, task, prompt, temperature=None, use_cache=True, cancel=None):
+        """
+        Streams from the first model on the task's route that accepts the request. Failover only
+        happens before the first chunk; once text has been shown, an error ends the stream. For
+        hedged tasks, a first model that hasn't sent its first chunk within the hedge delay gets a
+        duplicate stream on the next model, and whichever starts first is used. The stream's time to
+        first chunk goes into the model's stats once it ends; an error mid-stream counts as a failure.
+        """
+        models = self.ranked(task)
+        opened = None
+        error = RuntimeError(f"No models on the route of {task!r}")
+        if task in self.hedge_tasks and len(models) > 1:
+            delay = self.hedge_delay(models[0], streamed=True)
+            if delay is not None:
+                try:
+                    opened = self.hedged_stream(models[0], models[1], delay, prompt, temperature, use_cache, cancel)
+                except llm_client.RequestException as e:
+                    error, models = e, models[2:]
+
+        for model in models if opened is None else []:
+            try:
+                opened = (model, *self.open_stream(model, prompt, temperature, use_cache, cancel))
+                break
+            except llm_client.RequestException as e:
+                error = e
+        if opened is None:
+            raise error
+
+        model, first, chunks, latency = opened
+        try:
+            if first is not None:
+                yield first
+            yield from chunks
+        except Exception:
+            self.model_stats(model).record(None, False, streamed=True)
+            raise
+        self.model_stats(model).record(latency, True, streamed=True)
+
+    def report(self):
+        """{model: {"calls", "error_rate", "p95", "first_chunk_p95"}} for the models that have been used."""
+        with self.stats_lock:
+            items = list(self.stats.items())
+        return {model: {"calls": len(stats.recent()), "error_rate": stats.error_rate(), "p95": stats.p95(),
+                        "first_chunk_p95": stats.p95(streamed=True)} for model, stats in items}
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router():
+    """Returns the process-wide ModelRouter, creating it on first use."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter()
+    return _router
+
+
+def generate_for(task, prompt, temperature=None, use_cache=True):
+    """Convenience wrapper: generate text for a task type with the shared router."""
+    return get_router().complete(task, prompt, temperature=temperature, use_cache=use_cache)
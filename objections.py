@@ -1,75 +1,223 @@
-import os
-import json
-import requests
-from dotenv import load_dotenv
+import re
+import math
+import threading
+from concurrent.futures import Future
+import llm_client
+from llm_client import extract_content
+from model_router import get_router
+from prompt_builder import build_context, compact_prompt
+from case_record import load_case_record
+from scheduler import current_priority, request_priority
+from config import Settings
+
+settings = Settings(
+    # Statements the local screen scores below this objection probability never reach the API
+    threshold=("LEX_OBJECTION_THRESHOLD", "0.35", float),
+    # Most statements analysed in one objection request
+    batch_size=("LEX_OBJECTION_BATCH_SIZE", "8", int)
+)
+
+# Local screen: phrasing that commonly draws an objection, by objection type
+OBJECTION_RULES = {
+    "Hearsay": re.compile(r"\b(?:told me|said that|heard (?:that|from)|according to (?:him|her|them)|i was told|rumou?rs?)\b", re.IGNORECASE),
+    "Leading": re.compile(r"(?:^|[.?!]\s+)(?:isn't it true|wouldn't you agree|didn't you|you (?:did|knew|were)\b[^?]*\?)|,\s*(?:isn't it|didn't you|wasn't it|right)\?", re.IGNORECASE),
+    "Speculation": re.compile(r"\b(?:probably|maybe|might have|must have|presumably|i (?:think|guess|assume|suppose))\b", re.IGNORECASE),
+    "Argumentative": re.compile(r"\b(?:liar|lied|lying|ridiculous|absurd|disgrace(?:ful)?|shameful)\b", re.IGNORECASE),
+    "Character": re.compile(r"\b(?:criminal record|bad reputation|dishonest|crook|fraudster|cheat)\b", re.IGNORECASE)
+}
+
+# Lightweight logistic model over cue words: positive weights push towards an objection,
+# negative weights mark the factual, record-based language of ordinary submissions
+CUE_WEIGHTS = {
+    "clearly": 0.8, "obviously": 0.9, "everyone": 0.7, "always": 0.5, "never": 0.5, "believe": 0.6,
+    "feel": 0.6, "heard": 0.8, "rumour": 1.0, "rumor": 1.0, "guilty": 0.6, "intended": 0.4, "motive": 0.5,
+    "section": -0.6, "clause": -0.6, "contract": -0.4, "agreement": -0.4, "exhibit": -0.7, "record": -0.4,
+    "evidence": -0.3, "act": -0.4, "pursuant": -0.6, "dated": -0.5, "award": -0.3, "tribunal": -0.3,
+    "submit": -0.5, "respectfully": -0.6, "honour": -0.3, "honor": -0.3
+}
+CUE_BIAS = -1.5
+
+NO_OBJECTION = compact_prompt("""
+1. Objection: No
+2. Objection type: None
+3. Explanation: The statement contains no hearsay, leading, speculative or argumentative language.
+4. Ruling: Not applicable.
+""")
 
-# Load API Key
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# Define Groq API Endpoint
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"  # ✅ Correct
 
+def load_case_details(json_path):
+    """Loads case details from JSON file (as a CaseRecord)."""
+    return load_case_record(json_path)
 
 
-def load_case_details(json_path):
-    """Loads case details from JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as file:
-        return json.load(file)
+def objection_score(statement):
+    """Probability (0-1) from the local cue-word model that a statement draws an objection."""
+    words = re.findall(r"[a-z]+", statement.lower())
+    if not words:
+        return 0.0
+    z = CUE_BIAS + sum(CUE_WEIGHTS.get(word, 0.0) for word in words) / math.sqrt(len(words)) * 2
+    return 1 / (1 + math.exp(-z))
 
 
-def detect_objections(statement, case_facts):
+def screen_statement(statement):
     """
-    Uses Groq LLM to detect if a courtroom statement is objectionable, considering the case context.
+    Local pre-filter: returns (needs_model, rule hits). Statements with no rule hits and a low model
+    score are cleared without an API call.
     """
+    hits = [kind for kind, pattern in OBJECTION_RULES.items() if pattern.search(statement)]
+    return bool(hits) or objection_score(statement) >= settings.threshold, hits
+
+
+def objection_prompt(statement, context):
+    return compact_prompt(f"""
+    You are a legal expert skilled in courtroom objections.
+    Analyze the following courtroom statement in the context of this case:
+
+    **Statement:** "{statement}"
+    **Case Facts:**
+    {context}
+
+    Instructions:
+    1. Should an objection be raised? (Yes/No)
+    2. If yes, what is the best objection type? (Hearsay, Leading, Relevance, Speculation, etc.)?
+    3. Provide a legal explanation based on case law.
+    4. If the judge were to rule on the objection, should it be "Sustained" or "Overruled"? Provide a reason.
+    """)
+
+
+def batch_prompt(statements, context):
+    numbered = "\n".join(f'{i}. "{statement}"' for i, statement in enumerate(statements, 1))
+    return compact_prompt(f"""
+    You are a legal expert skilled in courtroom objections.
+    Analyze each of the following courtroom statements in the context of this case:
+
+    **Statements:**
+    {numbered}
+    **Case Facts:**
+    {context}
+
+    For each statement, start a section with the line "### Statement <number>" and answer on separate lines:
+    1. Should an objection be raised? (Yes/No)
+    2. If yes, what is the best objection type? (Hearsay, Leading, Relevance, Speculation, etc.)?
+    3. Provide a legal explanation based on case law.
+    4. If the judge were to rule on the objection, should it be "Sustained" or "Overruled"? Provide a reason.
+    """)
+
+
+def split_batch_response(text, count):
+    """Splits a batched answer into per-statement analyses; missing sections come back as None."""
+    sections = [None] * count
+    parts = re.split(r"^\s*#+\s*Statement\s+(\d+)\s*:?\s*$", text, flags=re.MULTILINE | re.IGNORECASE)
+    for number, body in zip(parts[1::2], parts[2::2]):
+        index = int(number) - 1
+        if 0 <= index < count and body.strip():
+            sections[index] = body.strip()
+    return sections
+
+
+def describe_error(error):
+    """The '⚠ ...' message returned in place of an analysis when the API call fails."""
+    if isinstance(error, llm_client.HTTPError):
+        response = error.response
+        print(f"⚠ Error: API returned status code {response.status_code}")
+        return f"⚠ Error {response.status_code}: {response.text}"
+    if isinstance(error, llm_client.RequestException):
+        return f"⚠ Network error: {str(error)}"
+    return f"⚠ Unexpected error: {str(error)}"
+
+
+def analyze_statements(statements, context):
+    """Runs one API request for a group of statements sharing the same case context."""
     try:
-        prompt = f"""
-        You are a legal expert skilled in courtroom objections.
-        Analyze the following courtroom statement in the context of this case:
-
-        **Statement:** "{statement}"
-        **Case Facts:** {case_facts}
-
-        Instructions:
-        1. Should an objection be raised? (Yes/No)
-        2. If yes, what is the best objection type? (Hearsay, Leading, Relevance, Speculation, etc.)?
-        3. Provide a legal explanation based on case law.
-        4. If the judge were to rule on the objection, should it be "Sustained" or "Overruled"? Provide a reason.
-        """
-
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-
-        payload = {
-            "model": "mixtral-8x7b-32768",  # More advanced model for legal reasoning
-            "messages": [{"role": "system", "content": prompt}],
-            "temperature": 0.3
-        }
-
-        response = requests.post(GROQ_API_URL, headers=headers, json=payload)
-
-        # ✅ Debugging: Print API Response Status
-        if response.status_code != 200:
-            print(f"⚠ Error: API returned status code {response.status_code}")
-            print("🔍 API Response:", response.text)
-            return f"⚠ Error {response.status_code}: {response.text}"
-
-        response_data = response.json()
-
-        # ✅ Debugging: Print API Response
-        print("\n🔍 Raw API Response:", json.dumps(response_data, indent=4))
-
-        if "choices" in response_data and len(response_data["choices"]) > 0:
-            return response_data["choices"][0]["message"]["content"].strip()
-        else:
-            return "⚠ AI did not generate a valid objection analysis."
-
-    except requests.exceptions.RequestException as req_err:
-        return f"⚠ Network error: {str(req_err)}"
+        if len(statements) == 1:
+            content = extract_content(get_router().chat("objection", objection_prompt(statements[0], context), temperature=0.3))
+            return [content or "⚠ AI did not generate a valid objection analysis."]
+
+        content = extract_content(get_router().chat("objection", batch_prompt(statements, context), temperature=0.3))
+        sections = split_batch_response(content, len(statements))
     except Exception as e:
-        return f"⚠ Unexpected error: {str(e)}"
+        return [describe_error(e)] * len(statements)
+    # A statement the model skipped in the batch is retried on its own
+    return [section if section is not None else analyze_statements([statement], context)[0]
+            for statement, section in zip(statements, sections)]
+
+
+class ObjectionBatcher:
+    """
+    Sends a statement straight away when no objection request is in flight for its case; statements
+    that arrive while one is in flight queue up and go together, up to `max_size` per request. A
+    lone statement waits for nothing, and a busy session needs far fewer round trips. A request runs
+    at the highest request priority among its statements' submitters.
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = settings.batch_size if max_size is None else max_size
+        self.pending = {}  # case context -> [(statement, Future, request priority)]
+        self.in_flight = set()  # case contexts with a request running
+        self.lock = threading.Lock()
+
+    def submit(self, statement, context):
+        future = Future()
+        with self.lock:
+            self.pending.setdefault(context, []).append((statement, future, current_priority()))
+            start = context not in self.in_flight
+            self.in_flight.add(context)
+        if start:
+            threading.Thread(target=self.drain, args=(context,), daemon=True).start()
+        return future
+
+    def drain(self, context):
+        while True:
+            with self.lock:
+                queued = self.pending.get(context, [])
+                group, rest = queued[:self.max_size], queued[self.max_size:]
+                if rest:
+                    self.pending[context] = rest
+                else:
+                    self.pending.pop(context, None)
+                if not group:
+                    self.in_flight.discard(context)
+                    return
+            with request_priority(min(priority for _, _, priority in group)):
+                results = analyze_statements([statement for statement, _, _ in group], context)
+            for (_, future, _), result in zip(group, results):
+                future.set_result(result)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = ObjectionBatcher()
+    return _batcher
+
+
+def detect_objections(statement, case_facts):
+    """
+    Detects if a courtroom statement is objectionable, considering the case context. Statements the
+    local screen clears are answered immediately; the rest are batched into shared Groq LLM requests.
+    """
+    needs_model, _ = screen_statement(statement)
+    if not needs_model:
+        return NO_OBJECTION
+    return get_batcher().submit(statement, build_context(case_facts, "objection")).result()
+
+
+def detect_objections_batch(statements, case_facts):
+    """Analyses several statements about the same case, with at most one request per LEX_OBJECTION_BATCH_SIZE statements."""
+    context = build_context(case_facts, "objection")
+    results = [NO_OBJECTION] * len(statements)
+    flagged = [i for i, statement in enumerate(statements) if screen_statement(statement)[0]]
+    for start in range(0, len(flagged), settings.batch_size):
+        chunk = flagged[start:start + settings.batch_size]
+        for i, result in zip(chunk, analyze_statements([statements[i] for i in chunk], context)):
+            results[i] = result
+    return results
 
 
 def handle_objection(opposing_agent, objection_response):
@@ -93,11 +241,7 @@ if __name__ == "__main__":
     case_data = load_case_details(case_file_path)
 
     # Extract key facts for better AI reasoning
-    case_facts = {
-        "title": case_data["case_title"],
-        "arguments": case_data.get("key_arguments") or case_data.get("legal_arguments",{}),
-        "precedents": case_data["legal_references"]["precedents"]
-    }
+    case_facts = case_data.case_facts("precedents")
 
     statement = input("Enter a courtroom statement: ")
     objection_response = detect_objections(statement, case_facts)
@@ -0,0 +1,105 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from scheduler import with_priority
+from config import Settings, is_on
+
+# Concurrency settings (override in .env)
+settings = Settings(
+    max_workers=("LEX_MAX_WORKERS", "8", int),
+    concurrent=("LEX_CONCURRENT", "1", is_on)
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Returns the shared thread pool used for LLM fan-out, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.max_workers, thread_name_prefix="lex-llm")
+    return _executor
+
+
+def gather(*calls):
+    """
+    Runs independent zero-argument callables at the same time (at the caller's request priority) and
+    returns their results in call order. Falls back to running them one after the other when LEX_CONCURRENT=0.
+    """
+    if not settings.concurrent or len(calls) < 2:
+        return [call() for call in calls]
+    futures = [get_executor().submit(with_priority(call)) for call in calls]
+    return [future.result() for future in futures]
+
+
+_DONE = object()
+
+
+def background_stream(make_chunks):
+    """
+    Starts consuming a chunk iterator on the shared pool (at the caller's request priority) right away
+    and returns an iterator over its chunks, so a stream can be generated while another one is being displayed.
+    """
+    if not settings.concurrent:
+        return iter(make_chunks())
+
+    chunks = queue.Queue()
+
+    def pump():
+        try:
+            for chunk in make_chunks():
+                chunks.put(chunk)
+        except BaseException as e:
+            chunks.put(e)
+        finally:
+            chunks.put(_DONE)
+
+    get_executor().submit(with_priority(pump))
+
+    def drain():
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    return drain()
+
+
+class Speculation:
+    """
+    A stream started before it is known to be needed, e.g. while waiting for user input.
+    `make_chunks(cancel)` is started in the background right away (or on take() if not `eager`); take()
+    returns its chunks (passed through `wrap` if given) and discard() sets `cancel`, and the unused stream
+    is closed at its next chunk even if `make_chunks` doesn't check `cancel` itself.
+    """
+
+    def __init__(self, make_chunks, eager=True, wrap=None):
+        self.cancel = threading.Event()
+        self.make_chunks = make_chunks
+        self.wrap = wrap
+        self.chunks = background_stream(self.generate) if eager else None
+
+    def generate(self):
+        chunks = iter(self.make_chunks(self.cancel))
+        try:
+            for chunk in chunks:
+                if self.cancel.is_set():
+                    return
+                yield chunk
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    def take(self):
+        if self.chunks is None:
+            self.chunks = self.generate()
+        return self.wrap(self.chunks) if self.wrap else self.chunks
+
+    def discard(self):
+        self.cancel.set()
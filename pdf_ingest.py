@@ -0,0 +1,243 @@
+import os
+import re
+import json
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pypdf import PdfReader
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+MANIFEST_NAME = ".ingest_manifest"  # No .json suffix, so case loaders never mistake it for a case
+
+HEADER_PAGES = 2  # Title, court, bench and parties are on the first pages
+TAIL_PAGES = 3  # The decision and final order are on the last pages
+MAX_ARGUMENT_CHARS = 600
+MAX_REASONING_CHARS = 600
+
+TITLE_RE = re.compile(r"^(?P<title>.+?\s+(?:vs?\.?|versus)\s+.+?)\s+on\s+(?P<date>\d{1,2}\s+\w+,?\s+\d{4})\s*$", re.IGNORECASE)
+COURT_RE = re.compile(r"^(?:.*\b)?(Supreme Court of India|[A-Z][\w ]*High Court|[A-Z][\w ]*Tribunal)\b", re.MULTILINE)
+BENCH_RE = re.compile(r"^(?:Bench|Author|Coram)\s*:\s*(?P<judge>.+)$", re.IGNORECASE | re.MULTILINE)
+CITATIONS_RE = re.compile(r"^Equivalent citations\s*:\s*(?P<citations>.+)$", re.IGNORECASE | re.MULTILINE)
+ACT_RE = re.compile(r"\b((?:[A-Z][A-Za-z&()]*\s(?:(?:and|of|the)\s)?){1,6}(?:Act|Code|Rules)(?:,\s*\d{4})?(?:,?\s*Sections?\s+[\d\s&,A-Za-z]+?(?=[.;)]|\s(?:of|and|the)\b))?)")
+PRECEDENT_RE = re.compile(r"\b([A-Z][\w.&'()-]*(?:\s[A-Z&][\w.&'()-]*){0,7}\s+v(?:s)?\.\s+[A-Z][\w.&'()-]*(?:\s(?:of|and|&|[A-Z][\w.&'()-]*)){0,7})")
+AWARD_RE = re.compile(r"(Rs\.?\s*[\d,]+(?:\.\d+)?[^.]*\.)")
+SENTENCE_RE = re.compile(r"(?<=\.)(?<!\sv\.)(?<!\svs\.)\s+(?=[A-Z])")
+NON_PARTIES = {"ors", "ors.", "anr", "anr.", "others", "another"}
+CITE_PREFIXES = ("See ", "Also ", "In ", "Cf. ")
+DECISION_RE = re.compile(r"([^.]*\b(?:appeal|petition|application|suit|award)\b[^.]*\b(?:dismissed|allowed|set aside|partly allowed|disposed of|upheld|quashed)\b[^.]*\.)", re.IGNORECASE)
+ARGUMENT_RE = {
+    "appellant": re.compile(r"([^.]*\b(?:counsel|advocate)\s+(?:appearing\s+)?for\s+the\s+(?:appellant|petitioner|plaintiff)s?\b[^.]*\.(?:[^.]*\.){0,2})", re.IGNORECASE),
+    "respondent": re.compile(r"([^.]*\b(?:counsel|advocate)\s+(?:appearing\s+)?for\s+the\s+(?:respondent|defendant)s?\b[^.]*\.(?:[^.]*\.){0,2})", re.IGNORECASE)
+}
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_pages(path):
+    """Yields the text of each PDF page in turn; pages are parsed lazily, never the whole document at once."""
+    reader = PdfReader(path)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def squash(text):
+    return " ".join(text.split())
+
+
+def clip(text, limit):
+    text = squash(text)
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "..."
+
+
+def unique(items, limit=20):
+    seen, result = set(), []
+    for item in items:
+        key = item.lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result[:limit]
+
+
+def parse_parties(title):
+    """Splits 'A vs B' into the appellant and respondent names."""
+    parts = re.split(r"\s+(?:vs?\.?|versus)\s+", title, maxsplit=1, flags=re.IGNORECASE)
+    appellant = parts[0].strip()
+    respondents = [name.strip() for name in re.split(r"\s+&\s+|\s+and\s+(?=ors?\b)", parts[1])] if len(parts) > 1 else []
+    return appellant, [name for name in respondents if name and name.lower() not in NON_PARTIES]
+
+
+def clean_precedent(match):
+    """Trims a 'X v. Y' match back to the case name: no leading 'See'/'In', nothing past the sentence end."""
+    name = SENTENCE_RE.split(squash(match))[0]
+    for prefix in CITE_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    return name
+
+
+def extract_case(pages):
+    """
+    Builds a case JSON document (same schema as data/case_data.json) from an iterator of page texts.
+    Only the header pages, the last few pages and the extracted snippets are kept in memory.
+    """
+    header, tail = [], deque(maxlen=TAIL_PAGES)
+    laws, precedents = [], []
+    arguments = {"appellant": "", "respondent": ""}
+
+    for number, text in enumerate(pages):
+        if number < HEADER_PAGES:
+            header.append(text)
+        tail.append(text)
+        flat = squash(text)
+        laws.extend(squash(match) for match in ACT_RE.findall(flat))
+        precedents.extend(clean_precedent(match) for match in PRECEDENT_RE.findall(flat))
+        for side, pattern in ARGUMENT_RE.items():
+            if len(arguments[side]) < MAX_ARGUMENT_CHARS:
+                arguments[side] = clip(" ".join([arguments[side]] + pattern.findall(flat)), MAX_ARGUMENT_CHARS)
+
+    header_text = "\n".join(header)
+    lines = [line.strip() for line in header_text.splitlines() if line.strip()]
+    title_match = next((TITLE_RE.match(line) for line in lines if TITLE_RE.match(line)), None)
+    title = squash(title_match.group("title")) if title_match else (lines[0] if lines else "")
+    court = COURT_RE.search(header_text)
+    bench = BENCH_RE.search(header_text)
+    citations = CITATIONS_RE.search(header_text)
+    appellant, respondents = parse_parties(title)
+
+    tail_text = squash(" ".join(tail))
+    decisions = DECISION_RE.findall(tail_text)
+    awards = AWARD_RE.findall(tail_text)
+    precedents = [p for p in unique(precedents, limit=40) if p.lower() != title.lower()][:20]
+
+    return {
+        "case_title": title,
+        "date": title_match.group("date") if title_match else "",
+        "court": court.group(1).strip() if court else "",
+        "judgment_by": squash(bench.group("judge")) if bench else "",
+        "equivalent_citations": [c.strip() for c in citations.group("citations").split(",")] if citations else [],
+        "parties": {
+            "appellant": {"name": appellant, "description": ""},
+            "respondents": [{"name": name} for name in respondents]
+        },
+        "contract_details": {
+            "work_order": "",
+            "contract_date": "",
+            "contract_value": "",
+            "contract_purpose": "",
+            "dispute_clause": ""
+        },
+        "legal_references": {
+            "laws_cited": unique(laws),
+            "precedents": precedents
+        },
+        "key_arguments": arguments,
+        "judgment_summary": {
+            "court_decision": squash(decisions[-1]) if decisions else "",
+            "reasoning": clip(" ".join(SENTENCE_RE.split(tail_text)[-6:-1]), MAX_REASONING_CHARS),
+            "final_award": squash(awards[-1]) if awards else ""
+        }
+    }
+
+
+def output_name(case_title, digest):
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", case_title).strip("_")[:80] or "case"
+    return f"{slug}_{digest[:8]}.json"
+
+
+_known_hashes = frozenset()
+
+
+def _init_worker(known_hashes):
+    global _known_hashes
+    _known_hashes = frozenset(known_hashes)
+
+
+def ingest_pdf(pdf_path, output_dir):
+    """
+    Worker: converts one PDF judgment into a case JSON file in `output_dir`.
+    Returns (pdf_path, content hash, output file name or None if it was already ingested).
+    """
+    digest = file_hash(pdf_path)
+    if digest in _known_hashes:
+        return pdf_path, digest, None
+    case = extract_case(iter_pages(pdf_path))
+    name = output_name(case["case_title"], digest)
+    with open(os.path.join(output_dir, name), "w", encoding="utf-8") as f:
+        json.dump(case, f, indent=4, ensure_ascii=False)
+    return pdf_path, digest, name
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def find_pdfs(source):
+    if os.path.isfile(source):
+        return [source]
+    return sorted(
+        os.path.join(folder, name)
+        for folder, _, names in os.walk(source)
+        for name in names if name.lower().endswith(".pdf")
+    )
+
+
+def ingest(source, output_dir=DATA_DIR, workers=None):
+    """
+    Ingests every PDF under `source` into case JSON files across a process pool.
+    Files whose content hash is already in the output directory's manifest are skipped.
+    Returns (ingested, skipped, failed) counts.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)  # content hash -> case JSON file name
+    ingested = skipped = failed = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(list(manifest),)) as executor:
+        futures = {executor.submit(ingest_pdf, path, output_dir): path for path in find_pdfs(source)}
+        for future in as_completed(futures):
+            try:
+                pdf_path, digest, name = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {futures[future]}: {e}")
+                continue
+            if name is None or digest in manifest:
+                skipped += 1
+                continue
+            manifest[digest] = name
+            ingested += 1
+            print(f"✅ {pdf_path} -> {name}")
+            if ingested % 100 == 0:
+                save_manifest(output_dir, manifest)  # Don't lose progress on long runs
+    save_manifest(output_dir, manifest)
+    return ingested, skipped, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert PDF judgments into case JSON files.")
+    parser.add_argument("source", help="A PDF file or a directory of PDFs")
+    parser.add_argument("--out", default=DATA_DIR, help="Directory for the case JSON files")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    ingested, skipped, failed = ingest(args.source, args.out, args.workers)
+    print(f"\n📚 {ingested} ingested, {skipped} already ingested, {failed} failed.")
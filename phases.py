@@ -0,0 +1,45 @@
+from prompt_builder import build_context
+from case_record import as_case_record
+
+# Courtroom phases in order (the Tk front end's steps)
+courtroom_phases = [
+    "Opening Statement", "Cross-Examination", "Evidence Submission",
+    "Legal Precedents", "Closing Argument", "Verdict"
+]
+
+# Short phase names (as used by main.py and the HTTP service) -> courtroom phase
+PHASE_KEYS = {
+    "opening": "Opening Statement",
+    "cross": "Cross-Examination",
+    "evidence": "Evidence Submission",
+    "precedents": "Legal Precedents",
+    "closing": "Closing Argument",
+    "verdict": "Verdict"
+}
+
+
+def phase_name(phase):
+    """The courtroom phase for a short key or full phase name; raises KeyError for unknown phases."""
+    if phase in courtroom_phases:
+        return phase
+    return PHASE_KEYS[phase.lower()]
+
+
+def build_phase_prompt(phase, user_role, case_data, user_argument=""):
+    """Builds the LLM prompt for a courtroom phase (case_data may be a dict or CaseRecord)."""
+    case_facts = as_case_record(case_data).case_facts()
+    case_facts["arguments"] = case_facts["arguments"] or "No details provided."
+
+    prompt_templates = {
+        "Opening Statement": f"Generate an opening statement for {user_role} in the case '{case_facts['title']}'. Arguments: {build_context(case_facts['arguments'], 'speech')}.",
+        "Cross-Examination": f"Generate a tough cross-examination question for the opposing party in '{case_facts['title']}'.",
+        "Evidence Submission": f"Summarize key evidence supporting {user_role} in '{case_facts['title']}'.",
+        "Legal Precedents": f"List similar past legal cases relevant to '{case_facts['title']}' and their impact.",
+        "Closing Argument": f"Generate a persuasive closing argument for {user_role} in '{case_facts['title']}'.",
+        "Verdict": f"Act as a judge and give a verdict for '{case_facts['title']}' based on arguments: {build_context(case_facts['arguments'], 'verdict')}."
+    }
+
+    if user_argument:
+        prompt_templates[phase] += f"\nUser's Additional Argument: {user_argument}"
+
+    return prompt_templates[phase]
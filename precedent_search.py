@@ -0,0 +1,162 @@
+import os
+import re
+import sys
+import json
+import threading
+from collections import Counter
+from case_record import load_case_record
+from case_index import DATA_DIR, get_case_index
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+RESCAN_INTERVAL = 5.0  # Seconds between scans of the case directory for added, changed or deleted files
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "had", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "their", "there", "this", "to", "was", "were", "which", "with"
+}
+
+
+def tokenize(text):
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in STOPWORDS and len(word) > 1]
+
+
+def flatten_text(value):
+    """Joins strings found in nested dicts/lists (e.g. key_arguments) into one string."""
+    if isinstance(value, dict):
+        return " ".join(flatten_text(v) for v in value.values())
+    if isinstance(value, list):
+        return " ".join(flatten_text(v) for v in value)
+    return str(value or "")
+
+
+def case_document(record):
+    """The text a case is retrieved by: its arguments, the court's reasoning and the precedents cited."""
+    return " ".join([flatten_text(record.arguments), record.reasoning, flatten_text(record.precedents)])
+
+
+def case_entry(path):
+    """A corpus entry for one case file, with its document's term counts; None if it can't be read."""
+    try:
+        record = load_case_record(path)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return {
+        "title": record.case_title or os.path.basename(path),
+        "court": record.court,
+        "date": record.date,
+        "decision": record.court_decision,
+        "reasoning": record.reasoning,
+        "path": path,
+        "terms": Counter(tokenize(case_document(record)))
+    }
+
+
+class PrecedentIndex:
+    """In-process BM25 index over the case corpus, stored as a sparse document-term weight matrix."""
+
+    def __init__(self, cases):
+        import numpy as np  # Deferred: numpy/scipy dominate import time and only searches need them
+        from scipy import sparse
+        self.cases = cases  # [{"title", "court", "date", "decision", "reasoning", "path", "terms"}]
+        self.vocabulary = {}
+        rows, cols, counts = [], [], []
+        lengths = np.zeros(len(cases), dtype=np.float64)
+        for row, case in enumerate(cases):
+            terms = {self.vocabulary.setdefault(token, len(self.vocabulary)): count for token, count in case["terms"].items()}
+            rows.extend([row] * len(terms))
+            cols.extend(terms.keys())
+            counts.extend(terms.values())
+            lengths[row] = sum(terms.values())
+
+        tf = sparse.csr_matrix((np.array(counts, dtype=np.float64), (rows, cols)),
+                               shape=(len(cases), len(self.vocabulary)))
+        df = np.bincount(tf.indices, minlength=len(self.vocabulary))
+        idf = np.log(1 + (len(cases) - df + 0.5) / (df + 0.5))
+
+        # Precompute BM25 term weights so a query is a single sparse mat-vec product
+        avg_length = lengths.mean() if len(cases) else 0.0
+        norm = K1 * (1 - B + B * lengths / avg_length) if avg_length else np.full(len(cases), K1)
+        weights = tf.copy()
+        row_norm = np.repeat(norm, np.diff(tf.indptr))
+        weights.data = idf[tf.indices] * tf.data * (K1 + 1) / (tf.data + row_norm)
+        self.weights = weights.tocsc()
+
+    @classmethod
+    def from_directory(cls, directory=DATA_DIR, case_index=None):
+        case_index = case_index or get_case_index()
+        case_index.refresh(directory)
+        return cls([case for case in map(case_entry, case_index.files(directory)) if case])
+
+    def search(self, query, k=3, exclude_title=None):
+        """Returns up to k (score, case) pairs most similar to `query`, best first."""
+        import numpy as np
+        columns = sorted({self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary})
+        if not columns:
+            return []
+        scores = np.asarray(self.weights[:, columns].sum(axis=1)).ravel()
+        if exclude_title:
+            for i, case in enumerate(self.cases):
+                if case["title"] == exclude_title:
+                    scores[i] = 0.0
+
+        k = min(k, int(np.count_nonzero(scores > 0)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), self.cases[i]) for i in top]
+
+
+_index = None
+_index_version = None
+_entries = {}  # path -> (mtime, corpus entry), so only changed files are re-read and re-tokenized
+_index_lock = threading.Lock()
+
+
+def get_precedent_index(directory=DATA_DIR, case_index=None, max_age=RESCAN_INTERVAL):
+    """
+    Returns the BM25 index for `directory`. File changes are tracked by the case index, which rescans
+    the directory (recursively) at most every `max_age` seconds; the BM25 matrix is rebuilt only when
+    it reports a change, and then only the changed files are re-parsed.
+    """
+    global _index, _index_version
+    case_index = case_index or get_case_index()
+    version = (case_index, directory, case_index.refresh(directory, max_age))
+    with _index_lock:
+        if _index is None or _index_version != version:
+            files = case_index.files(directory)
+            for path, mtime in files.items():
+                if _entries.get(path, (None,))[0] != mtime:
+                    _entries[path] = (mtime, case_entry(path))
+            for path in [path for path in _entries if path not in files and path.startswith(os.path.join(directory, ""))]:
+                del _entries[path]
+            _index = PrecedentIndex([_entries[path][1] for path in files if _entries[path][1]])
+            _index_version = version
+        return _index
+
+
+def find_related_cases(case_facts, legal_references=None, k=3):
+    """Finds the k corpus cases most similar to the given case facts (excluding the case itself)."""
+    query = " ".join([flatten_text(case_facts.get("arguments", {})), flatten_text(legal_references or {})])
+    return [case for _, case in get_precedent_index().search(query, k, exclude_title=case_facts.get("title"))]
+
+
+def summarize_related_cases(cases, max_reasoning=160):
+    """Compact one-line-per-case summary for prompts."""
+    if not cases:
+        return "None found."
+    lines = []
+    for case in cases:
+        reasoning = case["reasoning"] if len(case["reasoning"]) <= max_reasoning else case["reasoning"][:max_reasoning].rstrip() + "..."
+        lines.append(f"- {case['title']} ({case['court']}, {case['date']}): {case['decision']} {reasoning}".strip())
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    index = get_precedent_index()
+    query = " ".join(sys.argv[1:]) or "arbitration award compensation damages"
+    print(f"\n📚 Top matches for '{query}':")
+    for score, case in index.search(query, k=5):
+        print(f"   {score:6.2f}  {case['title']} ({case['court']}, {case['date']})")
@@ -0,0 +1,83 @@
+import math
+
+# Input budget (estimated tokens) for the case context of each kind of prompt
+PHASE_BUDGETS = {
+    "objection": 400,
+    "speech": 800,
+    "strategy": 800,
+    "verdict": 1000,
+    "references": 400,
+    "agent": 600,
+    "cross_examination": 600
+}
+DEFAULT_BUDGET = 800
+MIN_FIELD_TOKENS = 20  # Don't keep a trimmed field if less than this much of it would fit
+
+# Fields are trimmed from the end of this list first; unlisted fields are trimmed before any of them
+FIELD_PRIORITY = [
+    "title", "case_title", "arguments", "key_arguments", "court_decision", "contract_purpose",
+    "final_award", "laws_cited", "precedents", "court", "date"
+]
+
+
+def estimate_tokens(text):
+    """Cheap local token estimate (~4 characters per token for English text)."""
+    return math.ceil(len(text) / 4)
+
+
+def render_value(value):
+    """Renders a value without JSON/dict punctuation: lists joined with '; ', nested dicts as 'key: value' pairs."""
+    if isinstance(value, dict):
+        return "; ".join(f"{key}: {render_value(item)}" for key, item in value.items() if item)
+    if isinstance(value, (list, tuple)):
+        return "; ".join(render_value(item) for item in value if item)
+    return " ".join(str(value).split())
+
+
+def render_context(fields):
+    """Compact 'key: value' lines, one per top-level field."""
+    return "\n".join(f"{key}: {render_value(value)}" for key, value in fields.items() if value)
+
+
+def field_priority(key):
+    return FIELD_PRIORITY.index(key) if key in FIELD_PRIORITY else len(FIELD_PRIORITY)
+
+
+def truncate_to_budget(text, budget):
+    """Cuts text to roughly `budget` tokens, on a word boundary; the ' ...' marking the cut fits in the budget."""
+    max_chars = budget * 4
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= len(" ..."):
+        return text[:max(max_chars, 0)]
+    return text[:max_chars - len(" ...")].rsplit(" ", 1)[0] + " ..."
+
+
+def build_context(fields, phase=None, budget=None):
+    """
+    Renders case fields compactly and keeps them within the phase's token budget. Fields are kept in
+    priority order; the first one that doesn't fit is truncated to the room left (the highest-priority
+    field always is, other fields only if at least MIN_FIELD_TOKENS of them fit) and every field of
+    lower priority is dropped.
+    """
+    budget = budget or PHASE_BUDGETS.get(phase, DEFAULT_BUDGET)
+    if not isinstance(fields, dict):
+        return truncate_to_budget(render_value(fields), budget)
+
+    rendered = {key: render_value(value) for key, value in fields.items() if value}
+    kept = {}
+    for key in sorted(rendered, key=field_priority):
+        if estimate_tokens(render_context({**kept, key: rendered[key]})) <= budget:
+            kept[key] = rendered[key]
+            continue
+        prefix = render_context(kept) + "\n" if kept else ""
+        remaining = budget - estimate_tokens(f"{prefix}{key}: ")
+        if remaining >= MIN_FIELD_TOKENS or not kept:
+            kept[key] = truncate_to_budget(rendered[key], remaining)
+        break
+    return truncate_to_budget(render_context({key: kept[key] for key in rendered if key in kept}), budget)
+
+
+def compact_prompt(text):
+    """Strips the source-code indentation that triple-quoted prompt templates carry into every line."""
+    return "\n".join(line.strip() for line in text.strip().splitlines())
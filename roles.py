@@ -1,4 +1,5 @@
 import json
+from case_record import as_case_record, load_case_record
 
 class CourtRole:
     """
@@ -29,24 +30,25 @@ class CourtRole:
 
 def assign_roles(case_data):
     """
-    Dynamically assigns courtroom roles based on JSON case data.
+    Dynamically assigns courtroom roles based on JSON case data (a dict or CaseRecord).
     """
+    record = as_case_record(case_data)
 
-    # Identify the Appellant's key (could be 'appellant', 'petitioner', or 'plaintiff')
-    appellant_key = next((key for key in ["appellant", "petitioner", "plaintiff"] if key in case_data.get("parties", {})), None)
-    if not appellant_key:
+    # The Appellant's key could be 'appellant', 'petitioner', or 'plaintiff'
+    if not record.appellant_key:
         raise KeyError("❌ No valid appellant (petitioner/plaintiff) found in the case file.")
 
     # Assign roles
     return {
-        "Judge": CourtRole(case_data.get("judgment_by", "Honorable Judge"), "Judge"),
-        "Appellant": CourtRole(case_data["parties"][appellant_key].get("name", "Unknown Appellant"), "Appellant"),
+        "Judge": CourtRole(record.judgment_by or "Honorable Judge", "Judge"),
+        "Appellant": CourtRole(record.appellant.get("name", "Unknown Appellant"), "Appellant"),
         "Respondents": [
             CourtRole(resp.get("name", "Unknown Respondent"), "Respondent")
-            for resp in case_data.get("parties", {}).get("respondents", [])
+            for resp in record.respondents
         ],
         "Witnesses": [
-            CourtRole(witness, "Witness") for witness in case_data.get("witnesses", [])
+            CourtRole(witness.get("name", "Unknown Witness") if isinstance(witness, dict) else str(witness), "Witness")
+            for witness in record.witnesses
         ]
     }
 
@@ -57,11 +59,10 @@ if __name__ == "__main__":
     def load_case_file(file_path):
         """Loads case data from JSON file."""
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                return json.load(file)
+            return load_case_record(file_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"⚠️ Error loading case file: {e}")
-            return {}
+            return None
 
     case_data = load_case_file(case_file_path)
 
@@ -0,0 +1,213 @@
+import time
+import heapq
+import random
+import itertools
+import threading
+import contextlib
+from config import Settings
+
+settings = Settings(
+    # Account limits (override in .env; 0 = unlimited)
+    requests_per_minute=("GROQ_RPM", "30", int),
+    tokens_per_minute=("GROQ_TPM", "0", int),
+    reserved_output_tokens=("GROQ_RESERVED_OUTPUT_TOKENS", "512", int),  # Counted against TPM until usage is known
+    # Retry settings: only rate limits, transient server errors and timeouts are retried
+    max_retries=("LEX_MAX_RETRIES", "3", int),
+    backoff_base=("LEX_BACKOFF_BASE", "0.5", float),
+    backoff_max=("LEX_BACKOFF_MAX", "20", float),
+    max_retry_after=("LEX_MAX_RETRY_AFTER", "60", float)
+)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Request priorities: lower runs first
+INTERACTIVE = 0
+BATCH = 1
+
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def request_priority(priority):
+    """Runs the calls made on this thread inside the block at `priority` (e.g. BATCH for bulk jobs)."""
+    previous = getattr(_local, "priority", INTERACTIVE)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def current_priority():
+    return getattr(_local, "priority", INTERACTIVE)
+
+
+def with_priority(call):
+    """
+    Wraps `call` to run at the calling thread's request priority, for work handed to another thread
+    (the priority is per thread, so a pool worker would otherwise run at INTERACTIVE).
+    """
+    priority = current_priority()
+
+    def run(*args, **kwargs):
+        with request_priority(priority):
+            return call(*args, **kwargs)
+    return run
+
+
+class TokenBucket:
+    """Refills at `per_minute` units per minute, holding at most one minute's worth."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` units are available (requests above capacity only wait for a full bucket)."""
+        self.refill(now)
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount):
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class Scheduler:
+    """
+    Sits between every caller and the API. Requests wait for request and token budget (token
+    buckets sized to the account's RPM/TPM), higher-priority requests are admitted first, and 429 /
+    5xx responses and timeouts are retried with jittered exponential backoff. A Retry-After header
+    pauses all callers, not just the one that hit the limit.
+    """
+
+    def __init__(self, rpm=None, tpm=None, max_retries=None, backoff_base=None, backoff_max=None):
+        rpm = settings.requests_per_minute if rpm is None else rpm
+        tpm = settings.tokens_per_minute if tpm is None else tpm
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_retries = settings.max_retries if max_retries is None else max_retries
+        self.backoff_base = settings.backoff_base if backoff_base is None else backoff_base
+        self.backoff_max = settings.backoff_max if backoff_max is None else backoff_max
+        self.paused_until = 0.0
+        self.waiters = []  # Heap of (priority, arrival) tickets
+        self.arrivals = itertools.count()
+        self.condition = threading.Condition()
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "waited": 0.0}
+
+    def acquire(self, tokens=0, priority=None):
+        """Blocks until the request may be sent: no pause, first in priority order and budget available."""
+        priority = current_priority() if priority is None else priority
+        ticket = (priority, next(self.arrivals))
+        started = time.monotonic()
+        with self.condition:
+            heapq.heappush(self.waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self.paused_until - now
+                    if wait <= 0 and self.waiters[0] == ticket:
+                        wait = max(
+                            self.requests.wait_time(1, now) if self.requests else 0.0,
+                            self.tokens.wait_time(tokens, now) if self.tokens else 0.0
+                        )
+                        if wait <= 0:
+                            if self.requests:
+                                self.requests.take(1)
+                            if self.tokens:
+                                self.tokens.take(tokens)
+                            self.stats["requests"] += 1
+                            self.stats["waited"] += now - started
+                            return
+                    elif wait <= 0:
+                        wait = None  # Queued behind a higher-priority or earlier request
+                    self.condition.wait(wait)
+            finally:
+                self.waiters.remove(ticket)
+                heapq.heapify(self.waiters)
+                self.condition.notify_all()
+
+    def settle(self, reserved, used):
+        """Returns the unused part of a request's token reservation once its real usage is known."""
+        if self.tokens and used is not None and used < reserved:
+            with self.condition:
+                self.tokens.give_back(reserved - used)
+                self.condition.notify_all()
+
+    def pause(self, seconds):
+        """Holds back every caller for `seconds` (e.g. from a 429's Retry-After)."""
+        with self.condition:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.stats["rate_limited"] += 1
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff delay for the given retry attempt (0-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def send(self, make_request, tokens=0, priority=None):
+        """
+        Sends `make_request()` (returning a requests.Response) within the rate limits, retrying
+        retryable failures. Every attempt reserves `tokens`; error responses give their reservation
+        back, while a timed-out request may still have been processed, so its reservation stands.
+        The caller settles the successful attempt's reservation. Returns the successful response;
+        raises requests.RequestException (HTTPError for a final non-2xx response) once retries are exhausted.
+        """
+        requests = requests_module()
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, priority)
+            try:
+                response = make_request()
+            except requests.Timeout:
+                if attempt == self.max_retries:
+                    raise
+                self.stats["retries"] += 1
+                time.sleep(self.backoff(attempt))
+                continue
+
+            if response.status_code >= 400:
+                self.settle(tokens, 0)  # A rejected request used none of its reservation
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                response.raise_for_status()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            response.close()
+            self.stats["retries"] += 1
+            if response.status_code == 429:
+                self.pause(retry_after if retry_after is not None else self.backoff(attempt))
+            else:
+                time.sleep(retry_after if retry_after is not None else self.backoff(attempt))
+
+
+def requests_module():
+    """The requests package, imported on first use: it is most of the startup time of every front end."""
+    import requests
+    return requests
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds form), capped at LEX_MAX_RETRY_AFTER."""
+    try:
+        return min(max(float(value), 0.0), settings.max_retry_after)
+    except (TypeError, ValueError):
+        return None
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Returns the process-wide Scheduler, so every client shares one rate limit."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = Scheduler()
+    return _scheduler
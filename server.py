@@ -0,0 +1,290 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+import llm_client
+from model_router import get_router
+from case_index import DATA_DIR
+from case_record import load_case_record
+from phases import courtroom_phases, phase_name, build_phase_prompt
+from prompt_builder import build_context
+from objections import detect_objections
+from verdict import stream_verdict
+from transcript_log import open_transcript
+from session_store import get_session_store
+from config import Settings, is_on
+
+# Server settings (override in .env)
+settings = Settings(
+    host=("LEX_SERVER_HOST", "127.0.0.1", str),
+    port=("LEX_SERVER_PORT", "8000", int),
+    stream_output=("LEX_STREAM", "1", is_on)
+)
+
+ROLES = ["Appellant", "Respondent"]
+
+app = FastAPI(title="Lex Courtroom Simulator")
+
+
+# Request bodies
+class CaseRequest(BaseModel):
+    path: str
+
+
+class SessionRequest(BaseModel):
+    case: str
+    role: str = "Appellant"
+
+
+class PhaseRequest(BaseModel):
+    argument: str = ""
+
+
+class ObjectionRequest(BaseModel):
+    statements: list[str]
+
+
+def case_path(path):
+    """Resolves a case file inside the data directory; anything outside it is rejected."""
+    full = os.path.realpath(os.path.join(DATA_DIR, path))
+    if os.path.commonpath([full, os.path.realpath(DATA_DIR)]) != os.path.realpath(DATA_DIR) or not full.endswith(".json"):
+        raise HTTPException(400, "Case files must be .json files in the data directory")
+    if not os.path.isfile(full):
+        raise HTTPException(404, f"No case file {path}")
+    return full
+
+
+async def load_case(path):
+    """Loads a case record off the event loop (parsing is memoized, so repeat loads are cheap)."""
+    full = case_path(path)
+    try:
+        return await asyncio.to_thread(load_case_record, full)
+    except (OSError, json.JSONDecodeError) as e:
+        raise HTTPException(400, f"Unable to load or parse {path}: {e}")
+
+
+async def get_session(session_id):
+    """Looks a session up off the event loop: an expired session's transcript is closed (and synced) on the way."""
+    session = await asyncio.to_thread(get_session_store().get, session_id)
+    if session is None:
+        raise HTTPException(404, "Unknown session")
+    return session
+
+
+def case_summary(record):
+    return {
+        "title": record.case_title,
+        "court": record.court,
+        "date": record.date,
+        "appellant": record.appellant_name,
+        "respondents": record.respondent_names
+    }
+
+
+# Streaming
+def sse(event, data):
+    """One server-sent event; data is JSON so multi-line text survives."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def stream_in_thread(make_chunks):
+    """
+    Runs a blocking chunk iterator `make_chunks(cancel)` on its own thread and yields its chunks on
+    the event loop. If the consumer stops early (e.g. the client disconnects), `cancel` is set so
+    the generation stops at its next chunk.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = asyncio.Queue()
+    cancel = threading.Event()
+
+    def put(item):
+        try:
+            loop.call_soon_threadsafe(chunks.put_nowait, item)
+        except RuntimeError:
+            cancel.set()  # Event loop closed
+
+    def pump():
+        try:
+            for chunk in make_chunks(cancel):
+                if cancel.is_set():
+                    break
+                put(("chunk", chunk))
+        except Exception as e:
+            put(("chunk", f"⚠ Error: {str(e)}"))
+        finally:
+            put(("end", None))
+
+    threading.Thread(target=pump, daemon=True).start()
+    try:
+        while True:
+            kind, chunk = await chunks.get()
+            if kind == "end":
+                return
+            yield chunk
+    finally:
+        cancel.set()
+
+
+def phase_chunks(session, phase, argument):
+    """The blocking chunk source of a phase; the verdict comes from the AI-Judge with both sides' cases."""
+    if phase == "Verdict":
+        arguments = session.case.arguments if isinstance(session.case.arguments, dict) else {}
+        sides = {role: build_context(arguments.get(role.lower(), ""), "speech") or "Not presented." for role in ROLES}
+        presented = [session.outputs.get("Opening Statement"), session.outputs.get("Closing Argument"), argument]
+        if any(presented):
+            sides[session.role] = build_context("\n".join(text for text in presented if text), "speech")
+        facts = session.case.case_facts("contract_purpose", "court_decision")
+        return lambda cancel: stream_verdict(facts, sides["Appellant"], sides["Respondent"],
+                                             session.case.legal_references, cancel=cancel)
+
+    prompt = build_phase_prompt(phase, session.role, session.case, argument)
+
+    def chunks(cancel):
+        try:
+            if not settings.stream_output:
+                yield get_router().complete("phase", prompt)
+                return
+            yield from get_router().stream("phase", prompt, cancel=cancel)
+        except llm_client.RequestException as e:
+            yield f"⚠ API Error: {str(e)}"
+
+    return chunks
+
+
+def finish_phase(session, phase, text, timing):
+    """Records a finished phase in the store and the transcript (file I/O, so run off the event loop)."""
+    get_session_store().record(session, phase, text)
+    if session.transcript:
+        session.transcript.log_turn(phase, session.role, text, timing=timing)
+
+
+async def phase_events(session, phase, argument):
+    """
+    SSE stream of one phase: "phase", a "chunk" per piece of text, then "done" with the full text and
+    timing. The session is busy only while this runs, so a client that disconnects before the stream
+    starts leaves it free.
+    """
+    if session.busy:  # Another phase started after this request was accepted
+        yield sse("error", {"detail": "A phase is already running for this session"})
+        return
+    session.busy = True
+    try:
+        yield sse("phase", {"phase": phase})
+        start = time.perf_counter()
+        first_token = None
+        parts = []
+        async for chunk in stream_in_thread(phase_chunks(session, phase, argument)):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            parts.append(chunk)
+            yield sse("chunk", {"text": chunk})
+
+        text = "".join(parts).strip()
+        timing = {"first_token": first_token, "total": time.perf_counter() - start}
+        await asyncio.to_thread(finish_phase, session, phase, text, timing)
+        yield sse("done", {"phase": phase, "text": text, **timing, "next_phase": session.phase})
+    finally:
+        session.busy = False
+
+
+def start_phase(session, phase, argument):
+    if session.busy:
+        raise HTTPException(409, "A phase is already running for this session")
+    return StreamingResponse(phase_events(session, phase, argument), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# Endpoints
+@app.get("/cases")
+async def list_cases():
+    names = await asyncio.to_thread(os.listdir, DATA_DIR)
+    return {"cases": sorted(name for name in names if name.endswith(".json"))}
+
+
+@app.post("/cases")
+async def get_case(request: CaseRequest):
+    record = await load_case(request.path)
+    return {"case": request.path, **case_summary(record)}
+
+
+@app.post("/sessions")
+async def create_session(request: SessionRequest):
+    role = request.role.capitalize()
+    if role not in ROLES:
+        raise HTTPException(400, f"Role must be one of: {', '.join(ROLES)}")
+    case = await load_case(request.case)  # The shared CaseRecord; sessions of the same case don't copy it
+    session = await asyncio.to_thread(get_session_store().create, case, role, "server")
+    session.transcript = await asyncio.to_thread(open_transcript, case.case_title, "server", keep_open=False,
+                                                 session_id=session.id, role=role)
+    return {**session.to_dict(), "phases": courtroom_phases}
+
+
+@app.get("/sessions")
+async def session_stats():
+    return get_session_store().stats()
+
+
+@app.get("/sessions/{session_id}")
+async def session_state(session_id: str):
+    return (await get_session(session_id)).to_dict()
+
+
+@app.delete("/sessions/{session_id}")
+async def end_session(session_id: str):
+    session = await asyncio.to_thread(get_session_store().remove, session_id)  # Closes its transcript
+    if session is None:
+        raise HTTPException(404, "Unknown session")
+    return {"ended": session_id}
+
+
+@app.post("/sessions/{session_id}/advance")
+async def advance(session_id: str, request: PhaseRequest = None):
+    """Streams the session's next phase."""
+    session = await get_session(session_id)
+    if session.phase is None:
+        raise HTTPException(409, "The simulation is complete")
+    return start_phase(session, session.phase, request.argument if request else "")
+
+
+@app.post("/sessions/{session_id}/phases/{phase}")
+async def run_phase(session_id: str, phase: str, request: PhaseRequest = None):
+    """Streams a specific phase (short keys such as "opening" / "cross" / "closing" / "verdict" or full names)."""
+    session = await get_session(session_id)
+    try:
+        name = phase_name(phase)
+    except KeyError:
+        raise HTTPException(404, f"Unknown phase {phase}")
+    return start_phase(session, name, request.argument if request else "")
+
+
+@app.post("/sessions/{session_id}/verdict")
+async def verdict(session_id: str, request: PhaseRequest = None):
+    return start_phase(await get_session(session_id), "Verdict", request.argument if request else "")
+
+
+@app.post("/sessions/{session_id}/objections")
+async def objections(session_id: str, request: ObjectionRequest):
+    """Streams an "objection" event per statement as each analysis finishes (concurrent statements share requests)."""
+    session = await get_session(session_id)
+    case_facts = session.case.case_facts()
+
+    async def check(index, statement):
+        return index, statement, await asyncio.to_thread(detect_objections, statement, case_facts)
+
+    async def events():
+        for result in asyncio.as_completed([check(i, s) for i, s in enumerate(request.statements)]):
+            index, statement, analysis = await result
+            yield sse("objection", {"index": index, "statement": statement, "analysis": analysis})
+        yield sse("done", {"count": len(request.statements)})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+# Run with: python server.py (or uvicorn server:app)
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=settings.host, port=settings.port)
@@ -0,0 +1,175 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from phases import courtroom_phases
+from config import Settings
+
+# Session limits (override in .env; 0 = no limit)
+settings = Settings(
+    ttl=("LEX_SESSION_TTL", "3600", float),  # Seconds a session may sit idle before it is dropped
+    max_sessions=("LEX_MAX_SESSIONS", "10000", int),
+    max_bytes=("LEX_SESSION_MEMORY_MB", "256", lambda value: int(float(value) * 1024 * 1024))
+)
+SESSION_OVERHEAD = 1024  # Estimated bytes of a session's own objects, besides its phase outputs
+
+
+class Session:
+    """
+    One simulation's state: the case (a shared, read-only CaseRecord — never copied per session),
+    the user's role, the completed phase outputs and where its transcript goes. The current phase is
+    the first courtroom phase not completed yet.
+    """
+
+    __slots__ = ("id", "case", "role", "front_end", "outputs", "transcript", "checkpoint", "busy",
+                 "created", "last_used", "size")
+
+    def __init__(self, case, role, front_end, transcript=None, session_id=None):
+        self.id = session_id or uuid.uuid4().hex
+        self.case = case
+        self.role = role
+        self.front_end = front_end
+        self.outputs = {}  # phase -> output, in completion order
+        self.transcript = transcript  # TranscriptLog, or None
+        self.checkpoint = None  # SimulationState, for front ends that offer resume
+        self.busy = False  # A phase is being generated; busy sessions are never evicted
+        self.created = self.last_used = time.monotonic()
+        self.size = SESSION_OVERHEAD
+
+    @property
+    def phase(self):
+        """The next phase to run, or None once the trial is over."""
+        return next((phase for phase in courtroom_phases if phase not in self.outputs), None)
+
+    @property
+    def phase_index(self):
+        phase = self.phase
+        return courtroom_phases.index(phase) if phase else len(courtroom_phases)
+
+    def to_dict(self):
+        return {
+            "session_id": self.id,
+            "case": self.case.case_title,
+            "role": self.role,
+            "completed": list(self.outputs),
+            "next_phase": self.phase,
+            "outputs": self.outputs
+        }
+
+    def __repr__(self):
+        return f"Session({self.id!r}, {self.case.case_title!r}, role={self.role!r}, phase={self.phase!r})"
+
+
+def close_session(session):
+    """Default eviction hook: closes the session's transcript."""
+    if session.transcript:
+        session.transcript.close()
+
+
+class SessionStore:
+    """
+    All sessions of the process, least recently used first. Sessions idle for longer than `ttl` are
+    dropped, and past `max_sessions` sessions or `max_bytes` of estimated session memory the least
+    recently used idle sessions are evicted. Evicted sessions are passed to `on_evict`.
+    """
+
+    def __init__(self, ttl=None, max_sessions=None, max_bytes=None, on_evict=close_session):
+        self.ttl = settings.ttl if ttl is None else ttl
+        self.max_sessions = settings.max_sessions if max_sessions is None else max_sessions
+        self.max_bytes = settings.max_bytes if max_bytes is None else max_bytes
+        self.on_evict = on_evict
+        self.sessions = OrderedDict()
+        self.bytes = 0
+        self.evicted = 0
+        self.lock = threading.RLock()
+
+    def create(self, case, role, front_end, transcript=None):
+        session = Session(case, role, front_end, transcript)
+        with self.lock:
+            self.sessions[session.id] = session
+            self.bytes += session.size
+        self.sweep()
+        return session
+
+    def get(self, session_id):
+        """The live session with this id (marked as just used), or None if unknown or expired."""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            if self.expired(session, time.monotonic()):
+                self.evict(session)
+                return None
+            session.last_used = time.monotonic()
+            self.sessions.move_to_end(session_id)
+            return session
+
+    def record(self, session, phase, output):
+        """Stores a completed phase's output, keeping the memory estimate up to date."""
+        with self.lock:
+            growth = len(output.encode("utf-8")) - len(session.outputs.get(phase, "").encode("utf-8"))
+            session.outputs[phase] = output
+            session.size += growth
+            if session.id in self.sessions:
+                self.bytes += growth
+                session.last_used = time.monotonic()
+                self.sessions.move_to_end(session.id)
+        self.sweep()
+
+    def remove(self, session_id):
+        """Ends a session; returns it (already passed to `on_evict`), or None if unknown."""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.evict(session, counted=False)
+            return session
+
+    def expired(self, session, now):
+        return bool(self.ttl) and not session.busy and now - session.last_used > self.ttl
+
+    def evict(self, session, counted=True):
+        del self.sessions[session.id]
+        self.bytes -= session.size
+        if counted:
+            self.evicted += 1
+        if self.on_evict:
+            self.on_evict(session)
+
+    def sweep(self):
+        """Drops expired sessions, then evicts least recently used idle sessions while over a limit."""
+        now = time.monotonic()
+        with self.lock:
+            victims = []
+            count, size = len(self.sessions), self.bytes
+            for session in self.sessions.values():
+                stale = self.ttl and now - session.last_used > self.ttl
+                over = (self.max_sessions and count > self.max_sessions) or (self.max_bytes and size > self.max_bytes)
+                if not stale and not over:
+                    break  # Everything after this one was used more recently
+                if not session.busy:
+                    victims.append(session)
+                    count -= 1
+                    size -= session.size
+            for session in victims:
+                self.evict(session)
+
+    def stats(self):
+        with self.lock:
+            return {"sessions": len(self.sessions), "bytes": self.bytes, "evicted": self.evicted}
+
+    def __len__(self):
+        return len(self.sessions)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Returns the process-wide SessionStore, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+    return _store
@@ -1,74 +1,77 @@
-import os
-import json
-from dotenv import load_dotenv
-import groq
-
-# Load API Key from .env
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# Set up Groq API client
-client = groq.Client(api_key=GROQ_API_KEY)
+from parallel import gather
+from model_router import generate_for, get_router
+from utils import ThinkStripper, remove_chain_of_thought
+from precedent_search import find_related_cases, summarize_related_cases
+from prompt_builder import build_context, compact_prompt
+from case_record import load_case_record
 
 def load_case_details(json_path):
-    """Loads case details from JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as file:
-        return json.load(file)
+    """Loads case details from JSON file (as a CaseRecord)."""
+    return load_case_record(json_path)
 
-def suggest_strategy(role, case_facts, legal_references):
-    """
-    Uses Groq API (deepseek-r1-distill-llama-70b) to generate courtroom strategies.
-    """
-    try:
-        prompt = f"""
-        You are a skilled {role} preparing a courtroom strategy.
+def strategy_prompt(role, case_facts, legal_references, related_cases=None):
+    """Builds the strategy prompt; similar cases from the corpus are looked up unless `related_cases` is given."""
+    if related_cases is None:
+        related_cases = find_related_cases(case_facts, legal_references)
 
-        **Case Facts:**
-        {case_facts}
+    return compact_prompt(f"""
+    You are a skilled {role} preparing a courtroom strategy.
 
-        **Legal References (Precedents & Laws Cited):**
-        {legal_references}
+    **Case Facts:**
+    {build_context(case_facts, "strategy")}
 
-        Provide a well-structured, legally strong strategy that includes:
-        1️⃣ Key arguments based on legal principles.
-        2️⃣ How to counter the opposing side.
-        3️⃣ Real-world case examples to support your position.
-        """
+    **Legal References (Precedents & Laws Cited):**
+    {build_context(legal_references, "references")}
 
-        response = client.chat.completions.create(
-            model="deepseek-r1-distill-llama-70b",
-            messages=[{"role": "system", "content": prompt}],
-            temperature=0.5
-        )
+    **Related Cases From Our Corpus:**
+    {summarize_related_cases(related_cases)}
 
-        return response.choices[0].message.content.strip()
+    Provide a well-structured, legally strong strategy that includes:
+    1️⃣ Key arguments based on legal principles.
+    2️⃣ How to counter the opposing side.
+    3️⃣ Real-world case examples to support your position.
+    """)
+
+def suggest_strategy(role, case_facts, legal_references, related_cases=None):
+    """
+    Uses Groq API (deepseek-r1-distill-llama-70b) to generate courtroom strategies.
+    The model's <think> reasoning is removed from the result.
+    """
+    try:
+        prompt = strategy_prompt(role, case_facts, legal_references, related_cases)
+        return remove_chain_of_thought(generate_for("strategy", prompt, temperature=0.5))
 
     except Exception as e:
         return f"⚠ Error generating strategy: {str(e)}"
 
+def stream_strategy(role, case_facts, legal_references, related_cases=None, stripper=None):
+    """
+    Yields the strategy as it is generated. The <think> reasoning is dropped on the fly, so text
+    appears as soon as the reasoning ends; `stripper` (a ThinkStripper) counts what was dropped.
+    """
+    stripper = stripper or ThinkStripper()
+    try:
+        prompt = strategy_prompt(role, case_facts, legal_references, related_cases)
+        yield from stripper.strip(get_router().stream("strategy", prompt, temperature=0.5))
+    except Exception as e:
+        yield f"⚠ Error generating strategy: {str(e)}"
+
 # Example Usage
 if __name__ == "__main__":
     case_file_path = "data/Sunit_C_Khatau_Case.json"
     case_data = load_case_details(case_file_path)
 
     # Extract necessary data
-    case_facts = {
-        "title": case_data["case_title"],
-        "arguments": case_data.get("key_arguments") or case_data.get("legal_arguments", {}),
-        "contract_purpose": case_data["contract_details"]["contract_purpose"],
-        "court_decision": case_data["judgment_summary"]["court_decision"]
-    }
-
-    legal_references = {
-        "laws_cited": case_data["legal_references"]["laws_cited"],
-        "precedents": case_data["legal_references"]["precedents"]
-    }
+    case_facts = case_data.case_facts("contract_purpose", "court_decision")
+    legal_references = case_data.legal_references
 
     print("\n📌 **AI-Generated Courtroom Strategies**\n")
 
-    # Generate strategies
-    prosecution_strategy = suggest_strategy("Prosecutor", case_facts, legal_references)
-    defense_strategy = suggest_strategy("Defense Attorney", case_facts, legal_references)
+    # Generate strategies (both sides at the same time)
+    prosecution_strategy, defense_strategy = gather(
+        lambda: suggest_strategy("Prosecutor", case_facts, legal_references),
+        lambda: suggest_strategy("Defense Attorney", case_facts, legal_references)
+    )
 
     print("\n🔹 **Prosecution Strategy:**\n", prosecution_strategy)
     print("\n🔹 **Defense Strategy:**\n", defense_strategy)
@@ -0,0 +1,61 @@
+import os
+import json
+import shutil
+import pytest
+import batch
+
+
+def fake_steps(monkeypatch, fail_phase=None):
+    def phase_response(phase, role, case_facts):
+        return "⚠ API Error: 503 Service Unavailable" if phase == fail_phase else f"{role} {phase}"
+
+    monkeypatch.setattr(batch, "generate_phase_response", phase_response)
+    monkeypatch.setattr(batch, "suggest_strategy", lambda role, facts, refs: "Strategy")
+    monkeypatch.setattr(batch, "detect_objections", lambda statement, facts: "1. Objection: No")
+    monkeypatch.setattr(batch, "generate_verdict", lambda facts, appellant, respondent, refs: "Appeal allowed")
+
+
+def case_dir(tmp_path):
+    cases = tmp_path / "cases"
+    cases.mkdir(exist_ok=True)
+    shutil.copy("data/case_data.json", cases / "case.json")
+    return str(cases)
+
+
+def test_batch_writes_one_transcript_per_run_and_skips_finished_runs(tmp_path, monkeypatch):
+    fake_steps(monkeypatch)
+    out = str(tmp_path / "out")
+    results = batch.run_batch(case_dir(tmp_path), out, workers=2)
+    assert sorted(os.path.basename(path) for path, error in results if error is None) == \
+        ["case__Appellant__0.jsonl", "case__Respondent__0.jsonl"]
+
+    with open(os.path.join(out, "case__Appellant__0.jsonl"), encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0]["run"]["role"] == "Appellant"
+    assert [event["phase"] for event in lines[1:]][-1] == "verdict"
+
+    assert batch.run_batch(case_dir(tmp_path), out) == []
+
+
+def test_failed_api_calls_fail_the_run_and_are_retried(tmp_path, monkeypatch):
+    fake_steps(monkeypatch, fail_phase="closing")
+    out = str(tmp_path / "out")
+    results = batch.run_batch(case_dir(tmp_path), out, roles=["Appellant"])
+    assert len(results) == 1 and isinstance(results[0][1], batch.SimulationError)
+    assert not os.path.exists(results[0][0])
+
+    fake_steps(monkeypatch)
+    results = batch.run_batch(case_dir(tmp_path), out, roles=["Appellant"])
+    assert [error for _, error in results] == [None] and os.path.exists(results[0][0])
+
+
+def test_interrupted_transcript_write_leaves_no_transcript(tmp_path):
+    path = str(tmp_path / "case__Appellant__0.jsonl")
+
+    def failing_events():
+        yield {"phase": "opening", "text": "Opening"}
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        batch.write_transcript(path, {"role": "Appellant"}, failing_events())
+    assert not os.path.exists(path)
@@ -0,0 +1,16 @@
+from benchmark import run_benchmarks, find_regressions
+
+
+def test_benchmarks_run_offline_against_mock_server():
+    """Every phase runs end to end against the local mock server, with no network access."""
+    report = run_benchmarks(iterations=3)
+
+    assert "main.main" in report and "verdict.generate_verdict" in report
+    for name, stats in report.items():
+        assert stats["p50"] <= stats["p95"] < 2.0, name
+
+
+def test_find_regressions_flags_only_slower_p95():
+    baseline = {"a": {"p95": 0.100}, "b": {"p95": 0.100}}
+    report = {"a": {"p95": 0.110}, "b": {"p95": 0.200}, "new": {"p95": 1.0}}
+    assert find_regressions(report, baseline, tolerance=0.25) == ["b"]
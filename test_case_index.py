@@ -0,0 +1,57 @@
+import os
+import json
+from case_index import CaseIndex
+
+
+def write_case(path, title, court="High Court of Bombay", date="12 March 2013", laws=()):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "case_title": title, "court": court, "date": date, "judgment_by": "Justice Rao",
+        "parties": {"appellant": {"name": f"{title} Ltd"}},
+        "legal_references": {"laws_cited": list(laws)}
+    }), encoding="utf-8")
+    return str(path)
+
+
+def test_update_reindexes_only_changed_files_and_drops_deleted_ones(tmp_path):
+    index = CaseIndex(":memory:")
+    first = write_case(tmp_path / "a.json", "Alpha Traders v. Union")
+    write_case(tmp_path / "nested" / "b.json", "Beta Shipping v. Port Trust")
+    assert index.update(str(tmp_path)) == (2, 0)
+    assert index.update(str(tmp_path)) == (0, 0)
+
+    write_case(tmp_path / "a.json", "Gamma Mills v. State")
+    os.utime(first, (1, 1))  # A different mtime, however fast the filesystem clock
+    assert index.update(str(tmp_path)) == (1, 0)
+    assert [case["case_title"] for case in index.search("gamma")] == ["Gamma Mills v. State"]
+    assert index.search("alpha") == []
+
+    os.remove(first)
+    assert index.update(str(tmp_path)) == (0, 1)
+    assert index.count() == 1 and index.search("gamma") == []
+
+
+def test_search_matches_word_prefixes_across_fields_and_filters(tmp_path):
+    index = CaseIndex(":memory:")
+    write_case(tmp_path / "a.json", "Alpha Traders v. Union", laws=["Arbitration and Conciliation Act, 1996"])
+    write_case(tmp_path / "b.json", "Beta Shipping v. Port Trust", court="Supreme Court of India", date="2009")
+    index.update(str(tmp_path))
+
+    assert [case["case_title"] for case in index.search("arbitrat")] == ["Alpha Traders v. Union"]
+    assert [case["case_title"] for case in index.search("shipping ltd")] == ["Beta Shipping v. Port Trust"]
+    assert [case["case_title"] for case in index.search(court="supreme")] == ["Beta Shipping v. Port Trust"]
+    assert [case["case_title"] for case in index.search(year=2013)] == ["Alpha Traders v. Union"]
+    assert len(index.search()) == 2
+
+
+def test_updating_one_directory_keeps_the_cases_of_another(tmp_path):
+    index = CaseIndex(":memory:")
+    write_case(tmp_path / "data" / "a.json", "Alpha Traders v. Union")
+    write_case(tmp_path / "data2" / "b.json", "Beta Shipping v. Port Trust")
+    assert index.update(str(tmp_path / "data")) == (1, 0)
+    assert index.update(str(tmp_path / "data2")) == (1, 0)
+
+    assert index.update(str(tmp_path / "data")) == (0, 0)
+    assert index.count() == 2
+    assert list(index.files(str(tmp_path / "data2"))) == [str(tmp_path / "data2" / "b.json")]
+    assert index.update(str(tmp_path / "data2")) == (0, 0)
@@ -0,0 +1,33 @@
+import os
+import json
+from case_record import CaseRecord, load_case_record
+
+
+def test_key_variants_resolve_to_the_same_fields():
+    for party_key in ("appellant", "petitioner", "plaintiff"):
+        for argument_key in ("key_arguments", "legal_arguments"):
+            record = CaseRecord({
+                "case_title": "A v. B",
+                "parties": {party_key: {"name": "Asha Mills"}, "respondents": [{"name": "Port Trust"}]},
+                argument_key: {"appellant": ["Clause 12 was breached"]}
+            })
+            assert record.appellant_key == party_key and record.appellant_name == "Asha Mills"
+            assert record.respondent_names == ["Port Trust"]
+            assert record.case_facts() == {"title": "A v. B", "arguments": {"appellant": ["Clause 12 was breached"]}}
+
+    record = CaseRecord({"parties": {}, "key_arguments": {}, "legal_arguments": {"appellant": ["Fallback"]}})
+    assert record.appellant_key is None and record.appellant_name == ""
+    assert record.arguments == {"appellant": ["Fallback"]}  # An empty key_arguments doesn't shadow legal_arguments
+
+
+def test_load_is_memoized_until_the_file_changes(tmp_path):
+    path = tmp_path / "case.json"
+    path.write_text(json.dumps({"case_title": "First"}), encoding="utf-8")
+    record = load_case_record(str(path))
+    assert load_case_record(str(path)) is record
+
+    path.write_text(json.dumps({"case_title": "Second"}), encoding="utf-8")
+    os.utime(path, (1, 1))  # A different mtime, however fast the filesystem clock
+    changed = load_case_record(str(path))
+    assert changed is not record and changed.case_title == "Second"
+    assert load_case_record(str(path)) is changed
@@ -0,0 +1,30 @@
+import os
+import checkpoint
+from checkpoint import SimulationState, load_checkpoint, clear_checkpoint
+
+CASE_FILE = os.path.join("data", "case_data.json")
+
+
+def test_state_round_trips_and_is_cleared(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint.settings, "directory", str(tmp_path))
+    state = SimulationState(CASE_FILE, "main", role="Appellant")
+    state.record("strategy", "Argue premature enforcement.")
+    state.record("opening", "May it please the court.")
+
+    restored = load_checkpoint("main", CASE_FILE)
+    assert restored.role == "Appellant"
+    assert list(restored.outputs) == ["strategy", "opening"]
+    assert restored.output("opening") == "May it please the court."
+    assert load_checkpoint("court_sim", CASE_FILE) is None
+
+    clear_checkpoint(restored)
+    assert load_checkpoint("main", CASE_FILE) is None
+
+
+def test_checkpoint_of_a_modified_case_file_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint.settings, "directory", str(tmp_path))
+    case_file = tmp_path / "case.json"
+    case_file.write_text("{}")
+    SimulationState(str(case_file), "main", role="Respondent").record("strategy", "...")
+    os.utime(case_file, ns=(0, 0))
+    assert load_checkpoint("main", str(case_file)) is None
@@ -0,0 +1,32 @@
+import sys
+import subprocess
+import config
+
+
+def test_setting_reads_environment(monkeypatch):
+    monkeypatch.setenv("LEX_TEST_SETTING", "42")
+    assert config.setting("LEX_TEST_SETTING") == "42"
+    assert config.setting("LEX_TEST_MISSING", "default") == "default"
+
+
+def test_flag(monkeypatch):
+    monkeypatch.setenv("LEX_TEST_FLAG", "0")
+    assert config.flag("LEX_TEST_FLAG") is False
+    monkeypatch.delenv("LEX_TEST_FLAG")
+    assert config.flag("LEX_TEST_FLAG") is True
+    assert config.flag("LEX_TEST_FLAG", default=False) is False
+
+
+def test_settings_are_read_on_first_use(monkeypatch):
+    settings = config.Settings(size=("LEX_TEST_SIZE", "3", int), enabled=("LEX_TEST_ENABLED", "1", config.is_on))
+    monkeypatch.setenv("LEX_TEST_SIZE", "7")
+    assert settings.size == 7
+    monkeypatch.setenv("LEX_TEST_SIZE", "9")
+    assert settings.size == 7  # Read once
+    assert settings.enabled is True
+
+
+def test_importing_main_loads_neither_env_nor_requests():
+    code = "import sys, main, config; print(config._env_loaded, any(m.startswith(('requests', 'urllib3')) for m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == ["False", "False"]
@@ -0,0 +1,32 @@
+import time
+import queue
+import threading
+import court_sim
+import llm_client
+from llm_client import LLMClient
+from mock_llm_server import MockLLMServer
+from model_router import ModelRouter
+from response_cache import ResponseCache
+from scheduler import Scheduler
+
+
+def test_cancelled_phase_request_stops_streaming(monkeypatch):
+    server = MockLLMServer(tokens=20, tokens_per_second=2).start()
+    client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False),
+                       scheduler=Scheduler(rpm=0, tpm=0))
+    monkeypatch.setattr(llm_client, "_client", client)
+    monkeypatch.setattr(court_sim, "get_router", lambda: ModelRouter(routes={"phase": ["mock-model"]}, hedge_tasks=set()))
+    results, cancel = queue.Queue(), threading.Event()
+    worker = threading.Thread(target=court_sim.run_phase_request, args=("Generate an opening statement.", results, cancel))
+    try:
+        worker.start()
+        assert results.get(timeout=2)[0] == "chunk"
+        cancel.set()
+        start = time.perf_counter()
+        worker.join(2)
+        assert not worker.is_alive() and time.perf_counter() - start < 0.4  # Not the 0.5s until the next token
+        assert results.get_nowait() == ("cancelled", None)
+        assert results.empty()
+    finally:
+        client.close()
+        server.stop()
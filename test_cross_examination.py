@@ -0,0 +1,79 @@
+import time
+import threading
+import pytest
+import requests
+from unittest.mock import patch
+import cross_examination
+
+
+class FlakyGenerator:
+    """Takes 0.1s per call, tracks peak concurrency and fails the first call for one witness."""
+
+    def __init__(self, flaky):
+        self.flaky = flaky
+        self.running = self.peak = 0
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, task, prompt):
+        witness = prompt.split("cross-examining the witness: ")[1].split(".\n")[0]
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.calls[witness] = self.calls.get(witness, 0) + 1
+            first = self.calls[witness] == 1
+        time.sleep(0.1)
+        with self.lock:
+            self.running -= 1
+        if witness == self.flaky and first:
+            raise requests.ConnectionError("connection reset")
+        return f"Questions for {witness}"
+
+
+def test_witnesses_run_concurrently_in_order_with_retries():
+    witnesses = [f"Witness {i}" for i in range(12)]
+    generator = FlakyGenerator(flaky="Witness 5")
+    with patch.object(cross_examination, "generate_for", generator):
+        start = time.perf_counter()
+        results = cross_examination.cross_examine_all(witnesses, {"title": "Test"}, max_concurrent=4, retry_delay=0)
+        elapsed = time.perf_counter() - start
+
+    assert results == [(w, f"Questions for {w}") for w in witnesses]
+    assert generator.calls["Witness 5"] == 2
+    assert generator.peak == 4
+    assert elapsed < 0.8  # 13 calls of 0.1s, one after the other, would take 1.3s
+
+
+def test_witness_that_keeps_failing_does_not_sink_the_rest():
+    def generate_for(task, prompt):
+        if "Witness B" in prompt:
+            raise requests.Timeout("timed out")
+        return "Questions"
+
+    with patch.object(cross_examination, "generate_for", generate_for):
+        results = cross_examination.cross_examine_all(["Witness A", "Witness B"], {"title": "Test"}, attempts=2, retry_delay=0)
+    assert results[0] == ("Witness A", "Questions")
+    assert results[1][1].startswith("⚠ Error generating cross-examination for Witness B after 2 attempts")
+
+
+def test_retries_are_capped_across_witnesses_and_skip_rejected_requests():
+    calls = []
+
+    def generate_for(task, prompt):
+        calls.append(prompt)
+        if "Witness R" in prompt:
+            response = requests.Response()
+            response.status_code = 400
+            raise requests.HTTPError("400 Bad Request", response=response)
+        raise requests.ConnectionError("connection reset")
+
+    witnesses = ["Witness R", "Witness A", "Witness B", "Witness C"]
+    with patch.object(cross_examination, "generate_for", generate_for), \
+            patch.object(cross_examination.settings, "retry_budget", 2):
+        results = cross_examination.cross_examine_all(witnesses, {"title": "Test"}, attempts=3, retry_delay=0)
+    assert all(questions.startswith("⚠") for _, questions in results)
+    assert sum("Witness R" in prompt for prompt in calls) == 1
+    assert len(calls) == len(witnesses) + 2
+
+    with pytest.raises(ValueError):
+        cross_examination.cross_examine_witness("Witness A", {"title": "Test"}, attempts=0)
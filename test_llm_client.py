@@ -0,0 +1,55 @@
+import time
+import threading
+import requests
+import llm_client
+from llm_client import LLMClient
+from response_cache import ResponseCache
+from scheduler import Scheduler
+from mock_llm_server import MockLLMServer
+
+
+def test_stream_decodes_non_ascii_tokens():
+    server = MockLLMServer(tokens=3).start()
+    try:
+        client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False),
+                           scheduler=Scheduler(rpm=0, tpm=0))
+        assert "".join(client.stream("₹5 — “award”")) == "₹5 — “award” "
+        client.close()
+    finally:
+        server.stop()
+
+
+def test_sequential_calls_reuse_one_pooled_connection():
+    server = MockLLMServer(tokens=3).start()
+    client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False),
+                       scheduler=Scheduler(rpm=0, tpm=0))
+    try:
+        for i in range(3):
+            assert client.complete(f"Generate opening statement {i}.")
+        assert "".join(client.stream("Generate a closing statement."))
+        assert server.requests == 4 and server.connections == 1
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_cancel_ends_the_stream_without_waiting_for_the_next_chunk():
+    server = MockLLMServer(tokens=5, tokens_per_second=1).start()
+    client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False),
+                       scheduler=Scheduler(rpm=0, tpm=0))
+    cancel = threading.Event()
+    try:
+        chunks = client.stream("Generate an opening statement.", cancel=cancel)
+        assert next(chunks)
+        threading.Timer(0.1, cancel.set).start()
+        start = time.perf_counter()
+        assert list(chunks) == []
+        assert time.perf_counter() - start < 0.5  # The next chunk was a second away
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_requests_exceptions_are_reexported():
+    assert llm_client.RequestException is requests.RequestException
+    assert issubclass(llm_client.HTTPError, llm_client.RequestException)
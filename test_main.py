@@ -0,0 +1,48 @@
+import time
+import main
+
+
+class SlowRouter:
+    """Streams each prompt in two chunks after `delay` seconds and records when each stream ran."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.spans = []
+
+    def stream(self, task, prompt, temperature=None, use_cache=True, cancel=None):
+        start = time.perf_counter()
+        time.sleep(self.delay)
+        yield prompt[:10]
+        yield " done"
+        self.spans.append((start, time.perf_counter()))
+
+
+CASE_FACTS = {"title": "Alpha Traders v. Union", "arguments": "The award was premature."}
+
+
+def test_both_openings_are_generated_at_the_same_time(monkeypatch):
+    router = SlowRouter(0.3)
+    monkeypatch.setattr(main, "get_router", lambda: router)
+    monkeypatch.setattr(main, "phase_timings", [])
+    start = time.perf_counter()
+    opposition = main.speculate_phase_response("opening", "Respondent", CASE_FACTS)
+    suggested = main.speculate_phase_response("opening", "Appellant", CASE_FACTS)
+    assert "".join(suggested.take()).endswith("done")
+    assert "".join(opposition.take()).endswith("done")
+
+    (first_start, first_end), (second_start, second_end) = sorted(router.spans)
+    assert second_start < first_end  # Overlapping, not one after the other
+    assert time.perf_counter() - start < 0.5
+
+
+def test_opposing_opening_runs_in_the_background_without_prefetch(monkeypatch):
+    router = SlowRouter(0.3)
+    monkeypatch.setattr(main, "get_router", lambda: router)
+    monkeypatch.setattr(main, "phase_timings", [])
+    monkeypatch.setattr(main.settings, "prefetch", False)
+    start = time.perf_counter()
+    opposition = main.speculate_phase_response("opening", "Respondent", CASE_FACTS, eager=True)
+    suggested = main.speculate_phase_response("opening", "Appellant", CASE_FACTS)
+    assert "".join(suggested.take()).endswith("done")
+    assert "".join(opposition.take()).endswith("done")
+    assert time.perf_counter() - start < 0.5
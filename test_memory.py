@@ -0,0 +1,39 @@
+from agents import Party
+import memory
+from memory import AgentMemory
+from prompt_builder import estimate_tokens
+
+
+class EchoModel:
+    """Fake model that records prompt sizes and answers with a few sentences."""
+
+    def __init__(self):
+        self.prompt_tokens = []
+
+    def generate_text(self, prompt):
+        self.prompt_tokens.append(estimate_tokens(prompt))
+        return f"Point {len(self.prompt_tokens)} is made. " + "The evidence supports our position. " * 8
+
+
+def test_memory_stays_within_budget():
+    memory = AgentMemory(budget=200, summary_budget=60)
+    for i in range(100):
+        memory.add("Counsel", f"Turn {i}. " + "Further detail. " * 10)
+    assert len(memory) == 100
+    assert estimate_tokens(memory.render()) <= 200
+    assert "Turn 99." in memory.render()  # Latest turn verbatim
+    assert "Counsel: Turn" in memory.summary  # Older turns folded into the summary
+
+
+def test_prompt_size_flat_over_long_trial():
+    model = EchoModel()
+    appellant = Party("Appellant", "Appellant", [], model)
+    respondent = Party("Respondent", "Respondent", [], model)
+    case_facts = {"title": "Test", "arguments": {}}
+    last = ""
+    for _ in range(30):  # 60 exchanges
+        last = appellant.rebut(case_facts, [("Respondent", last)] if last else None)
+        last = respondent.rebut(case_facts, [("Appellant", last)])
+    overhead = model.prompt_tokens[0]  # The first prompt has no memory yet
+    assert max(model.prompt_tokens) <= overhead + memory.settings.budget + 10
+    assert max(model.prompt_tokens[-10:]) <= max(model.prompt_tokens[-20:-10]) + 5  # Plateaued, not growing
@@ -0,0 +1,135 @@
+import time
+import pytest
+import requests
+import llm_client
+from llm_client import LLMClient
+from mock_llm_server import MockLLMServer
+from model_router import ModelRouter, default_routes, settings as router_settings
+from response_cache import ResponseCache
+from scheduler import Scheduler
+
+
+class FakeClient:
+    """
+    Answers with the model's name after its configured delay; models in `failing` raise HTTPError and
+    streams of models in `broken` fail after their first chunk.
+    """
+
+    def __init__(self, delays=None, failing=(), broken=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.broken = set(broken)
+        self.calls = []
+        self.cancelled = []
+
+    def cached(self, prompt, model=None, temperature=None):
+        return None
+
+    def remember(self, prompt, model, temperature, data):
+        pass
+
+    def chat(self, prompt, model=None, temperature=None, use_cache=True):
+        self.calls.append(model)
+        time.sleep(self.delays.get(model, 0))
+        if model in self.failing:
+            raise requests.HTTPError(f"{model} unavailable")
+        return {"choices": [{"message": {"content": model}}]}
+
+    def stream(self, prompt, model=None, temperature=None, use_cache=True, cancel=None):
+        """Yields the model's name after its delay, or stops early once cancelled."""
+        self.calls.append(model)
+        deadline = time.monotonic() + self.delays.get(model, 0)
+        while time.monotonic() < deadline:
+            if cancel is not None and cancel.is_set():
+                self.cancelled.append(model)
+                return
+            time.sleep(0.01)
+        if model in self.failing:
+            raise requests.HTTPError(f"{model} unavailable")
+        yield model
+        if model in self.broken:
+            raise requests.ConnectionError(f"{model} dropped the stream")
+        yield " done"
+
+
+def test_failed_models_fail_over_and_drop_in_the_ranking(monkeypatch):
+    fake = FakeClient(failing={"primary"})
+    monkeypatch.setattr(llm_client, "_client", fake)
+    router = ModelRouter(routes={"verdict": ["primary", "backup"]}, hedge_tasks=set())
+
+    for _ in range(3):
+        assert router.complete("verdict", "Deliver the verdict.") == "backup"
+    assert router.ranked("verdict") == ["backup", "primary"]
+    assert router.complete("verdict", "Deliver the verdict.") == "backup"
+    assert fake.calls[-1] == "backup" and fake.calls.count("primary") == 3
+
+
+def test_slow_model_is_hedged_with_the_next_one(monkeypatch):
+    monkeypatch.setattr(llm_client, "_client", FakeClient(delays={"primary": 1.0, "backup": 0.01}))
+    router = ModelRouter(routes={"strategy": ["primary", "backup"]}, hedge_tasks={"strategy"}, hedge_after=0.05)
+
+    start = time.perf_counter()
+    assert router.complete("strategy", "Suggest a strategy.") == "backup"
+    assert time.perf_counter() - start < 0.5
+    assert router.hedged == 1
+
+
+def test_slow_first_chunk_is_hedged_and_the_losing_stream_stopped(monkeypatch):
+    fake = FakeClient(delays={"primary": 1.0, "backup": 0.01})
+    monkeypatch.setattr(llm_client, "_client", fake)
+    router = ModelRouter(routes={"verdict": ["primary", "backup"]}, hedge_tasks={"verdict"}, hedge_after=0.05)
+
+    start = time.perf_counter()
+    assert "".join(router.stream("verdict", "Deliver the verdict.")) == "backup done"
+    assert time.perf_counter() - start < 0.5
+    assert router.hedged == 1
+    time.sleep(0.1)
+    assert fake.cancelled == ["primary"]
+
+
+def test_streams_are_hedged_on_their_own_first_chunk_history(monkeypatch):
+    fake = FakeClient(delays={"primary": 0.02, "backup": 0.01})
+    monkeypatch.setattr(llm_client, "_client", fake)
+    router = ModelRouter(routes={"verdict": ["primary", "backup"]}, hedge_tasks={"verdict"})  # Default hedge_after
+
+    for _ in range(5):
+        assert "".join(router.stream("verdict", "Deliver the verdict.")) == "primary done"
+    assert router.hedged == 0 and len(router.model_stats("primary").latencies(streamed=True)) == 5
+
+    fake.delays["primary"] = 1.0
+    start = time.perf_counter()
+    assert "".join(router.stream("verdict", "Deliver the verdict.")) == "backup done"
+    assert time.perf_counter() - start < 0.5
+    assert router.hedged == 1
+
+
+def test_streams_failing_midway_count_as_errors(monkeypatch):
+    monkeypatch.setattr(llm_client, "_client", FakeClient(broken={"primary"}))
+    router = ModelRouter(routes={"phase": ["primary", "backup"]}, hedge_tasks=set())
+
+    for _ in range(3):
+        with pytest.raises(requests.ConnectionError):
+            "".join(router.stream("phase", "Generate an opening statement."))
+    assert router.model_stats("primary").error_rate() == 1.0
+    assert router.ranked("phase") == ["backup", "primary"]
+
+
+def test_routed_calls_look_up_the_cache_once(monkeypatch):
+    server = MockLLMServer().start()
+    cache = ResponseCache(path=None)
+    client = LLMClient(api_key="mock", api_url=server.url, cache=cache, scheduler=Scheduler(rpm=0, tpm=0))
+    monkeypatch.setattr(llm_client, "_client", client)
+    router = ModelRouter(routes={"phase": ["mock-model"]}, hedge_tasks=set())
+
+    try:
+        first = router.complete("phase", "Generate an opening statement.")
+        assert router.complete("phase", "Generate an opening statement.") == first
+        assert (cache.misses, cache.hits, server.requests) == (1, 1, 1)
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_cross_examination_uses_the_configured_reasoning_model():
+    route = default_routes()["cross_examination"]
+    assert route == [llm_client.settings.reasoning_model, router_settings.fallback_model]
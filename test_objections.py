@@ -0,0 +1,73 @@
+import time
+import threading
+import pytest
+import objections
+import llm_client
+from scheduler import current_priority, request_priority, BATCH
+
+
+class FakeClient:
+    """Answers every objection prompt with one numbered section per statement and counts the requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self.priorities = []
+
+    def cached(self, prompt, model=None, temperature=None):
+        return None
+
+    def remember(self, prompt, model, temperature, data):
+        pass
+
+    def chat(self, prompt, model=None, temperature=None, use_cache=True):
+        self.requests += 1
+        self.priorities.append(current_priority())
+        time.sleep(0.1)
+        analysis = "1. Yes\n2. Hearsay\n4. Sustained"
+        count = prompt.count('. "')  # Numbered statements in a batched prompt
+        content = "\n".join(f"### Statement {i}\n{analysis}" for i in range(1, count + 1)) if count else analysis
+        return {"choices": [{"message": {"content": content}}]}
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(llm_client, "_client", client)
+    return client
+
+
+def test_local_screen_clears_factual_statements_without_a_request(fake):
+    statement = "Your Honour, under clause 12 of the contract dated 2005 the appellant is entitled to compensation."
+    assert objections.detect_objections(statement, {"title": "Test"}) == objections.NO_OBJECTION
+    assert fake.requests == 0
+
+
+def test_statements_arriving_during_a_request_share_the_next_one(fake):
+    statements = ["He told me the goods never arrived.", "I think he probably knew.", "The witness clearly lied."]
+    results = [None] * len(statements)
+
+    def detect(i):
+        results[i] = objections.detect_objections(statements[i], {"title": "Test"})
+
+    threads = [threading.Thread(target=detect, args=(i,)) for i in range(len(statements))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake.requests < len(statements)
+    assert all(result.startswith("1. Yes") for result in results)
+
+
+def test_batch_detection_only_sends_flagged_statements(fake):
+    statements = ["The contract dated 2005 was signed by both parties.", "He told me the goods never arrived.", "I think he probably knew."]
+    results = objections.detect_objections_batch(statements, {"title": "Test"})
+    assert fake.requests == 1
+    assert results[0] == objections.NO_OBJECTION
+    assert results[1].startswith("1. Yes") and results[2].startswith("1. Yes")
+
+
+def test_batch_priority_carries_over_to_the_batcher_thread(fake):
+    with request_priority(BATCH):
+        objections.detect_objections("He told me the goods never arrived.", {"title": "Priority"})
+    assert fake.priorities == [BATCH]
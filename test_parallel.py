@@ -0,0 +1,38 @@
+import time
+import threading
+from parallel import Speculation, gather, background_stream
+from scheduler import current_priority, request_priority, BATCH, INTERACTIVE
+
+
+def test_discarded_speculation_closes_its_stream():
+    produced, started, closed = [], threading.Event(), threading.Event()
+
+    def make_chunks(cancel):
+        try:
+            for i in range(1000):
+                time.sleep(0.01)  # Doesn't check `cancel`: the speculation has to close it
+                produced.append(i)
+                started.set()
+                yield str(i)
+        finally:
+            closed.set()
+
+    speculation = Speculation(make_chunks)
+    started.wait(1)
+    speculation.discard()
+    assert closed.wait(1)
+    assert len(produced) < 1000
+    assert speculation.cancel.is_set()
+
+
+def test_taken_speculation_yields_every_chunk():
+    speculation = Speculation(lambda cancel: iter(["a", "b", "c"]))
+    assert "".join(speculation.take()) == "abc"
+
+
+def test_pool_work_runs_at_the_submitting_thread_priority():
+    with request_priority(BATCH):
+        assert gather(current_priority, current_priority) == [BATCH, BATCH]
+        chunks = background_stream(lambda: iter([current_priority()]))
+    assert list(chunks) == [BATCH]
+    assert gather(current_priority, current_priority) == [INTERACTIVE, INTERACTIVE]
@@ -0,0 +1,73 @@
+import os
+import pdf_ingest
+
+PAGES = [
+    "Asha Mills Ltd vs Board Of Trustees Of Port on 12 April, 2013\n"
+    "Bombay High Court\n"
+    "Bench: S.J. Vazifdar\n"
+    "Equivalent citations: 2013 (4) BomCR 1, AIR 2013 Bom 90",
+    "Counsel for the appellant submitted that the award ignored clause 12. The delay was caused by the port. "
+    "Counsel for the respondent argued that the Arbitration and Conciliation Act, 1996 bars the claim. "
+    "Reliance was placed on Fateh Chand v. Balkrishan Dass on this point.",
+    "The award does not consider the contract. The delay was not the contractor's fault. "
+    "The appeal is partly allowed. The respondents shall pay Rs. 5,00,000 with interest. Ordered accordingly."
+]
+
+
+def make_pdf(path, pages):
+    """Writes a minimal PDF with one text line per line of each page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        lines = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in text.splitlines()]
+        stream = "BT /F1 10 Tf 14 TL 20 800 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents {len(objects)} 0 R "
+                       "/Resources << /Font << /F1 3 0 R >> >> >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+def test_extract_case_from_page_texts():
+    case = pdf_ingest.extract_case(iter(PAGES))
+    assert case["case_title"] == "Asha Mills Ltd vs Board Of Trustees Of Port"
+    assert case["date"] == "12 April, 2013"
+    assert case["court"] == "Bombay High Court"
+    assert case["judgment_by"] == "S.J. Vazifdar"
+    assert case["equivalent_citations"] == ["2013 (4) BomCR 1", "AIR 2013 Bom 90"]
+    assert case["parties"]["appellant"]["name"] == "Asha Mills Ltd"
+    assert case["parties"]["respondents"] == [{"name": "Board Of Trustees Of Port"}]
+    assert "Arbitration and Conciliation Act, 1996" in case["legal_references"]["laws_cited"]
+    assert case["legal_references"]["precedents"] == ["Fateh Chand v. Balkrishan Dass"]
+    assert case["key_arguments"]["appellant"].startswith("Counsel for the appellant submitted")
+    assert case["key_arguments"]["respondent"].startswith("Counsel for the respondent argued")
+    assert case["judgment_summary"]["court_decision"] == "The appeal is partly allowed."
+    assert case["judgment_summary"]["final_award"] == "Rs. 5,00,000 with interest."
+
+
+def test_unchanged_pdfs_are_skipped_and_changed_ones_reingested(tmp_path):
+    source, out = tmp_path / "pdfs", tmp_path / "cases"
+    source.mkdir()
+    pdf = str(source / "judgment.pdf")
+    make_pdf(pdf, PAGES)
+
+    assert pdf_ingest.ingest(str(source), str(out), workers=1) == (1, 0, 0)
+    first = [name for name in os.listdir(out) if name.endswith(".json")]
+    assert len(first) == 1 and first[0].startswith("Asha_Mills_Ltd_vs_Board_Of_Trustees_Of_Port_")
+
+    assert pdf_ingest.ingest(str(source), str(out), workers=1) == (0, 1, 0)
+
+    make_pdf(pdf, PAGES[:2] + ["The appeal is dismissed. Ordered accordingly."])
+    assert pdf_ingest.ingest(str(source), str(out), workers=1) == (1, 0, 0)
+    assert len(pdf_ingest.load_manifest(str(out))) == 2
@@ -0,0 +1,38 @@
+import os
+import json
+from case_index import CaseIndex
+from precedent_search import get_precedent_index
+
+
+def write_case(path, title, arguments, reasoning=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "case_title": title, "court": "High Court", "date": "2015",
+        "key_arguments": {"appellant": arguments}, "judgment_summary": {"reasoning": reasoning}
+    }), encoding="utf-8")
+    return str(path)
+
+
+def test_query_retrieves_the_most_similar_case(tmp_path):
+    write_case(tmp_path / "award.json", "Award Case", ["The arbitral award ignored the contract clause"],
+               "An arbitration award in breach of the contract is set aside.")
+    write_case(tmp_path / "tax.json", "Tax Case", ["Income tax was assessed twice on the same income"])
+    write_case(tmp_path / "nested" / "land.json", "Land Case", ["The land acquisition notice was defective"])
+    index = get_precedent_index(str(tmp_path), CaseIndex(":memory:"))
+
+    assert [case["title"] for _, case in index.search("arbitration award contract", k=2)] == ["Award Case"]
+    assert [case["title"] for _, case in index.search("land acquisition")] == ["Land Case"]
+    assert index.search("arbitration award", exclude_title="Award Case") == []
+
+
+def test_index_is_reused_until_the_case_index_sees_a_change(tmp_path):
+    cases = CaseIndex(":memory:")
+    path = write_case(tmp_path / "a.json", "Old Case", ["Customs duty refund"])
+    index = get_precedent_index(str(tmp_path), cases, max_age=0)
+    assert get_precedent_index(str(tmp_path), cases, max_age=0) is index
+
+    write_case(tmp_path / "a.json", "New Case", ["Customs duty refund"])
+    os.utime(path, (1, 1))
+    assert get_precedent_index(str(tmp_path), cases, max_age=60) is index  # Not rescanned yet
+    updated = get_precedent_index(str(tmp_path), cases, max_age=0)
+    assert [case["title"] for _, case in updated.search("customs refund")] == ["New Case"]
@@ -0,0 +1,48 @@
+from prompt_builder import build_context, compact_prompt, estimate_tokens
+
+
+def test_context_is_compact_and_trimmed_by_priority():
+    """Low-priority fields are trimmed first and the result stays within the budget."""
+    case_facts = {
+        "title": "Sunit C. Khatau vs. Dilip Dharamsey Khatau",
+        "arguments": {"appellant": "The award was premature. " * 10, "respondent": "Obligations were breached. " * 10},
+        "precedents": ["Fateh Chand v. Balkrishan Dass", "Maula Bux v. Union of India"]
+    }
+
+    full = build_context(case_facts, budget=1000)
+    assert "{" not in full and "'" not in full
+    assert len(full) < len(str(case_facts))
+
+    trimmed = build_context(case_facts, budget=60)
+    assert estimate_tokens(trimmed) <= 60
+    assert trimmed.startswith("title: Sunit C. Khatau")
+    assert "Fateh Chand" not in trimmed
+
+
+def test_compact_prompt_strips_template_indentation():
+    assert compact_prompt("""
+        Line one.
+            Line two.
+        """) == "Line one.\nLine two."
+
+
+def test_truncated_field_that_fits_ends_trimming():
+    """A truncated field re-added within the budget used to leave the loop with nothing left to drop."""
+    fields = {"x": ("word " * 100)[:300].strip() + "z", "court": ("bench " * 100)[:266].strip() + "q"}
+    context = build_context(fields, budget=135)
+    assert estimate_tokens(context) <= 135
+    assert context.endswith(fields["court"])  # Listed fields outrank unlisted ones like "x"
+
+
+def test_higher_priority_fields_are_never_dropped_for_a_truncated_one():
+    context = build_context({"title": "T", "arguments": "arg " * 200, "date": "d " * 100}, budget=150)
+    assert context.startswith("title: T\narguments: arg arg")
+    assert context.endswith(" ...") and "date:" not in context
+    assert estimate_tokens(context) <= 150
+
+
+def test_truncation_suffix_fits_in_the_budget():
+    for budget in (5, 10, 37):
+        assert estimate_tokens(build_context("evidence " * 100, budget=budget)) <= budget
+        assert estimate_tokens(build_context({"title": "evidence " * 100}, budget=budget)) <= budget
+        assert estimate_tokens(build_context("x" * 500, budget=budget)) <= budget  # No word boundary to cut at
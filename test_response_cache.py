@@ -0,0 +1,37 @@
+import time
+from response_cache import ResponseCache, make_key
+
+
+def test_cache_key_depends_on_sampling_params():
+    """The same prompt at a different temperature must not share a cache entry."""
+    payload = {"model": "mixtral-8x7b-32768", "messages": [{"role": "system", "content": "Hi"}], "temperature": 0.5}
+    assert make_key(payload) == make_key(dict(payload))
+    assert make_key(payload) != make_key({**payload, "temperature": 0.3})
+
+
+def test_cache_tiers_eviction_and_counters(tmp_path):
+    """Entries survive in SQLite after falling out of the LRU, and expire after the TTL."""
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(path=path, memory_entries=1, disk_entries=2, ttl=60)
+
+    cache.set("a", {"choices": [1]})
+    cache.set("b", {"choices": [2]})
+    assert cache.get("b") == {"choices": [2]}  # memory hit
+    assert cache.get("a") == {"choices": [1]}  # disk hit (evicted from the LRU)
+    assert cache.get("missing") is None
+
+    cache.set("c", {"choices": [3]})  # disk cap of 2 evicts the least recently used ("b")
+    cache.close()
+
+    reopened = ResponseCache(path=path, memory_entries=1, disk_entries=2, ttl=60)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == {"choices": [1]}
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+    reopened.ttl = 0
+    time.sleep(0.01)
+    assert reopened.get("c") is None
+
+    bypassed = ResponseCache(path=None, enabled=False)
+    bypassed.set("a", {"choices": [1]})
+    assert bypassed.get("a") is None
@@ -0,0 +1,11 @@
+from roles import assign_roles
+
+
+def test_witnesses_are_named_whether_listed_as_names_or_records():
+    roles = assign_roles({
+        "parties": {"petitioner": {"name": "Asha Mills"}, "respondents": [{"name": "Port Trust"}]},
+        "witnesses": [{"name": "R. Mehta", "testimony": "I signed the work order."}, "S. Iyer", {"testimony": "..."}]
+    })
+    assert roles["Appellant"].name == "Asha Mills"
+    assert [witness.name for witness in roles["Witnesses"]] == ["R. Mehta", "S. Iyer", "Unknown Witness"]
+    assert roles["Witnesses"][0].introduce().startswith("R. Mehta is serving as the Witness")
@@ -0,0 +1,83 @@
+import threading
+import pytest
+import requests
+from llm_client import LLMClient
+from mock_llm_server import MockLLMServer
+from response_cache import ResponseCache
+from scheduler import Scheduler, BATCH, INTERACTIVE
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_rate_limits_and_server_errors_are_retried(status):
+    server = MockLLMServer(error_rate=0.5, error_status=status, retry_after=0, seed=1).start()
+    scheduler = Scheduler(rpm=0, tpm=0, max_retries=10, backoff_base=0.001)
+    client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False), scheduler=scheduler)
+    try:
+        for _ in range(5):
+            assert client.complete("Generate an opening statement.")
+        assert server.errors > 0 and scheduler.stats["retries"] == server.errors
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_final_error_is_raised_after_bounded_retries():
+    server = MockLLMServer(error_rate=1.0, error_status=500).start()
+    scheduler = Scheduler(rpm=0, tpm=0, max_retries=2, backoff_base=0.001)
+    client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False), scheduler=scheduler)
+    try:
+        with pytest.raises(requests.HTTPError):
+            client.complete("Generate an opening statement.")
+        assert server.requests == 3
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_interactive_requests_are_admitted_before_batch_requests():
+    scheduler = Scheduler(rpm=0, tpm=0)
+    scheduler.pause(0.2)
+    order = []
+
+    def request(name, priority):
+        scheduler.acquire(priority=priority)
+        order.append(name)
+
+    batch = threading.Thread(target=request, args=("batch", BATCH))
+    batch.start()
+    interactive = threading.Thread(target=request, args=("interactive", INTERACTIVE))
+    interactive.start()
+    batch.join()
+    interactive.join()
+    assert order == ["interactive", "batch"]
+
+
+def test_failed_attempts_give_back_their_token_reservations():
+    server = MockLLMServer(error_rate=1.0, error_status=503, retry_after=0).start()
+    scheduler = Scheduler(rpm=0, tpm=6000, max_retries=2, backoff_base=0.001)
+    client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False), scheduler=scheduler)
+    try:
+        with pytest.raises(requests.HTTPError):
+            client.complete("Generate an opening statement.")
+        assert server.requests == 3
+        assert scheduler.tokens.level > 6000 - 50  # Not three reservations of ~500 tokens
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_streams_settle_their_reservation_with_the_reported_usage():
+    server = MockLLMServer(tokens=20).start()
+    scheduler = Scheduler(rpm=0, tpm=600)
+    client = LLMClient(api_key="mock", api_url=server.url, cache=ResponseCache(path=None, enabled=False), scheduler=scheduler)
+    try:
+        assert "".join(client.stream("Generate an opening statement."))
+        assert 600 - scheduler.tokens.level < 50  # ~30 tokens used, not the ~520 reserved
+
+        chunks = client.stream("Generate a closing statement.", use_cache=False)
+        next(chunks)
+        chunks.close()  # Cancelled: charged for the text received
+        assert 600 - scheduler.tokens.level < 80
+    finally:
+        client.close()
+        server.stop()
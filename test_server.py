@@ -0,0 +1,112 @@
+import json
+import time
+import asyncio
+import httpx
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+import server
+from session_store import SessionStore, close_session
+import verdict
+
+
+class FakeRouter:
+    """Streams three chunks over ~0.3s."""
+
+    def stream(self, task, prompt, temperature=None, use_cache=True, cancel=None):
+        for word in ["The ", "court ", "finds."]:
+            time.sleep(0.1)
+            yield word
+
+    def complete(self, task, prompt, temperature=None, use_cache=True):
+        return "The court finds."
+
+
+def parse_events(body):
+    """[(event, data)] from an SSE response body."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def fake_services():
+    return patch.object(server, "get_router", return_value=FakeRouter()), \
+        patch.object(verdict, "get_router", return_value=FakeRouter()), \
+        patch.object(server, "open_transcript", return_value=None)
+
+
+def test_session_streams_phases_in_order():
+    router, verdict_router, transcript = fake_services()
+    with router, verdict_router, transcript:
+        client = TestClient(server.app)
+        session = client.post("/sessions", json={"case": "case_data.json", "role": "appellant"}).json()
+        assert session["next_phase"] == "Opening Statement"
+
+        events = parse_events(client.post(f"/sessions/{session['session_id']}/advance", json={}).text)
+        assert [event for event, _ in events] == ["phase", "chunk", "chunk", "chunk", "done"]
+        assert events[-1][1]["text"] == "The court finds."
+        assert events[-1][1]["next_phase"] == "Cross-Examination"
+
+        done = parse_events(client.post(f"/sessions/{session['session_id']}/verdict").text)[-1][1]
+        assert done["phase"] == "Verdict"
+        assert client.get(f"/sessions/{session['session_id']}").json()["completed"] == ["Opening Statement", "Verdict"]
+
+        assert client.post(f"/sessions/{session['session_id']}/phases/appeal").status_code == 404
+        assert client.post("/sessions", json={"case": "../requirements.txt"}).status_code == 400
+
+
+def test_streams_do_not_block_each_other():
+    async def run():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            ids = [(await client.post("/sessions", json={"case": "case_data.json"})).json()["session_id"] for _ in range(4)]
+            start = time.perf_counter()
+            await asyncio.gather(*(client.post(f"/sessions/{i}/phases/opening") for i in ids))
+            return time.perf_counter() - start
+
+    router, verdict_router, transcript = fake_services()
+    with router, verdict_router, transcript:
+        assert asyncio.run(run()) < 0.8  # Four 0.3s streams, one after the other, would take 1.2s
+
+
+def test_session_is_busy_only_while_its_phase_streams():
+    async def run(session_id):
+        session = await server.get_session(session_id)
+        server.start_phase(session, "Opening Statement", "")  # Never streamed: the client went away
+        assert not session.busy
+
+        first = server.phase_events(session, "Opening Statement", "")
+        assert (await first.__anext__()).startswith("event: phase")
+        assert session.busy
+        rejected = [event async for event in server.phase_events(session, "Opening Statement", "")]
+        assert len(rejected) == 1 and rejected[0].startswith("event: error")
+        assert [event async for event in first][-1].startswith("event: done")
+        assert not session.busy
+
+    router, verdict_router, transcript = fake_services()
+    with router, verdict_router, transcript:
+        client = TestClient(server.app)
+        session_id = client.post("/sessions", json={"case": "case_data.json"}).json()["session_id"]
+        asyncio.run(run(session_id))
+
+
+def test_expired_sessions_are_closed_off_the_event_loop():
+    closed = []
+
+    def on_evict(session):
+        try:
+            asyncio.get_running_loop()
+            closed.append("event loop")
+        except RuntimeError:
+            closed.append("worker thread")
+        close_session(session)
+
+    store = SessionStore(ttl=0.05, on_evict=on_evict)
+    router, verdict_router, transcript = fake_services()
+    with router, verdict_router, transcript, patch.object(server, "get_session_store", return_value=store):
+        client = TestClient(server.app)
+        session_id = client.post("/sessions", json={"case": "case_data.json"}).json()["session_id"]
+        time.sleep(0.1)
+        assert client.get(f"/sessions/{session_id}").status_code == 404
+    assert closed == ["worker thread"]
@@ -0,0 +1,44 @@
+import time
+from case_record import load_case_record
+from session_store import SessionStore
+
+CASE_FILE = "data/case_data.json"
+
+
+def test_lru_eviction_by_count():
+    evicted = []
+    store = SessionStore(ttl=0, max_sessions=3, max_bytes=0, on_evict=evicted.append)
+    case = load_case_record(CASE_FILE)
+    sessions = [store.create(case, "Appellant", "test") for _ in range(3)]
+    store.get(sessions[0].id)  # Now the most recently used
+    store.create(case, "Appellant", "test")
+    assert evicted == [sessions[1]]
+    assert store.get(sessions[1].id) is None and store.get(sessions[0].id) is sessions[0]
+
+
+def test_ttl_expiry():
+    store = SessionStore(ttl=0.05, max_sessions=0, max_bytes=0, on_evict=None)
+    session = store.create(load_case_record(CASE_FILE), "Appellant", "test")
+    time.sleep(0.1)
+    assert store.get(session.id) is None and len(store) == 0
+
+
+def test_memory_cap_spares_busy_sessions():
+    store = SessionStore(ttl=0, max_sessions=0, max_bytes=17_500, on_evict=None)
+    case = load_case_record(CASE_FILE)
+    busy, idle, latest = (store.create(case, "Appellant", "test") for _ in range(3))
+    busy.busy = True
+    store.record(latest, "Opening Statement", "x" * 15_000)
+    assert store.get(idle.id) is None
+    assert store.get(busy.id) is busy and store.get(latest.id) is latest
+    assert latest.phase == "Cross-Examination"
+    assert store.stats()["bytes"] <= 17_500
+
+
+def test_thousands_of_sessions_share_one_case_record():
+    store = SessionStore(ttl=0, max_sessions=5000, max_bytes=0, on_evict=None)
+    start = time.perf_counter()
+    sessions = [store.create(load_case_record(CASE_FILE), "Respondent", "test") for _ in range(6000)]
+    assert time.perf_counter() - start < 2.0
+    assert len(store) == 5000 and store.stats()["evicted"] == 1000
+    assert all(session.case is sessions[0].case for session in sessions)
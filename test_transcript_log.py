@@ -0,0 +1,33 @@
+import os
+import json
+from transcript_log import TranscriptLog
+
+
+def test_turns_are_appended_and_rotated_into_part_files(tmp_path):
+    log = TranscriptLog("session", directory=str(tmp_path), max_bytes=300, fsync_interval=0)
+    for i in range(5):
+        log.log_turn("opening", "Appellant", f"Response {i} " + "x" * 100, prompt="Generate an opening.",
+                     timing={"first_token": 0.1, "total": 0.5})
+    log.close()
+
+    parts = sorted(os.listdir(tmp_path))
+    assert parts[0] == "session.1.jsonl" and "session.jsonl" in parts and len(parts) > 1
+
+    records = []
+    for name in ["session.jsonl"] + [f"session.{n}.jsonl" for n in range(1, len(parts))]:
+        with open(tmp_path / name, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    assert [r["response"].split()[1] for r in records] == ["0", "1", "2", "3", "4"]
+    assert records[0]["role"] == "Appellant" and records[0]["total"] == 0.5
+
+
+def test_closed_between_writes_when_not_kept_open(tmp_path):
+    log = TranscriptLog("session", directory=str(tmp_path), keep_open=False)
+    log.log_turn("opening", "Appellant", "First")
+    assert log.file is None
+    log.log_turn("cross", "Appellant", "Second")
+    log.close()
+    log.log_turn("closing", "Appellant", "After close")
+
+    with open(tmp_path / "session.jsonl", encoding="utf-8") as f:
+        assert [json.loads(line)["response"] for line in f] == ["First", "Second"]
@@ -0,0 +1,44 @@
+import time
+import asyncio
+import threading
+import pytest
+from agents import Judge, Party, Witness
+from trial import TrialStep, TrialOrchestrator, trial_plan
+
+
+class SlowModel:
+    """Fake model: every call takes 0.1s and echoes the agent's phase."""
+
+    def __init__(self):
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate_text(self, prompt):
+        time.sleep(0.1)
+        with self.lock:
+            self.prompts.append(prompt)
+        return prompt.splitlines()[1]
+
+
+def test_trial_time_follows_dependency_depth():
+    model = SlowModel()
+    judge = Judge("Judge Rao", model)
+    parties = [Party("Port Trust", "Appellant", [], model), Party("Pioneer", "Respondent", [], model)]
+    witnesses = [Witness(f"Witness {i}", "", model) for i in range(3)]
+    orchestrator = TrialOrchestrator(trial_plan(judge, parties, witnesses))
+
+    start = time.perf_counter()
+    outputs = asyncio.run(orchestrator.run({"title": "Test", "arguments": {}}))
+    elapsed = time.perf_counter() - start
+
+    assert len(outputs) == 1 + 3 + 2 + 2 + 1
+    assert elapsed < 0.6  # Three levels deep; run one after the other this would take 0.9s
+    verdict_prompt = next(prompt for prompt in model.prompts if "verdict phase" in prompt)
+    assert "Witness 2:" in verdict_prompt and "Pioneer:" in verdict_prompt
+    assert orchestrator.timings["verdict"][0] >= max(orchestrator.timings[f"rebuttal:{p.name}"][1] for p in parties)
+
+
+def test_plan_with_cycle_is_rejected():
+    steps = [TrialStep("a", "A", None, ["b"]), TrialStep("b", "B", None, ["a"])]
+    with pytest.raises(ValueError):
+        TrialOrchestrator(steps)
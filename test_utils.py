@@ -0,0 +1,32 @@
+from utils import ThinkStripper, remove_chain_of_thought
+
+RESPONSE = "<think>\nThe appellant must show the award was premature.\nCheck Section 34.\n</think>\n\n**Strategy:** Challenge the <b>award</b> under Section 34."
+
+
+def test_stream_stripping_matches_the_regex_for_any_chunking():
+    expected = remove_chain_of_thought(RESPONSE)
+    for size in [1, 2, 3, 5, 7, len(RESPONSE)]:
+        stripper = ThinkStripper()
+        chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+        assert "".join(stripper.strip(chunks)).strip() == expected
+        assert stripper.reasoning_chars == len("\nThe appellant must show the award was premature.\nCheck Section 34.\n")
+        assert stripper.reasoning_tokens > 0
+
+
+def test_visible_text_arrives_as_soon_as_reasoning_ends():
+    stripper = ThinkStripper()
+    assert stripper.feed("<thi") == ""
+    assert stripper.feed("nk>Reasoning</th") == ""
+    assert stripper.feed("ink>\nAnswer") == "Answer"
+    assert stripper.feed(" <") == " "
+    assert stripper.finish() == "<"
+
+
+def test_stream_stripping_matches_the_regex_around_and_without_closed_blocks():
+    for response in ["Hello <think>x</think>\n\nworld", "<think>plan</think>\n\nAnswer <think>more</think> end",
+                     "Answer first. <think>unfinished reasoning", "<think>never closed </thi"]:
+        expected = remove_chain_of_thought(response)
+        for size in [1, 2, 3, 5, len(response)]:
+            stripper = ThinkStripper()
+            chunks = [response[i:i + size] for i in range(0, len(response), size)]
+            assert "".join(stripper.strip(chunks)).rstrip() == expected, (response, size)
@@ -0,0 +1,108 @@
+import os
+import re
+import json
+import time
+import threading
+from config import Settings, is_on
+
+# Transcript settings (override in .env)
+settings = Settings(
+    directory=("LEX_TRANSCRIPT_DIR", "transcripts", str),
+    fsync_interval=("LEX_TRANSCRIPT_FSYNC_SECONDS", "5", float),  # Flushed every turn, fsynced at most this often
+    max_bytes=("LEX_TRANSCRIPT_MAX_BYTES", str(5 * 1024 * 1024), int),  # Start a new part file past this size
+    enabled=("LEX_TRANSCRIPT", "1", is_on)
+)
+
+
+def session_name(case_title=""):
+    """Timestamped, filesystem-safe session name, e.g. 20240101-120000_Sunit_C_Khatau_vs_Dilip."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", case_title).strip("_")[:40]
+    return f"{time.strftime('%Y%m%d-%H%M%S')}_{slug}" if slug else time.strftime("%Y%m%d-%H%M%S")
+
+
+class TranscriptLog:
+    """
+    Append-only JSONL transcript of a session: one line per phase turn, written as it happens.
+    Every line is flushed to the OS immediately and fsynced at most every `fsync_interval` seconds,
+    so a crash loses at most the turn in progress. Once a part file reaches `max_bytes`, writing
+    continues in the next part (<session>.jsonl, <session>.1.jsonl, ...); nothing is rewritten.
+    With `keep_open=False` the file is reopened for each record instead of held open, so thousands
+    of mostly idle sessions don't each hold a file descriptor.
+    """
+
+    def __init__(self, session, directory=None, max_bytes=None, fsync_interval=None, keep_open=True):
+        directory = directory or settings.directory
+        os.makedirs(directory, exist_ok=True)
+        self.session = session
+        self.directory = directory
+        self.max_bytes = settings.max_bytes if max_bytes is None else max_bytes
+        self.fsync_interval = settings.fsync_interval if fsync_interval is None else fsync_interval
+        self.keep_open = keep_open
+        self.closed = False
+        self.part = 0
+        self.lock = threading.Lock()
+        self.file = None
+        self.last_sync = time.monotonic()
+        if keep_open:
+            self._open()
+
+    @property
+    def path(self):
+        suffix = f".{self.part}" if self.part else ""
+        return os.path.join(self.directory, f"{self.session}{suffix}.jsonl")
+
+    def _open(self):
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+
+    def write(self, event, **fields):
+        """Appends one record: {"time", "event", **fields}."""
+        line = json.dumps({"time": round(time.time(), 3), "event": event, **fields}, ensure_ascii=False) + "\n"
+        with self.lock:
+            if self.closed:
+                return
+            if self.file is None:
+                self._open()
+            self.file.write(line)
+            self.file.flush()
+            if time.monotonic() - self.last_sync >= self.fsync_interval:
+                self._sync()
+            if self.file.tell() >= self.max_bytes:
+                self._sync()
+                self.file.close()
+                self.part += 1
+                self._open()
+            if not self.keep_open:
+                self.file.close()
+                self.file = None
+
+    def log_turn(self, phase, role, response, prompt=None, timing=None, **extra):
+        """Records one phase turn: who spoke, the prompt sent (None for typed input), the response and its timing."""
+        timing = timing or {}
+        self.write("turn", phase=phase, role=role, prompt=prompt, response=response,
+                   first_token=timing.get("first_token"), total=timing.get("total"), **extra)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.file is not None:
+                self._sync()
+                self.file.close()
+                self.file = None
+
+
+def open_transcript(case_title="", front_end=None, keep_open=True, session_id=None, **details):
+    """
+    Starts a session transcript (or returns None when LEX_TRANSCRIPT=0) and writes its header line.
+    A `session_id` is added to the file name, for front ends that run many sessions at once.
+    """
+    if not settings.enabled:
+        return None
+    name = f"{session_name(case_title)}_{session_id}" if session_id else session_name(case_title)
+    log = TranscriptLog(name, keep_open=keep_open)
+    log.write("session", case=case_title, front_end=front_end, session_id=session_id, **details)
+    return log
@@ -0,0 +1,157 @@
+import time
+import asyncio
+from agents import Judge, Party, Witness
+from case_record import as_case_record, load_case_record
+from parallel import get_executor
+
+
+class TrialStep:
+    """
+    One agent turn. `run(case_facts, proceedings)` is a blocking call that is given the (speaker,
+    text) output of every step in `depends`, in that order, once all of them have finished.
+    """
+
+    def __init__(self, name, speaker, run, depends=()):
+        self.name = name
+        self.speaker = speaker
+        self.run = run
+        self.depends = tuple(depends)
+
+    def __repr__(self):
+        return f"TrialStep({self.name!r}, depends={list(self.depends)})"
+
+
+def trial_plan(judge, parties, witnesses=()):
+    """
+    The dependency graph of a full trial. The judge's interim commentary, every witness's testimony
+    and every party's arguments need nothing but the case facts; each rebuttal follows all the
+    arguments and the testimony; the verdict weighs everything said before it.
+    """
+    steps = [TrialStep("commentary", judge.name, lambda facts, heard: judge.comment(facts))]
+    steps += [
+        TrialStep(f"testimony:{witness.name}", witness.name, lambda facts, heard, witness=witness: witness.give_testimony(facts))
+        for witness in witnesses
+    ]
+    steps += [
+        TrialStep(f"arguments:{party.name}", party.name, lambda facts, heard, party=party: party.present_arguments(facts))
+        for party in parties
+    ]
+    testimony = [f"testimony:{witness.name}" for witness in witnesses]
+    steps += [
+        TrialStep(f"rebuttal:{party.name}", party.name, lambda facts, heard, party=party: party.rebut(facts, heard),
+                  [f"arguments:{other.name}" for other in parties] + testimony)
+        for party in parties
+    ]
+    steps.append(TrialStep("verdict", judge.name, judge.decide, [step.name for step in steps]))
+    return steps
+
+
+def check_plan(steps):
+    """Raises ValueError for duplicate step names, unknown dependencies or a dependency cycle."""
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError("Duplicate trial step names")
+    depends = {step.name: step.depends for step in steps}
+    for step in steps:
+        unknown = [name for name in step.depends if name not in depends]
+        if unknown:
+            raise ValueError(f"{step.name} depends on unknown steps: {', '.join(unknown)}")
+
+    state = {}  # name -> "visiting" / "done"
+
+    def visit(name):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle through {name}")
+        state[name] = "visiting"
+        for dependency in depends[name]:
+            visit(dependency)
+        state[name] = "done"
+
+    for name in names:
+        visit(name)
+
+
+class TrialOrchestrator:
+    """
+    Runs a trial plan on an event loop. Every step starts as soon as its own dependencies have
+    finished, and its blocking agent call runs on the shared LLM thread pool, so independent turns
+    overlap and a trial takes as long as its longest dependency chain, not the sum of its turns.
+    """
+
+    def __init__(self, steps, executor=None):
+        check_plan(steps)
+        self.steps = steps
+        self.executor = executor
+        self.timings = {}  # step name -> (started, finished), seconds from the start of the run
+
+    async def run(self, case_facts, on_turn=None):
+        """
+        Runs every step and returns {step name: output} in plan order. `on_turn(step, output)` is
+        called on the event loop as each turn finishes. If a step raises, the unfinished steps are
+        cancelled and the error propagates.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self.executor or get_executor()
+        speakers = {step.name: step.speaker for step in self.steps}
+        tasks = {}
+        started = time.perf_counter()
+
+        async def run_step(step):
+            outputs = [await tasks[name] for name in step.depends]
+            proceedings = [(speakers[name], output) for name, output in zip(step.depends, outputs)]
+            begin = time.perf_counter() - started
+            output = await loop.run_in_executor(executor, step.run, case_facts, proceedings)
+            self.timings[step.name] = (begin, time.perf_counter() - started)
+            if on_turn:
+                on_turn(step, output)
+            return output
+
+        for step in self.steps:
+            tasks[step.name] = asyncio.ensure_future(run_step(step))
+        try:
+            outputs = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return dict(zip(tasks, outputs))
+
+
+def build_agents(case_data, model):
+    """A Judge, one Party per side and the case's witnesses (if any) for a case file or CaseRecord."""
+    record = as_case_record(case_data)
+    judge = Judge(record.judgment_by or "Presiding Judge", model)
+    respondents = [r.get("name", "") for r in record.respondents if "role" not in r] or record.respondent_names
+    parties = [
+        Party(record.appellant_name or "Appellant", "Appellant", record.arguments.get("appellant", []), model),
+        Party(" & ".join(name for name in respondents if name) or "Respondent", "Respondent",
+              record.arguments.get("respondent", []), model)
+    ]
+    witnesses = [
+        Witness(w.get("name", f"Witness {i}"), w.get("testimony", ""), model) if isinstance(w, dict)
+        else Witness(str(w), "", model)
+        for i, w in enumerate(record.witnesses, 1)
+    ]
+    return judge, parties, witnesses
+
+
+def run_trial(case_data, model, on_turn=None):
+    """Runs a full multi-agent trial for a case and returns (outputs, timings). Blocks until it ends."""
+    record = as_case_record(case_data)
+    orchestrator = TrialOrchestrator(trial_plan(*build_agents(record, model)))
+    outputs = asyncio.run(orchestrator.run(record.case_facts(), on_turn))
+    return outputs, orchestrator.timings
+
+
+# Example Usage
+if __name__ == "__main__":
+    from ai_model import AIModel
+
+    def show_turn(step, output):
+        print(f"\n🔹 {step.name} ({step.speaker}):\n{output}")
+
+    start = time.perf_counter()
+    outputs, timings = run_trial(load_case_record("data/case_data.json"), AIModel(), on_turn=show_turn)
+    print(f"\n⏱ {len(outputs)} turns in {time.perf_counter() - start:.2f}s")
@@ -1,14 +1,13 @@
 import json
+from case_record import as_case_record, load_case_record
 
 
 def load_case_file(file_path):
     """
-    Loads and parses a courtroom case file from JSON.
+    Loads and parses a courtroom case file from JSON (as a CaseRecord).
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            case_data = json.load(file)
-        return case_data
+        return load_case_record(file_path)
     except Exception as e:
         print(f"⚠ Error loading case file: {e}")
         return None
@@ -16,25 +15,23 @@ def load_case_file(file_path):
 
 def extract_case_details(case_data):
     """
-    Extracts structured case details from JSON.
+    Extracts structured case details from JSON (a dict or CaseRecord).
     """
+    record = as_case_record(case_data)
     case_details = {
-        "case_title": case_data.get("case_title", "Unknown Case"),
-        "court": case_data.get("court", "Unknown Court"),
-        "judge": case_data.get("judgment_by", "Unknown Judge"),
-        "appellant": case_data["parties"]["appellant"]["name"],
-        "respondents": [resp["name"] for resp in case_data["parties"]["respondents"]],
-        "contract_purpose": case_data["contract_details"].get("contract_purpose", "N/A"),
-        "legal_references": {
-            "laws_cited": case_data["legal_references"].get("laws_cited", []),
-            "precedents": case_data["legal_references"].get("precedents", [])
-        },
+        "case_title": record.case_title or "Unknown Case",
+        "court": record.court or "Unknown Court",
+        "judge": record.judgment_by or "Unknown Judge",
+        "appellant": record.appellant_name,
+        "respondents": record.respondent_names,
+        "contract_purpose": record.contract_purpose or "N/A",
+        "legal_references": record.legal_references,
         "key_arguments": {
-            "appellant": case_data["key_arguments"].get("appellant", "N/A"),
-            "respondent": case_data["key_arguments"].get("respondent", "N/A")
+            "appellant": record.arguments.get("appellant", "N/A"),
+            "respondent": record.arguments.get("respondent", "N/A")
         },
-        "court_decision": case_data["judgment_summary"].get("court_decision", "No decision recorded"),
-        "final_award": case_data["judgment_summary"].get("final_award", "No award specified")
+        "court_decision": record.court_decision or "No decision recorded",
+        "final_award": record.final_award or "No award specified"
     }
     return case_details
 
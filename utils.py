@@ -1,7 +1,88 @@
 import re
 
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+
 def remove_chain_of_thought(response):
     """Removes internal chain-of-thought text from the response."""
     # This regex removes text between <think> and </think>, including the tags.
     cleaned_response = re.sub(r"<think>.*?</think>", "", response, flags=re.DOTALL)
     return cleaned_response.strip()
+
+
+def partial_tag_length(text, tag):
+    """Length of the longest end of `text` that could be the start of `tag` (0 if none)."""
+    for length in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0
+
+
+class ThinkStripper:
+    """
+    Incremental version of remove_chain_of_thought for token streams: feed() takes each chunk and
+    returns only the text outside <think>...</think>, holding back a chunk end that might be the
+    start of a tag split across chunks. Like the regex, a <think> that is never closed turns out to be
+    visible text: finish() returns it. Counts the reasoning it drops in `reasoning_chars` and
+    `reasoning_tokens` (stream chunks that carried reasoning text).
+    """
+
+    def __init__(self):
+        self.thinking = False
+        self.pending = ""  # Possible partial tag carried over to the next chunk
+        self.block = ""  # The open <think> block so far, shown by finish() if it is never closed
+        self.at_start = True  # Leading whitespace of the visible text is dropped, like .strip()
+        self.reasoning_chars = 0
+        self.reasoning_tokens = 0
+
+    def emit(self, text, out):
+        if self.thinking:
+            self.reasoning_chars += len(text)
+            self.block += text
+            return
+        if self.at_start:
+            text = text.lstrip()
+            self.at_start = not text
+        out.append(text)
+
+    def feed(self, chunk):
+        text, self.pending = self.pending + chunk, ""
+        reasoning_before = self.reasoning_chars
+        out = []
+        while text:
+            tag = THINK_CLOSE if self.thinking else THINK_OPEN
+            index = text.find(tag)
+            if index >= 0:
+                self.emit(text[:index], out)
+                text = text[index + len(tag):]
+                self.thinking = not self.thinking
+                self.block = THINK_OPEN if self.thinking else ""
+                continue
+            keep = partial_tag_length(text, tag)
+            self.emit(text[:len(text) - keep], out)
+            self.pending = text[len(text) - keep:]
+            break
+        if self.reasoning_chars > reasoning_before:
+            self.reasoning_tokens += 1
+        return "".join(out)
+
+    def finish(self):
+        """Flushes a held-back partial tag that turned out not to be one, and an unclosed <think> block."""
+        out = []
+        text, self.pending = self.pending, ""
+        if self.thinking:
+            self.reasoning_chars -= len(self.block) - len(THINK_OPEN)
+            text, self.block, self.thinking = self.block + text, "", False
+        self.emit(text, out)
+        return "".join(out)
+
+    def strip(self, chunks):
+        """Yields the visible text of a chunk stream as it arrives."""
+        for chunk in chunks:
+            visible = self.feed(chunk)
+            if visible:
+                yield visible
+        tail = self.finish()
+        if tail:
+            yield tail
@@ -1,77 +1,74 @@
-import os
-import json
-import requests
-from dotenv import load_dotenv
-import groq
-
-# Load API Key from .env
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# Set up Groq API client
-client = groq.Client(api_key=GROQ_API_KEY)
+from model_router import generate_for, get_router
+from utils import ThinkStripper, remove_chain_of_thought
+from precedent_search import find_related_cases, summarize_related_cases
+from prompt_builder import build_context, compact_prompt
+from case_record import load_case_record
 
 def load_case_details(json_path):
-    """Loads case details from JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as file:
-        return json.load(file)
+    """Loads case details from JSON file (as a CaseRecord)."""
+    return load_case_record(json_path)
 
-def generate_verdict(case_facts, prosecution_strategy, defense_strategy, legal_references):
-    """
-    AI-Judge generates a final verdict.
-    """
-    try:
-        prompt = f"""
-        You are an AI-Judge ruling on a legal case.
+def verdict_prompt(case_facts, prosecution_strategy, defense_strategy, legal_references, related_cases=None):
+    """Builds the verdict prompt; similar cases from the corpus are looked up unless `related_cases` is given."""
+    if related_cases is None:
+        related_cases = find_related_cases(case_facts, legal_references)
+
+    return compact_prompt(f"""
+    You are an AI-Judge ruling on a legal case.
 
-        **Case Facts:**
-        {case_facts}
+    **Case Facts:**
+    {build_context(case_facts, "verdict")}
 
-        **Prosecution Argument:**
-        {prosecution_strategy}
+    **Prosecution Argument:**
+    {prosecution_strategy}
 
-        **Defense Argument:**
-        {defense_strategy}
+    **Defense Argument:**
+    {defense_strategy}
 
-        **Legal References (Laws & Precedents):**
-        {legal_references}
+    **Legal References (Laws & Precedents):**
+    {build_context(legal_references, "references")}
 
-        **Judge Instructions:**
-        - Consider the **Burden of Proof** for both sides.
-        - Provide a detailed verdict with legal justification.
-        - Reference any applicable legal precedents from the case.
+    **Related Cases From Our Corpus:**
+    {summarize_related_cases(related_cases)}
 
-        Deliver your verdict in a formal court ruling format.
-        """
+    **Judge Instructions:**
+    - Consider the **Burden of Proof** for both sides.
+    - Provide a detailed verdict with legal justification.
+    - Reference any applicable legal precedents from the case or the related cases.
 
-        response = client.chat.completions.create(
-            model="deepseek-r1-distill-llama-70b",
-            messages=[{"role": "system", "content": prompt}],
-            temperature=0.5
-        )
+    Deliver your verdict in a formal court ruling format.
+    """)
 
-        return response.choices[0].message.content.strip()
+def generate_verdict(case_facts, prosecution_strategy, defense_strategy, legal_references, related_cases=None):
+    """
+    AI-Judge generates a final verdict.
+    Similar cases from the corpus are looked up unless `related_cases` is given.
+    """
+    try:
+        prompt = verdict_prompt(case_facts, prosecution_strategy, defense_strategy, legal_references, related_cases)
+        return remove_chain_of_thought(generate_for("verdict", prompt, temperature=0.5))
 
     except Exception as e:
         return f"⚠ Error generating verdict: {str(e)}"
 
+def stream_verdict(case_facts, prosecution_strategy, defense_strategy, legal_references, related_cases=None,
+                   stripper=None, cancel=None):
+    """Yields the verdict as it is generated, with the <think> reasoning dropped on the fly (see stream_strategy)."""
+    stripper = stripper or ThinkStripper()
+    try:
+        prompt = verdict_prompt(case_facts, prosecution_strategy, defense_strategy, legal_references, related_cases)
+        yield from stripper.strip(get_router().stream("verdict", prompt, temperature=0.5, cancel=cancel))
+    except Exception as e:
+        yield f"⚠ Error generating verdict: {str(e)}"
+
 # Example Usage
 if __name__ == "__main__":
-    case_file_path = "case_data.json"
+    case_file_path = "data/case_data.json"
     case_data = load_case_details(case_file_path)
 
     # Extract structured case details
-    case_facts = {
-        "title": case_data["case_title"],
-        "arguments": case_data.get("key_arguments") or case_data.get("legal_arguments", {}),
-        "contract_purpose": case_data["contract_details"]["contract_purpose"],
-        "court_decision": case_data["judgment_summary"]["court_decision"]
-    }
-
-    legal_references = {
-        "laws_cited": case_data["legal_references"]["laws_cited"],
-        "precedents": case_data["legal_references"]["precedents"]
-    }
+    case_facts = case_data.case_facts("contract_purpose", "court_decision")
+    legal_references = case_data.legal_references
 
     # Placeholder strategies (In full simulation, these should be AI-generated)
     prosecution_strategy = "Prosecution argues that the appellant breached the contract by failing to meet obligations."